@@ -0,0 +1,225 @@
+"""
+Persisted, display-ready league activity feed.
+
+Every transaction and local event of a league is enriched (team and
+player names, labels) once and stored as an activity_event row keyed by
+its uid. A sync fetches only the transaction rounds from the watermark
+round on, plus the local rows of players logged in contract_change since
+the last sync, and enriches just the entries that are new or whose
+source changed (transaction status, edited contract); local events whose
+row was removed are dropped. Syncs run at most once per
+activity_feed_cache TTL, or after a local write clears the chain tags.
+Feed requests read a keyset window of stored rows, so their
+cost does not grow with the league's history.
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_
+
+from .activity_timeline import Entry, enrich, local_entries, transaction_entries
+from .bulk_upsert import bulk_upsert
+from .cache import activity_feed_cache, chain_tags
+from .codec import json_dumps_bytes, json_loads
+from .extensions import db
+from .models import ActivityEvent, ActivityFeedState, ContractChange
+
+logger = logging.getLogger(__name__)
+
+UPSERT_CHUNK = 500
+TX_ROUNDS = 18
+# contract_change rows are kept this long; feeds idle for longer re-diff all local rows
+CHANGE_RETENTION = timedelta(days=14)
+
+
+def _version(entry: Entry) -> str:
+    _, _, kind, payload = entry
+    if kind == "transaction":
+        return f"{payload.get('status')}:{payload.get('status_updated')}"
+    return hashlib.sha1(json_dumps_bytes(payload)).hexdigest()
+
+
+def _stored_versions(league_id: int, uids: List[str]) -> Dict[str, str]:
+    versions: Dict[str, str] = {}
+    for i in range(0, len(uids), UPSERT_CHUNK):
+        chunk = uids[i:i + UPSERT_CHUNK]
+        versions.update(
+            db.session.query(ActivityEvent.uid, ActivityEvent.version)
+            .filter(ActivityEvent.league_id == league_id, ActivityEvent.uid.in_(chunk))
+            .all()
+        )
+    return versions
+
+
+def _needs_full_local_diff(state: Optional[ActivityFeedState]) -> bool:
+    if state is None or state.local_change_seq is None:
+        return True
+    # Changes older than the retention window may be pruned already
+    return state.updated_at is None or state.updated_at < datetime.utcnow() - CHANGE_RETENTION
+
+
+def _changed_players(league_chain_ids: List[int], after_seq: int, upto_seq: int) -> Tuple[Set[int], Set[int]]:
+    """(player_ids, contract_ids) logged for the chain in (after_seq, upto_seq]"""
+    rows = (
+        db.session.query(ContractChange.player_id, ContractChange.contract_id)
+        .filter(ContractChange.seq > after_seq, ContractChange.seq <= upto_seq)
+        .filter(ContractChange.league_id.in_(league_chain_ids))
+        .all()
+    )
+    return (
+        {int(row.player_id) for row in rows},
+        {int(row.contract_id) for row in rows if row.contract_id is not None},
+    )
+
+
+def _player_uids(league_chain_ids: List[int], player_ids: Set[int], contract_ids: Set[int]) -> List[str]:
+    """Every local uid the players' rows can have, including ones since deleted"""
+    uids = {f"contract:{contract_id}" for contract_id in contract_ids}
+    uids.update(
+        f"{kind}:{chain_league_id}:{player_id}"
+        for kind in ("amnesty", "rfa", "extension")
+        for chain_league_id in league_chain_ids
+        for player_id in player_ids
+    )
+    return sorted(uids)
+
+
+def sync(league_id: str, league_chain_ids: List[int]) -> ActivityFeedState:
+    """Append new events and refresh changed ones; returns the feed state"""
+    lid = int(league_id)
+    league_chain_ids = [int(chain_id) for chain_id in league_chain_ids]
+    state = db.session.get(ActivityFeedState, lid)
+    start_round = state.tx_watermark_round if state is not None else 0
+    change_seq = db.session.query(db.func.max(ContractChange.seq)).scalar() or 0
+
+    by_round = transaction_entries(str(league_id), TX_ROUNDS, start_round)
+    watermark = max([start_round] + [round_num for round_num, entries in by_round.items() if entries])
+    tx = [entry for round_num in sorted(by_round) for entry in by_round[round_num]]
+    stored = _stored_versions(lid, [entry[1] for entry in tx])
+
+    if _needs_full_local_diff(state):
+        local = local_entries(league_chain_ids)
+        stored_local = dict(
+            db.session.query(ActivityEvent.uid, ActivityEvent.version)
+            .filter(ActivityEvent.league_id == lid, ActivityEvent.source == "local")
+            .all()
+        )
+    else:
+        # Only players whose contract rows changed since the last sync
+        player_ids, contract_ids = _changed_players(league_chain_ids, state.local_change_seq, change_seq)
+        local = local_entries(league_chain_ids, player_ids) if player_ids else []
+        candidates = set(_player_uids(league_chain_ids, player_ids, contract_ids))
+        candidates.update(entry[1] for entry in local)
+        stored_local = _stored_versions(lid, sorted(candidates))
+    stored.update(stored_local)
+
+    changed = [entry for entry in tx + local if stored.get(entry[1]) != _version(entry)]
+    gone = set(stored_local) - {entry[1] for entry in local}
+
+    if (
+        state is not None and not changed and not gone
+        and watermark == state.tx_watermark_round and change_seq == state.local_change_seq
+    ):
+        return state
+
+    if changed:
+        items = enrich(str(league_id), changed)
+        rows = [
+            {
+                "league_id": lid,
+                "uid": uid,
+                "source": "transaction" if kind == "transaction" else "local",
+                "created": created,
+                "version": _version((created, uid, kind, payload)),
+                "item_json": json_dumps_bytes(item).decode("utf-8"),
+            }
+            for (created, uid, kind, payload), item in zip(changed, items)
+        ]
+        for i in range(0, len(rows), UPSERT_CHUNK):
+            bulk_upsert(ActivityEvent, rows[i:i + UPSERT_CHUNK])
+    if gone:
+        ActivityEvent.query.filter(
+            ActivityEvent.league_id == lid, ActivityEvent.uid.in_(sorted(gone))
+        ).delete(synchronize_session=False)
+
+    # Upsert, so two first syncs of a league do not collide on the insert
+    bulk_upsert(ActivityFeedState, [{
+        "league_id": lid,
+        "tx_watermark_round": watermark,
+        "local_change_seq": change_seq,
+        "event_count": ActivityEvent.query.filter(ActivityEvent.league_id == lid).count(),
+        "updated_at": datetime.utcnow(),
+    }])
+    ContractChange.query.filter(
+        ContractChange.created_at < datetime.utcnow() - CHANGE_RETENTION
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    logger.info(f"Activity feed {lid}: {len(changed)} events enriched, {len(gone)} removed")
+    return db.session.get(ActivityFeedState, lid)
+
+
+def refresh(league_id: str, league_chain_ids: List[int]) -> int:
+    """Sync the league's feed unless it was synced within the cache TTL; returns total events"""
+    key = str(league_id)
+    total = activity_feed_cache.get(key)
+    if total is None:
+        try:
+            total = sync(league_id, league_chain_ids).event_count
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Activity feed sync failed for {league_id}: {e}")
+            state = db.session.get(ActivityFeedState, int(league_id))
+            if state is None:
+                raise
+            total = state.event_count
+        activity_feed_cache.set(key, total, tags=chain_tags(league_chain_ids))
+    return total
+
+
+def parse_cursor(before: Optional[str]) -> Optional[Tuple[int, str]]:
+    """(created, uid) from a "<created>" or "<created>:<uid>" cursor; ValueError if malformed"""
+    if not before:
+        return None
+    created, _, uid = str(before).partition(":")
+    try:
+        return int(created), uid
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {before}")
+
+
+def read_page(
+    league_id: str,
+    before: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 20
+) -> Tuple[List[Dict], Optional[str]]:
+    """Newest-first feed items after the `before` cursor (or offset) and the next cursor.
+
+    Cursors are "<created>" (skip everything at or after that time) or
+    "<created>:<uid>" as returned in next_cursor; see parse_cursor.
+    """
+    limit = max(0, limit)
+    cursor = parse_cursor(before)
+    query = ActivityEvent.query.filter(ActivityEvent.league_id == int(league_id))
+    if cursor:
+        created, uid = cursor
+        if uid:
+            query = query.filter(or_(
+                ActivityEvent.created < created,
+                and_(ActivityEvent.created == created, ActivityEvent.uid > uid),
+            ))
+        else:
+            query = query.filter(ActivityEvent.created < created)
+    query = query.order_by(ActivityEvent.created.desc(), ActivityEvent.uid.asc())
+    if not cursor and offset:
+        query = query.offset(max(0, offset))
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit and limit:
+        last = rows[limit - 1]
+        next_cursor = f"{last.created}:{last.uid}"
+    return [json_loads(row.item_json) for row in rows[:limit]], next_cursor
@@ -0,0 +1,247 @@
+"""
+League activity sources.
+
+Lightweight entries for every Sleeper transaction and local event
+(contracts, amnesties, RFAs, extensions and commissioner actions) of a
+league chain, and enrich() which turns a batch of entries into
+display-ready feed items with team and player names. activity_store
+persists the enriched items so each entry is only enriched once.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import AmnestyPlayer, CommissionerActionLog, Contract, ExtensionPlayer, LocalPlayer, RfaPlayer
+from .sleeper_service import sleeper_service
+
+# (created, uid, kind, payload); uid breaks ties between equal timestamps
+Entry = Tuple[int, str, str, Dict]
+
+
+def _created_ts(created_at, season) -> int:
+    if isinstance(created_at, datetime):
+        return int(created_at.timestamp() * 1000)
+    try:
+        return int(season) * 1000000
+    except Exception:
+        return 0
+
+
+def _tx_created(tx: Dict) -> int:
+    try:
+        return int(tx.get('created') or tx.get('status_updated') or 0)
+    except Exception:
+        return 0
+
+
+def transaction_entries(league_id: str, rounds: int, start_round: int = 0) -> Dict[int, List[Entry]]:
+    """round_num -> entries for Sleeper transaction rounds start_round..rounds-1"""
+    by_round = sleeper_service.get_transactions_bulk(league_id, range(max(0, start_round), rounds))
+    return {
+        round_num: [
+            (_tx_created(tx), f"tx:{round_num}:{tx.get('transaction_id') or idx}", "transaction", tx)
+            for idx, tx in enumerate(transactions or [])
+            if isinstance(tx, dict)
+        ]
+        for round_num, transactions in by_round.items()
+    }
+
+
+def local_entries(league_chain_ids: List[int], player_ids: Optional[Iterable[int]] = None) -> List[Entry]:
+    """Entries for the contract, amnesty, RFA, extension and commissioner rows of a chain.
+
+    With player_ids, only those players' rows are read.
+    """
+    player_ids = sorted({int(pid) for pid in player_ids}) if player_ids is not None else None
+
+    def _rows(model):
+        query = model.query.filter(model.league_id.in_(league_chain_ids))
+        if player_ids is not None:
+            query = query.filter(model.player_id.in_(player_ids))
+        return query.all()
+
+    contracts = _rows(Contract)
+    contracts_by_id = {c.id: c for c in contracts}
+
+    def _contract_field(contract_id, field):
+        return getattr(contracts_by_id.get(contract_id), field, None)
+
+    entries: List[Entry] = []
+    entries.extend(
+        (_created_ts(c.created_at, c.season), f"contract:{c.id}", "local", {
+            "type": "contract",
+            "player_id": c.player_id,
+            "team_id": c.team_id,
+            "contract_id": c.id,
+            "contract_amount": c.contract_amount,
+            "contract_length": c.contract_length,
+            "season": c.season,
+        })
+        for c in contracts
+    )
+    entries.extend(
+        (_created_ts(a.created_at, a.season), f"amnesty:{a.league_id}:{a.player_id}", "local", {
+            "type": "amnesty",
+            "player_id": a.player_id,
+            "team_id": a.team_id,
+            "contract_id": a.contract_id,
+            "contract_amount": _contract_field(a.contract_id, "contract_amount"),
+            "contract_length": _contract_field(a.contract_id, "contract_length"),
+            "season": a.season,
+        })
+        for a in _rows(AmnestyPlayer)
+    )
+    entries.extend(
+        (_created_ts(r.created_at, r.season), f"rfa:{r.league_id}:{r.player_id}", "local", {
+            "type": "rfa",
+            "player_id": r.player_id,
+            "team_id": r.team_id,
+            "contract_id": r.contract_id,
+            "contract_amount": _contract_field(r.contract_id, "contract_amount"),
+            "contract_length": r.contract_length,
+            "season": r.season,
+        })
+        for r in _rows(RfaPlayer)
+    )
+    entries.extend(
+        (_created_ts(e.created_at, e.season), f"extension:{e.league_id}:{e.player_id}", "local", {
+            "type": "extension",
+            "player_id": e.player_id,
+            "team_id": e.team_id,
+            "contract_id": e.contract_id,
+            "contract_amount": _contract_field(e.contract_id, "contract_amount"),
+            "contract_length": e.contract_length,
+            "season": e.season,
+        })
+        for e in _rows(ExtensionPlayer)
+    )
+    entries.extend(
+        (_created_ts(log.created_at, log.season or 0), f"commissioner:{log.id}", "local", {
+            "type": "commissioner",
+            "player_id": log.player_id,
+            "team_id": log.team_id,
+            "contract_amount": log.contract_amount,
+            "contract_length": log.contract_length,
+            "season": log.season,
+            "action_type": log.action_type,
+            "operation": log.operation,
+        })
+        for log in _rows(CommissionerActionLog)
+    )
+    return entries
+
+
+def _local_label(evt: Dict, name: str) -> str:
+    kind = evt.get("type")
+    if kind == "contract":
+        return f"Contract added: {name} ({evt.get('contract_length')}y)"
+    if kind == "amnesty":
+        return f"Amnesty used: {name}"
+    if kind == "rfa":
+        return f"RFA tagged: {name} ({evt.get('contract_length')}y)"
+    if kind == "extension":
+        return f"Extension added: {name} ({evt.get('contract_length')}y)"
+    action_label = str(evt.get("action_type") or "action").upper()
+    op_label = "Added" if (evt.get("operation") or "").lower() == "add" else "Removed"
+    length_suffix = f" ({evt['contract_length']}y)" if evt.get("contract_length") else ""
+    return f"Commissioner {op_label}: {action_label} for {name}{length_suffix}"
+
+
+def _player_ids(raw) -> List[str]:
+    if isinstance(raw, dict):
+        return [str(pid) for pid in raw.keys()]
+    if isinstance(raw, list):
+        return [str(pid) for pid in raw]
+    return []
+
+
+def enrich(league_id: str, entries: List[Entry]) -> List[Dict]:
+    """Feed items for one page: team names, player names/positions and labels"""
+    from .roster_service import RosterService
+
+    rosters = sleeper_service.get_rosters(league_id) or []
+    users = sleeper_service.get_users(league_id) or []
+    users_map = {u.get('user_id'): u for u in users if isinstance(u, dict)}
+    team_name_map = {}
+    owner_name_map = {}
+    for roster in rosters:
+        if not isinstance(roster, dict):
+            continue
+        user = users_map.get(roster.get('owner_id')) or {}
+        display_name = user.get('display_name') or user.get('username')
+        if display_name:
+            team_name_map[str(roster.get('roster_id'))] = display_name
+            owner_name_map[str(roster.get('owner_id'))] = display_name
+
+    page_player_ids = set()
+    for _, _, kind, payload in entries:
+        if kind == "transaction":
+            page_player_ids.update(_player_ids(payload.get('adds')))
+            page_player_ids.update(_player_ids(payload.get('drops')))
+        else:
+            page_player_ids.add(str(payload.get("player_id")))
+
+    local_ids = [int(pid) for pid in page_player_ids if pid.isdigit()]
+    local_players_map = {
+        str(p.player_id): p
+        for p in (LocalPlayer.query.filter(LocalPlayer.player_id.in_(local_ids)).all() if local_ids else [])
+    }
+    players_map = RosterService.build_players_map(str(league_id), player_ids=list(page_player_ids))
+    players_map.update(RosterService.resolve_missing_players(
+        pid for pid in page_player_ids if pid not in local_players_map and pid not in players_map
+    ))
+
+    def _player_name(pid) -> str:
+        player = local_players_map.get(str(pid)) or players_map.get(str(pid))
+        if player:
+            return f"{player.first_name or ''} {player.last_name or ''}".strip()
+        return f"Player {pid}"
+
+    def _player_position(pid) -> str:
+        player = local_players_map.get(str(pid)) or players_map.get(str(pid))
+        if player and player.position:
+            return player.position
+        return "N/A"
+
+    def _player_details(raw) -> List[Dict]:
+        return [
+            {"player_id": pid, "name": _player_name(pid), "position": _player_position(pid)}
+            for pid in _player_ids(raw)
+        ]
+
+    items = []
+    for created, _, kind, payload in entries:
+        if kind == "transaction":
+            tx = payload
+            roster_id = tx.get('roster_id') or tx.get('team_id')
+            roster_ids = tx.get('roster_ids') if isinstance(tx.get('roster_ids'), list) else []
+            creator_id = tx.get('creator') or tx.get('creator_id')
+
+            tx_team_name = None
+            if roster_id is not None:
+                tx_team_name = team_name_map.get(str(roster_id))
+            if not tx_team_name and roster_ids:
+                tx_team_name = team_name_map.get(str(roster_ids[0]))
+            if not tx_team_name and creator_id:
+                tx_team_name = owner_name_map.get(str(creator_id))
+
+            items.append({
+                "source": "transaction",
+                **tx,
+                "team_id": roster_id if roster_id is not None else (roster_ids[0] if roster_ids else None),
+                "team_name": tx_team_name,
+                "adds_detail": _player_details(tx.get('adds')),
+                "drops_detail": _player_details(tx.get('drops')),
+            })
+        else:
+            evt = {k: v for k, v in payload.items() if k not in ("action_type", "operation")}
+            item = {
+                "source": "local",
+                **evt,
+                "created": created,
+                "label": _local_label(payload, _player_name(payload.get("player_id"))),
+            }
+            if evt.get("team_id") is not None:
+                item["team_name"] = team_name_map.get(str(evt["team_id"]))
+            items.append(item)
+    return items
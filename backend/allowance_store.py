@@ -0,0 +1,150 @@
+"""
+Write-behind persistence for team allowances (rfa_teams, amnesty_team,
+extension_team).
+
+The rosters GET computes every team's remaining RFA / amnesty / extension
+allowance and hands the values to submit(). A background thread writes
+a league only when its values differ from what was last persisted, as
+one INSERT ... ON CONFLICT per table. The GET path itself never writes.
+Set ALLOWANCE_WRITE_BEHIND=0 to write inline (still upsert-only-on-change).
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from .bulk_upsert import bulk_upsert
+from .extensions import db
+from .models import AmnestyTeam, ExtensionTeam, RfaTeam
+
+logger = logging.getLogger(__name__)
+
+# team_id -> (rfa_left, amnesty_left, extension_left)
+Allowances = Dict[int, Tuple[int, int, int]]
+
+
+def _load_persisted(league_id: int) -> Allowances:
+    rfa = dict(db.session.query(RfaTeam.team_id, RfaTeam.rfa_left).filter_by(league_id=league_id).all())
+    amnesty = dict(db.session.query(AmnestyTeam.team_id, AmnestyTeam.amnesty_left).filter_by(league_id=league_id).all())
+    extension = dict(
+        db.session.query(ExtensionTeam.team_id, ExtensionTeam.extension_left).filter_by(league_id=league_id).all()
+    )
+    return {
+        int(team_id): (rfa.get(team_id), amnesty.get(team_id), extension.get(team_id))
+        for team_id in set(rfa) | set(amnesty) | set(extension)
+    }
+
+
+def write_allowances(league_id: int, allowances: Allowances, persisted: Optional[Allowances] = None) -> int:
+    """Upsert the teams whose allowances changed; returns teams written"""
+    if persisted is None:
+        persisted = _load_persisted(league_id)
+    changed = {
+        team_id: values for team_id, values in allowances.items()
+        if persisted.get(team_id) != values
+    }
+    if not changed:
+        return 0
+    bulk_upsert(RfaTeam, [
+        {"league_id": league_id, "team_id": team_id, "rfa_left": rfa_left}
+        for team_id, (rfa_left, _, _) in changed.items()
+    ])
+    bulk_upsert(AmnestyTeam, [
+        {"league_id": league_id, "team_id": team_id, "amnesty_left": amnesty_left}
+        for team_id, (_, amnesty_left, _) in changed.items()
+    ])
+    bulk_upsert(ExtensionTeam, [
+        {"league_id": league_id, "team_id": team_id, "extension_left": extension_left}
+        for team_id, (_, _, extension_left) in changed.items()
+    ])
+    db.session.commit()
+    return len(changed)
+
+
+class AllowanceWriter:
+    """Coalescing write-behind queue for team allowances"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv("ALLOWANCE_WRITE_BEHIND", "1") == "1"
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        # league_id -> newest allowances not yet written (older submits are dropped)
+        self._pending: Dict[int, Allowances] = {}
+        # league_id -> allowances known to be persisted
+        self._persisted: Dict[int, Allowances] = {}
+        self._app = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"submitted": 0, "skipped_unchanged": 0, "writes": 0, "teams_written": 0, "errors": 0}
+
+    def submit(self, app, league_id: int, allowances: Allowances) -> None:
+        """Queue a league's allowances; unchanged values are dropped immediately"""
+        league_id = int(league_id)
+        with self._lock:
+            self._stats["submitted"] += 1
+            if self._persisted.get(league_id) == allowances:
+                self._stats["skipped_unchanged"] += 1
+                return
+            if not self.enabled:
+                inline = True
+            else:
+                inline = False
+                self._pending[league_id] = dict(allowances)
+                self._app = app
+                self._ensure_thread()
+                self._wake.notify()
+        if inline:
+            self._write(league_id, allowances)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="allowance-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wake.wait()
+                league_id, allowances = self._pending.popitem()
+                app = self._app
+            with app.app_context():
+                self._write(league_id, allowances)
+
+    def _write(self, league_id: int, allowances: Allowances) -> None:
+        try:
+            written = write_allowances(league_id, allowances, self._persisted.get(league_id))
+            with self._lock:
+                self._persisted[league_id] = dict(allowances)
+                if written:
+                    self._stats["writes"] += 1
+                    self._stats["teams_written"] += written
+        except Exception as e:
+            db.session.rollback()
+            with self._lock:
+                self._persisted.pop(league_id, None)
+                self._stats["errors"] += 1
+            logger.warning(f"Failed to persist team allowances for league {league_id}: {e}")
+
+    def flush(self) -> None:
+        """Write everything still queued in the calling thread (needs an app)"""
+        while True:
+            with self._lock:
+                if not self._pending or self._app is None:
+                    return
+                league_id, allowances = self._pending.popitem()
+                app = self._app
+            with app.app_context():
+                self._write(league_id, allowances)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending), "enabled": self.enabled}
+
+
+# Global writer; fed by RosterService.get_rosters_response
+allowance_writer = AllowanceWriter()
+atexit.register(allowance_writer.flush)
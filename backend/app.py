@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from flask import Flask
 from flask_cors import CORS
 import logging
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 
 from .config import Config
 from .extensions import db
@@ -34,10 +34,12 @@ def create_app():
 
         def ensure_column(table: str, column: str, column_type: str):
             try:
-                if db.engine.dialect.name != "sqlite":
-                    return
-                result = db.session.execute(text(f"PRAGMA table_info({table})"))
-                columns = [row[1] for row in result.fetchall()]
+                if db.engine.dialect.name == "sqlite":
+                    result = db.session.execute(text(f"PRAGMA table_info({table})"))
+                    columns = [row[1] for row in result.fetchall()]
+                else:
+                    columns = [col["name"] for col in inspect(db.engine).get_columns(table)]
+                    column_type = column_type.replace("DATETIME", "TIMESTAMP")
                 if column not in columns:
                     logger.info(f"Adding {column} column to {table} table")
                     db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
@@ -50,6 +52,7 @@ def create_app():
         ensure_column("amnesty_player", "created_at", "DATETIME")
         ensure_column("rfa_players", "created_at", "DATETIME")
         ensure_column("extension_players", "created_at", "DATETIME")
+        ensure_column("local_players", "updated_at", "DATETIME")
         league_info_columns = {
             "is_auction": "INTEGER",
             "is_keeper": "INTEGER",
@@ -67,9 +70,44 @@ def create_app():
         }
         for column, column_type in league_info_columns.items():
             ensure_column("league_info", column, column_type)
+        for table in (
+            "sleeper_league",
+            "sleeper_rosters",
+            "sleeper_users",
+            "sleeper_drafts",
+            "sleeper_draft_picks",
+            "sleeper_transactions",
+        ):
+            ensure_column(table, "no_expiry", "BOOLEAN DEFAULT FALSE")
+        ensure_column("activity_feed_state", "local_change_seq", "BIGINT")
+        ensure_column("league_chain", "contract_state_stale", "BOOLEAN DEFAULT FALSE")
+
+        try:
+            from .league_chain_index import backfill_members
+            indexed = backfill_members()
+            if indexed:
+                logger.info(f"Indexed members for {indexed} existing league chains")
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Could not backfill league chain members: {e}")
+
+        try:
+            from .contract_state import ensure_built
+            built = ensure_built()
+            if built:
+                logger.info(f"Built contract_state for {built} existing contracts")
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Could not build contract state: {e}")
     
     # Register blueprints
     app.register_blueprint(api)
+
+    # Single-process deployments can warm caches in-process; multi-worker
+    # deployments should run scripts/warm_cache.py as one separate worker.
+    if os.getenv("CACHE_WARMER_ENABLED", "0") == "1":
+        from .cache_warmer import cache_warmer
+        cache_warmer.start(app)
     
     return app
 
@@ -0,0 +1,35 @@
+"""
+Dialect-native bulk upserts.
+
+One INSERT ... ON CONFLICT DO UPDATE statement on SQLite and Postgres;
+other dialects fall back to session.merge per row. The caller commits.
+"""
+
+from typing import Dict, List
+
+from .extensions import db
+
+
+def bulk_upsert(model, rows: List[Dict]) -> None:
+    """Insert rows, updating every non-primary-key column on key conflicts"""
+    if not rows:
+        return
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        for row in rows:
+            db.session.merge(model(**row))
+        return
+
+    table = model.__table__
+    keys = [col.name for col in table.primary_key.columns]
+    stmt = insert(table).values(rows)
+    updates = {name: stmt.excluded[name] for name in rows[0] if name not in keys}
+    if updates:
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+    db.session.execute(stmt)
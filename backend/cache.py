@@ -1,34 +1,651 @@
-from cachetools import TTLCache
-from threading import Lock
-from typing import Any, Dict, List
+from cachetools import LRUCache, TTLCache
+from collections import OrderedDict
+from threading import Event, Lock, local
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 import logging
+import os
+import pickle
+import sqlite3
+import time
+import weakref
+
+try:
+    import redis
+except ImportError:  # optional, only needed for CACHE_BACKEND=redis
+    redis = None
 
 logger = logging.getLogger(__name__)
 
+# How often (seconds) a CacheManager checks the shared tier for invalidations
+GENERATION_CHECK_INTERVAL = float(os.getenv("CACHE_GENERATION_CHECK_INTERVAL", "0.5"))
+# How long (seconds) the shared invalidation log is kept; slower readers clear their L1
+INVALIDATION_RETENTION = 600
+
+
+def _key_str(key: Any) -> str:
+    if isinstance(key, tuple):
+        return "|".join(str(k) for k in key)
+    return str(key)
+
+
+def chain_tags(league_ids: Iterable) -> List[str]:
+    """Invalidation tags for cached data derived from a league chain"""
+    return [f"league:{int(lid)}" for lid in league_ids]
+
+
+class CacheBackend:
+    """Shared cache tier visible to every worker process.
+
+    Values are namespaced. Each namespace has a generation counter and a
+    log of what each generation invalidated ("k:<key>", "t:<tag>", or "*"
+    for a clear), so other workers drop only those entries from their
+    local copies.
+    """
+
+    name = "base"
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        """Return (expires_at, value) or None"""
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    def generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    def bump_generation(self, namespace: str, entries: List[str]) -> int:
+        """Log entries under a new generation; returns it"""
+        raise NotImplementedError
+
+    def invalidations_since(self, namespace: str, generation: int) -> Tuple[int, Optional[List[Tuple[int, str]]]]:
+        """(newest generation, [(generation, entry)] logged after generation).
+
+        The list is None when part of that range was already pruned.
+        """
+        raise NotImplementedError
+
+    def tag(self, namespace: str, key: str, tags: List[str], ttl: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def invalidate_tags(self, namespace: str, tags: List[str]) -> List[str]:
+        """Delete every entry carrying any of tags; returns the keys removed"""
+        raise NotImplementedError
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Shared cache in a local SQLite file (WAL) for workers on one host"""
+
+    name = "sqlite"
+    PURGE_EVERY = 500  # writes between expired-row sweeps
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = local()
+        self._writes = 0
+        self._bumps = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_generations ("
+                "namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_tags ("
+                "namespace TEXT NOT NULL, tag TEXT NOT NULL, key TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, tag, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_invalidations ("
+                "namespace TEXT NOT NULL, generation INTEGER NOT NULL, entry TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_invalidations ON cache_invalidations (namespace, generation)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace, key):
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return expires_at, pickle.loads(value)
+
+    def set(self, namespace, key, value, ttl):
+        expires_at = time.time() + ttl if ttl else None
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at)
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM cache_tags WHERE NOT EXISTS (SELECT 1 FROM cache_entries e "
+                "WHERE e.namespace = cache_tags.namespace AND e.key = cache_tags.key)"
+            )
+
+    def delete(self, namespace, key):
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        conn.execute("DELETE FROM cache_tags WHERE namespace = ?", (namespace,))
+
+    def tag(self, namespace, key, tags, ttl):
+        self._conn().executemany(
+            "INSERT OR IGNORE INTO cache_tags (namespace, tag, key) VALUES (?, ?, ?)",
+            [(namespace, tag, key) for tag in tags]
+        )
+
+    def invalidate_tags(self, namespace, tags):
+        conn = self._conn()
+        marks = ",".join("?" for _ in tags)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT key FROM cache_tags WHERE namespace = ? AND tag IN ({marks})",
+                (namespace, *tags)
+            )]
+            conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key in keys]
+            )
+            conn.execute(f"DELETE FROM cache_tags WHERE namespace = ? AND tag IN ({marks})", (namespace, *tags))
+            conn.execute("COMMIT")
+            return keys
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def generation(self, namespace):
+        row = self._conn().execute(
+            "SELECT generation FROM cache_generations WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, namespace, entries):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT OR IGNORE INTO cache_generations (namespace, generation) VALUES (?, 0)", (namespace,))
+            conn.execute("UPDATE cache_generations SET generation = generation + 1 WHERE namespace = ?", (namespace,))
+            generation = conn.execute(
+                "SELECT generation FROM cache_generations WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO cache_invalidations (namespace, generation, entry, created) VALUES (?, ?, ?, ?)",
+                [(namespace, generation, entry, now) for entry in entries or ["*"]]
+            )
+            self._bumps += 1
+            if self._bumps % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM cache_invalidations WHERE created < ?", (now - INVALIDATION_RETENTION,))
+            conn.execute("COMMIT")
+            return generation
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def invalidations_since(self, namespace, generation):
+        latest = self.generation(namespace)
+        if latest <= generation:
+            return latest, []
+        rows = self._conn().execute(
+            "SELECT generation, entry FROM cache_invalidations "
+            "WHERE namespace = ? AND generation > ? AND generation <= ? ORDER BY generation",
+            (namespace, generation, latest)
+        ).fetchall()
+        # Every generation logs at least one entry, so a gap means it was pruned
+        if not rows or rows[0][0] != generation + 1:
+            return latest, None
+        return latest, rows
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache on Redis (or any Redis-protocol server) for multi-host deployments"""
+
+    name = "redis"
+    LOG_GENERATIONS = 10000  # invalidation log length per namespace
+
+    def __init__(self, url: str, prefix: str = "sleeper2"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def get(self, namespace, key):
+        pipe = self.client.pipeline()
+        pipe.get(self._key(namespace, key))
+        pipe.pttl(self._key(namespace, key))
+        value, pttl = pipe.execute()
+        if value is None:
+            return None
+        expires_at = time.time() + pttl / 1000 if pttl and pttl > 0 else None
+        return expires_at, pickle.loads(value)
+
+    def set(self, namespace, key, value, ttl):
+        self.client.set(self._key(namespace, key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=ttl or None)
+
+    def delete(self, namespace, key):
+        self.client.delete(self._key(namespace, key))
+
+    def clear(self, namespace):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:{namespace}:*", count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def generation(self, namespace):
+        return int(self.client.get(f"{self.prefix}:generation:{namespace}") or 0)
+
+    def _log_key(self, namespace: str) -> str:
+        return f"{self.prefix}:invalidations:{namespace}"
+
+    def bump_generation(self, namespace, entries):
+        generation = int(self.client.incr(f"{self.prefix}:generation:{namespace}"))
+        pipe = self.client.pipeline()
+        pipe.zadd(self._log_key(namespace), {f"{generation}|{entry}": generation for entry in entries or ["*"]})
+        pipe.zremrangebyscore(self._log_key(namespace), "-inf", generation - self.LOG_GENERATIONS)
+        pipe.expire(self._log_key(namespace), INVALIDATION_RETENTION)
+        pipe.execute()
+        return generation
+
+    def invalidations_since(self, namespace, generation):
+        pipe = self.client.pipeline()
+        pipe.get(f"{self.prefix}:generation:{namespace}")
+        pipe.zrangebyscore(self._log_key(namespace), f"({generation}", "+inf", withscores=True)
+        latest, members = pipe.execute()
+        latest = int(latest or 0)
+        if latest <= generation:
+            return latest, []
+        entries = sorted(
+            (int(score), (m.decode() if isinstance(m, bytes) else m).split("|", 1)[1])
+            for m, score in members
+            if int(score) <= latest
+        )
+        # Missing generations were trimmed (or their entries are not written yet)
+        if not entries or entries[0][0] != generation + 1:
+            return latest, None
+        return latest, entries
+
+    def _tag_key(self, namespace: str, tag: str) -> str:
+        return f"{self.prefix}:tag:{namespace}:{tag}"
+
+    def tag(self, namespace, key, tags, ttl):
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.sadd(self._tag_key(namespace, tag), key)
+            if ttl:
+                # Outlive the newest tagged entry; stale members only over-evict
+                pipe.expire(self._tag_key(namespace, tag), ttl * 2)
+        pipe.execute()
+
+    def invalidate_tags(self, namespace, tags):
+        tag_keys = [self._tag_key(namespace, tag) for tag in tags]
+        keys = {m.decode() if isinstance(m, bytes) else m for m in self.client.sunion(tag_keys)}
+        if keys:
+            self.client.delete(*[self._key(namespace, key) for key in keys])
+        self.client.delete(*tag_keys)
+        return sorted(keys)
+
+
+_shared_backend: Optional[CacheBackend] = None
+_shared_backend_loaded = False
+_registry: "weakref.WeakSet[CacheManager]" = weakref.WeakSet()
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """Configured shared tier (CACHE_BACKEND=local|sqlite|redis); None for local"""
+    global _shared_backend, _shared_backend_loaded
+    if _shared_backend_loaded:
+        return _shared_backend
+    kind = os.getenv("CACHE_BACKEND", "local").lower()
+    try:
+        if kind == "sqlite":
+            default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "shared_cache.db")
+            _shared_backend = SQLiteCacheBackend(os.getenv("CACHE_SQLITE_PATH", default_path))
+        elif kind == "redis":
+            _shared_backend = RedisCacheBackend(os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"))
+        elif kind != "local":
+            logger.warning(f"Unknown CACHE_BACKEND {kind}, using process-local caches")
+    except Exception as e:
+        logger.warning(f"Shared cache backend {kind} unavailable, using process-local caches: {e}")
+        _shared_backend = None
+    _shared_backend_loaded = True
+    return _shared_backend
+
+
 class CacheManager:
-    """Thread-safe cache manager with TTL support"""
+    """Thread-safe cache manager with TTL support (ttl=None for LRU-only).
+
+    With a namespace and a configured shared backend, entries are written
+    through to the shared tier and read back by other workers; the local
+    cache acts as L1. delete(), invalidate_tags() and clear() log what they
+    invalidated under a new namespace generation, and other workers drop
+    just those keys/tags from their L1 within GENERATION_CHECK_INTERVAL.
+
+    A miss remembers the generation it was seen at; set() for that key
+    is dropped if the key or one of its tags was invalidated since, so a
+    value computed from data that changed meanwhile is never cached.
+    """
     
-    def __init__(self, maxsize: int = 100, ttl: int = 300):
-        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    def __init__(
+        self,
+        maxsize: int = 100,
+        ttl: Optional[int] = 300,
+        namespace: Optional[str] = None,
+        backend: Optional[CacheBackend] = None
+    ):
+        self.ttl = ttl
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl) if ttl else LRUCache(maxsize=maxsize)
         self.lock = Lock()
+        self.namespace = namespace
+        self.shared = (backend or get_shared_backend()) if namespace else None
+        self._generation: Optional[int] = None if self.shared is not None else 0
+        self._generation_checked = 0.0
+        self._tags: Dict[str, Set[Any]] = {}
+        # "k:<key>" / "t:<tag>" / "*" -> generation it was last invalidated at
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._invalidated_floor = 0  # generations at or below this may be forgotten
+        self._misses: Dict[Any, int] = {}  # key -> generation of its last miss
+        _registry.add(self)
+
+    def _shared_call(self, op: str, fn: Callable[[], Any]) -> Any:
+        try:
+            return fn()
+        except Exception as e:
+            logger.warning(f"Shared cache {op} failed for {self.namespace}: {e}")
+            return None
+
+    def _record(self, entries: Iterable[str], generation: int) -> None:
+        """Remember invalidations for the set() guard (caller holds the lock)"""
+        for entry in entries:
+            self._invalidated.pop(entry, None)
+            self._invalidated[entry] = generation
+        while len(self._invalidated) > 4 * self.cache.maxsize:
+            _, forgotten = self._invalidated.popitem(last=False)
+            self._invalidated_floor = max(self._invalidated_floor, forgotten)
+
+    def _apply(self, entries: List[Tuple[int, str]]) -> None:
+        """Drop the L1 entries named by other workers' invalidations (caller holds the lock)"""
+        keys = set()
+        for generation, entry in entries:
+            kind, _, name = entry.partition(":")
+            if entry == "*":
+                self.cache.clear()
+                self._tags.clear()
+            elif kind == "t":
+                for key in self._tags.pop(name, set()):
+                    self.cache.pop(key, None)
+            elif kind == "k":
+                keys.add(name)
+            self._record([entry], generation)
+        if keys:
+            for key in [k for k in self.cache if _key_str(k) in keys]:
+                self.cache.pop(key, None)
+
+    def _sync_generation(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._generation_checked < GENERATION_CHECK_INTERVAL:
+            return
+        self._generation_checked = now
+        if self._generation is None:
+            generation = self._shared_call("generation", lambda: self.shared.generation(self.namespace))
+            if generation is not None:
+                with self.lock:
+                    self._generation = max(self._generation or 0, generation)
+                    self._invalidated_floor = self._generation
+            return
+        since = self._generation
+        found = self._shared_call(
+            "invalidations", lambda: self.shared.invalidations_since(self.namespace, since)
+        )
+        if found is None:
+            return
+        latest, entries = found
+        with self.lock:
+            if self._generation != since:
+                return  # another thread applied this range
+            if entries is None:
+                # Fell behind the retained log: drop everything
+                self._apply([(latest, "*")])
+            else:
+                self._apply(entries)
+            self._generation = latest
+
+    def _publish(self, entries: List[str]) -> None:
+        """Log invalidations for other workers and for this cache's set() guard"""
+        if self.shared is None:
+            with self.lock:
+                self._generation += 1
+                self._record(entries, self._generation)
+            return
+        generation = self._shared_call("bump", lambda: self.shared.bump_generation(self.namespace, entries))
+        with self.lock:
+            # Not applied to _generation: other workers' earlier bumps are still unread
+            self._record(entries, generation if generation is not None else (self._generation or 0) + 1)
+
+    def _invalidated_since(self, key: Any, tags: List[str], generation: int) -> bool:
+        if self.shared is not None:
+            self._sync_generation(force=True)
+        with self.lock:
+            if generation < self._invalidated_floor:
+                return True
+            names = ["*", f"k:{_key_str(key)}"] + [f"t:{tag}" for tag in tags]
+            return any(self._invalidated.get(name, -1) > generation for name in names)
+
+    def note_miss(self, key: Any) -> None:
+        """Start guarding key as if get() had just missed it (for callers that skip the read)"""
+        if self.shared is not None:
+            self._sync_generation()
+        with self.lock:
+            if len(self._misses) > 4 * self.cache.maxsize:
+                self._misses.clear()
+            self._misses[key] = self._generation or 0
     
     def get(self, key: str) -> Any:
+        if self.shared is None:
+            with self.lock:
+                value = self.cache.get(key)
+            if value is None:
+                self.note_miss(key)
+            return value
+
+        self._sync_generation()
         with self.lock:
-            return self.cache.get(key)
+            entry = self.cache.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.time():
+                return value
+        found = self._shared_call("get", lambda: self.shared.get(self.namespace, _key_str(key)))
+        if found is None:
+            self.note_miss(key)
+            return None
+        with self.lock:
+            self.cache[key] = found
+        return found[1]
     
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, tags: Optional[Iterable[str]] = None) -> None:
+        """Store value; tags let invalidate_tags() evict it later.
+
+        Dropped if key or its tags were invalidated after its last miss.
+        """
+        tags = list(tags or [])
+        with self.lock:
+            missed_at = self._misses.pop(key, None)
+        if missed_at is not None and self._invalidated_since(key, tags, missed_at):
+            logger.info(f"Skipped caching {self.namespace or 'local'}:{key}; invalidated while it was computed")
+            return
+        if tags:
+            self._add_tags(key, tags)
+        if self.shared is None:
+            with self.lock:
+                self.cache[key] = value
+            return
+
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self.lock:
+            self.cache[key] = (expires_at, value)
+        self._shared_call("set", lambda: self.shared.set(self.namespace, _key_str(key), value, self.ttl))
+        if tags:
+            self._shared_call("tag", lambda: self.shared.tag(self.namespace, _key_str(key), tags, self.ttl))
+
+    def _add_tags(self, key: Any, tags: List[str]) -> None:
         with self.lock:
-            self.cache[key] = value
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            # Drop index entries for keys that expired or were evicted
+            if sum(len(keys) for keys in self._tags.values()) > 4 * self.cache.maxsize:
+                self._tags = {
+                    tag: {k for k in keys if k in self.cache}
+                    for tag, keys in self._tags.items()
+                }
+                self._tags = {tag: keys for tag, keys in self._tags.items() if keys}
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Evict every entry stored with any of tags, here and in the shared tier"""
+        tags = list(tags)
+        if not tags:
+            return 0
+        with self.lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.pop(tag, set())
+            for key in keys:
+                self.cache.pop(key, None)
+        removed = len(keys)
+        shared_keys = []
+        if self.shared is not None:
+            shared_keys = self._shared_call(
+                "invalidate", lambda: self.shared.invalidate_tags(self.namespace, tags)
+            ) or []
+            removed = max(removed, len(shared_keys))
+        # Logged even when nothing was cached: a value being computed may carry these tags
+        self._publish([f"t:{tag}" for tag in tags] + [f"k:{key}" for key in shared_keys])
+        return removed
     
     def delete(self, key: str) -> None:
         with self.lock:
             if key in self.cache:
                 del self.cache[key]
+        if self.shared is not None:
+            self._shared_call("delete", lambda: self.shared.delete(self.namespace, _key_str(key)))
+        self._publish([f"k:{_key_str(key)}"])
     
     def clear(self) -> None:
         with self.lock:
             self.cache.clear()
+            self._tags.clear()
+        if self.shared is not None:
+            self._shared_call("clear", lambda: self.shared.clear(self.namespace))
+        self._publish(["*"])
+
+def invalidate_tags(tags: Iterable[str]) -> int:
+    """Evict entries carrying any of tags from every cache in this process
+    (and the shared tier); returns entries removed"""
+    tags = list(tags)
+    return sum(cache.invalidate_tags(tags) for cache in list(_registry))
+
+
+class _InFlightCall:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is running wait and share its result (or exception).
+    """
+
+    def __init__(self, name: str, wait_timeout: float = 30.0):
+        self.name = name
+        self.wait_timeout = wait_timeout
+        self.lock = Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self.lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._executed += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            if call.event.wait(self.wait_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            # Leader is stuck; don't hold this caller hostage
+            logger.warning(f"{self.name}: timed out waiting on in-flight call for {key}")
+            return fn()
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
 
 # Global cache instances
-sleeper_api_cache = CacheManager(maxsize=200, ttl=300)  # 5 minutes
-league_cache = CacheManager(maxsize=50, ttl=600)  # 10 minutes
\ No newline at end of file
+sleeper_api_cache = CacheManager(maxsize=200, ttl=300)  # 5 minutes; the DB URL tier is already shared
+league_cache = CacheManager(maxsize=50, ttl=600, namespace="league")  # 10 minutes
+pinned_entity_cache = CacheManager(maxsize=2000, ttl=None)  # completed seasons, no expiry
+activity_feed_cache = CacheManager(maxsize=100, ttl=60, namespace="activity_feed")  # 1 minute
+activity_page_cache = CacheManager(maxsize=500, ttl=60, namespace="activity_page")  # 1 minute
+contract_listing_cache = CacheManager(maxsize=100, ttl=60, namespace="contract_listing")  # 1 minute
+roster_index_cache = CacheManager(maxsize=200, ttl=30, namespace="roster_index")  # 30 seconds, like rosters_response
+player_image_missing_cache = CacheManager(maxsize=5000, ttl=60 * 60 * 24, namespace="player_image_missing")  # 1 day
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Background cache warmer for active league chains.
+
+Refreshes Sleeper data for recently active chains ahead of TTL expiry and
+precomputes the cost map and league rosters response, so the first request of the
+day doesn't pay for a cold load. Runs as an in-process daemon thread
+(CACHE_WARMER_ENABLED=1) or as a separate worker (scripts/warm_cache.py).
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from . import cost_map_store
+from .extensions import db
+from .models import LeagueChain
+from .rate_limiter import background_priority
+from .sleeper_service import sleeper_service
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Periodically refreshes Sleeper data for recently active league chains"""
+
+    def __init__(
+        self,
+        interval_seconds: Optional[int] = None,
+        active_hours: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        request_budget: Optional[int] = None,
+        max_chains: Optional[int] = None,
+        rounds: int = 18
+    ):
+        self.interval_seconds = interval_seconds or int(os.getenv("CACHE_WARMER_INTERVAL", "240"))
+        self.active_hours = active_hours or float(os.getenv("CACHE_WARMER_ACTIVE_HOURS", "24"))
+        self.concurrency = concurrency or int(os.getenv("CACHE_WARMER_CONCURRENCY", "2"))
+        self.request_budget = request_budget or int(os.getenv("CACHE_WARMER_REQUEST_BUDGET", "300"))
+        self.max_chains = max_chains or int(os.getenv("CACHE_WARMER_MAX_CHAINS", "50"))
+        self.rounds = rounds
+        self._lock = threading.Lock()
+        # league_id -> last request time
+        self._recent: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {"runs": 0, "chains_warmed": 0, "upstream_requests": 0, "errors": 0, "last_run_seconds": 0.0}
+
+    def record_activity(self, league_id: str) -> None:
+        """Remember a league served by this process"""
+        if not league_id:
+            return
+        with self._lock:
+            self._recent[str(league_id)] = time.time()
+
+    def discover(self) -> List[str]:
+        """Active current league ids, most recent first.
+
+        Combines leagues requested in this process with chains updated
+        within the active window.
+        """
+        cutoff = time.time() - self.active_hours * 3600
+        with self._lock:
+            self._recent = {lid: ts for lid, ts in self._recent.items() if ts >= cutoff}
+            active = sorted(self._recent, key=self._recent.get, reverse=True)
+
+        try:
+            since = datetime.utcnow() - timedelta(hours=self.active_hours)
+            chains = (
+                LeagueChain.query
+                .filter(LeagueChain.last_updated >= since)
+                .order_by(LeagueChain.last_updated.desc())
+                .limit(self.max_chains)
+                .all()
+            )
+            for chain in chains:
+                if str(chain.current_league_id) not in active:
+                    active.append(str(chain.current_league_id))
+        except Exception as e:
+            logger.warning(f"Cache warmer chain discovery failed: {e}")
+            db.session.rollback()
+
+        return active[:self.max_chains]
+
+    def warm_chain(self, league_id: str, budget: Optional[int] = None) -> int:
+        """Refresh one chain and precompute its responses; returns upstream URL count.
+
+        Completed seasons are skipped, the current league's transactions
+        are refetched from the cost map's watermark round, and no further
+        league is refreshed once budget requests are spent. Cached entries
+        are overwritten rather than deleted, so no worker drops its L1.
+        """
+        from .utils import get_rosters_response
+
+        chain = sleeper_service.get_league_chain(str(league_id), refresh=True) or [str(league_id)]
+        current_league_id = str(chain[0])
+        cost_map_key = f"{current_league_id}:{','.join(chain)}"
+        requested = 0
+        for lid in chain:
+            if budget is not None and requested >= budget:
+                break
+            if sleeper_service.is_league_complete(lid):
+                continue
+            start_round = cost_map_store.watermark_round(cost_map_key) if str(lid) == current_league_id else 0
+            requested += sleeper_service.refresh_league(lid, self.rounds, start_round)
+
+        get_rosters_response(current_league_id, "", refresh=True)
+        return requested
+
+    def run_once(self, app) -> Dict:
+        """Warm every active chain until the request budget is spent"""
+        start = time.time()
+        with app.app_context():
+            active = self.discover()
+        spent = 0
+        warmed = 0
+        errors = 0
+
+        def _warm(league_id, budget):
+            with app.app_context(), background_priority():
+                try:
+                    return self.warm_chain(league_id, budget), None
+                except Exception as e:
+                    db.session.rollback()
+                    return 0, e
+
+        items = active
+        concurrency = max(1, self.concurrency)
+        pending = {}
+
+        def _collect(futures):
+            nonlocal spent, warmed, errors
+            for future in futures:
+                league_id = pending.pop(future)
+                requested, error = future.result()
+                spent += requested
+                if error is not None:
+                    errors += 1
+                    logger.warning(f"Cache warmer failed for league {league_id}: {error}")
+                else:
+                    warmed += 1
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cache-warmer") as pool:
+            for league_id in items:
+                if len(pending) >= concurrency:
+                    _collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                # Checked per chain; each chain gets what is left of the budget
+                if spent >= self.request_budget:
+                    logger.info(f"Cache warmer budget of {self.request_budget} requests spent; deferring the rest")
+                    break
+                pending[pool.submit(_warm, league_id, self.request_budget - spent)] = league_id
+            _collect(list(pending))
+
+        elapsed = time.time() - start
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["chains_warmed"] += warmed
+            self._stats["upstream_requests"] += spent
+            self._stats["errors"] += errors
+            self._stats["last_run_seconds"] = round(elapsed, 2)
+        logger.info(f"Cache warmer warmed {warmed}/{len(items)} chains with {spent} upstream requests in {elapsed:.1f}s")
+        return {"chains": len(items), "warmed": warmed, "upstream_requests": spent, "errors": errors}
+
+    def run_forever(self, app) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once(app)
+            except Exception as e:
+                logger.exception(f"Cache warmer run failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self, app) -> None:
+        """Start the warmer as a daemon thread in this process"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, args=(app,), name="cache-warmer", daemon=True)
+        self._thread.start()
+        logger.info(f"Started in-process cache warmer (interval={self.interval_seconds}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "recent_leagues": len(self._recent), "running": bool(self._thread and self._thread.is_alive())}
+
+
+# Global warmer; record_activity is fed by the rosters request path
+cache_warmer = CacheWarmer()
@@ -0,0 +1,73 @@
+"""
+Multi-season salary cap projection.
+
+Builds a team x season matrix of committed dollars, players under
+contract and cap space for every team in a league in one pass. Amounts
+come from the rosters response (draft/transaction cost map); remaining
+years are contract_state.remaining_years, the same contract_years the
+rosters response gives the CapOutlook screen (extension years included).
+Like that screen, the current season counts every rostered player and
+later seasons only players still under contract.
+"""
+
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from .contract_state import remaining_years
+
+# Cap for leagues whose settings have no money_per_team
+DEFAULT_CAP_LIMIT = int(os.getenv("DEFAULT_CAP_LIMIT", "260"))
+
+
+def project_cap(
+    teams: List[Dict],
+    contracts: List[Dict],
+    current_season: int,
+    cap_limit: int,
+    seasons: int = 5
+) -> Dict:
+    """Committed salary, contract counts and cap space per team for `seasons` seasons"""
+    seasons = max(1, int(seasons))
+    years_by_player = remaining_years(contracts, current_season)
+
+    team_idx, amounts, years = [], [], []
+    for idx, team in enumerate(teams):
+        for player in team.get('players', []) or []:
+            team_idx.append(idx)
+            amounts.append(int(player.get('amount') or 0))
+            years.append(years_by_player.get(str(player.get('player_id')), 0))
+
+    team_idx = np.asarray(team_idx, dtype=np.intp)
+    amounts = np.asarray(amounts, dtype=np.int64)
+    years = np.asarray(years, dtype=np.int64)
+    offsets = np.arange(seasons, dtype=np.int64)
+
+    # players x seasons
+    under_contract = years[:, None] > offsets[None, :]
+    counted = under_contract | (offsets[None, :] == 0)
+
+    committed = np.zeros((len(teams), seasons), dtype=np.int64)
+    contract_counts = np.zeros((len(teams), seasons), dtype=np.int64)
+    np.add.at(committed, team_idx, amounts[:, None] * counted)
+    np.add.at(contract_counts, team_idx, under_contract.astype(np.int64))
+    cap_space = cap_limit - committed
+    league_average = committed.mean(axis=0) if len(teams) else np.zeros(seasons)
+
+    return {
+        'seasons': [current_season + int(o) for o in offsets],
+        'cap_limit': cap_limit,
+        'league_average': [round(float(v), 2) for v in league_average],
+        'teams': [
+            {
+                'owner_id': team.get('owner_id'),
+                'roster_id': team.get('roster_id'),
+                'display_name': team.get('display_name'),
+                'committed': committed[idx].tolist(),
+                'contracts': contract_counts[idx].tolist(),
+                'cap_space': cap_space[idx].tolist(),
+            }
+            for idx, team in enumerate(teams)
+        ],
+    }
@@ -0,0 +1,128 @@
+"""
+Storage codecs for cached Sleeper payloads.
+
+Compressed payloads are written as tagged ASCII text (e.g. "z1:<base64>") so
+the existing Text columns keep working on both SQLite and Postgres. Rows
+without a known tag are plain JSON written before codecs existed and are
+decoded transparently.
+"""
+
+import base64
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encode/decode
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional, better ratio/speed than zlib
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+def json_dumps_bytes(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(raw) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class PayloadCodec:
+    """Plain JSON text (the pre-codec storage format)"""
+
+    name = "json"
+    tag = ""
+
+    def encode(self, data: Any) -> str:
+        return json_dumps_bytes(data).decode("utf-8")
+
+    def decode(self, stored: str) -> Any:
+        return json_loads(stored)
+
+
+class ZlibCodec(PayloadCodec):
+    """zlib-compressed JSON, base64 text"""
+
+    name = "zlib"
+    tag = "z1:"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def encode(self, data: Any) -> str:
+        packed = zlib.compress(json_dumps_bytes(data), self.level)
+        return self.tag + base64.b64encode(packed).decode("ascii")
+
+    def decode(self, stored: str) -> Any:
+        packed = base64.b64decode(stored[len(self.tag):])
+        return json_loads(zlib.decompress(packed))
+
+
+class ZstdCodec(PayloadCodec):
+    """zstd-compressed JSON, base64 text (requires the zstandard package)"""
+
+    name = "zstd"
+    tag = "zs1:"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, data: Any) -> str:
+        packed = self._compressor.compress(json_dumps_bytes(data))
+        return self.tag + base64.b64encode(packed).decode("ascii")
+
+    def decode(self, stored: str) -> Any:
+        packed = base64.b64decode(stored[len(self.tag):])
+        return json_loads(self._decompressor.decompress(packed))
+
+
+CODECS: Dict[str, PayloadCodec] = {
+    "json": PayloadCodec(),
+    "zlib": ZlibCodec(),
+}
+if zstandard is not None:
+    CODECS["zstd"] = ZstdCodec()
+
+# Longest tags first so no tag shadows another that shares its prefix
+_DECODERS = sorted((c for c in CODECS.values() if c.tag), key=lambda c: len(c.tag), reverse=True)
+
+
+def get_codec(name: Optional[str] = None) -> PayloadCodec:
+    name = (name or os.getenv("SLEEPER_CACHE_CODEC", "zlib")).lower()
+    codec = CODECS.get(name)
+    if codec is None:
+        logger.warning(f"Cache codec {name} unavailable, falling back to zlib")
+        codec = CODECS["zlib"]
+    return codec
+
+
+_active_codec = get_codec()
+
+
+def encode_payload(data: Any) -> str:
+    """Encode a payload for the response_json/data_json columns"""
+    return _active_codec.encode(data)
+
+
+def decode_payload(stored: str) -> Any:
+    """Decode a stored payload written by any codec, or legacy plain JSON"""
+    for codec in _DECODERS:
+        if stored.startswith(codec.tag):
+            return codec.decode(stored)
+    if stored.startswith("zs1:"):
+        raise ValueError("zstd-encoded payload but the zstandard package is not installed")
+    return json_loads(stored)
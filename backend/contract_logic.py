@@ -2,6 +2,7 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from .models import Contract, AmnestyPlayer, ExtensionPlayer, LocalPlayer
 from .extensions import db
+from .contract_status import query_contract_status
 
 logger = logging.getLogger(__name__)
 
@@ -81,11 +82,10 @@ class ContractValidator:
                 - was_amnestied: bool
                 - team_id: int (current team from roster or contract)
         """
-        # Query contract from database
-        contract = Contract.query.filter_by(
-            league_id=league_id,
-            player_id=player_id
-        ).first()
+        # Query contract (with amnesty flag) from database
+        statuses = query_contract_status([league_id], [player_id])
+        status = statuses[0] if statuses else None
+        contract = status.contract if status else None
         
         result = {
             'has_contract': False,
@@ -118,24 +118,16 @@ class ContractValidator:
             result['team_id'] = contract.team_id
         
         # Check if contract was amnestied
-        amnesty_records = AmnestyPlayer.query.filter_by(
-            contract_id=contract.id
-        ).all()
-        
-        if amnesty_records:
+        if status.is_amnestied:
             result['was_amnestied'] = True
             result['is_active'] = False
             logger.info(
-                f"Player {player_id} contract {contract.id} was amnestied in season {amnesty_records[0].season}"
+                f"Player {player_id} contract {contract.id} was amnestied in season {status.amnesty_season}"
             )
             return result
         
         # Check if contract is still active based on season
-        result['is_active'] = ContractValidator.is_contract_active(
-            contract,
-            current_season,
-            amnesty_records
-        )
+        result['is_active'] = status.is_active(current_season)
         
         return result
     
@@ -156,30 +148,15 @@ class ContractValidator:
         Returns:
             List of contract info dicts
         """
-        # Query contracts
-        query = Contract.query.filter_by(league_id=league_id)
-        if player_ids:
-            query = query.filter(Contract.player_id.in_(player_ids))
-        
-        contracts = query.all()
-        logger.info(f"Found {len(contracts)} contracts for league {league_id}")
+        # Contracts with their amnesty flags in one query
+        statuses = query_contract_status([league_id], player_ids or None)
+        logger.info(f"Found {len(statuses)} contracts for league {league_id}")
         
         active_contracts = []
         
-        for contract in contracts:
-            # Check amnesty status
-            amnesty_records = AmnestyPlayer.query.filter_by(
-                contract_id=contract.id
-            ).all()
-            
-            # Determine if active
-            is_active = ContractValidator.is_contract_active(
-                contract,
-                current_season,
-                amnesty_records
-            )
-            
-            if is_active:
+        for status in statuses:
+            contract = status.contract
+            if status.is_active(current_season):
                 active_contracts.append({
                     'id': contract.id,
                     'player_id': contract.player_id,
@@ -187,8 +164,8 @@ class ContractValidator:
                     'team_id': contract.team_id,
                     'contract_length': contract.contract_length,
                     'contract_start_season': contract.season,
-                    'contract_end_season': contract.season + contract.contract_length - 1,
-                    'is_amnestied': bool(amnesty_records)
+                    'contract_end_season': status.end_season,
+                    'is_amnestied': status.is_amnestied
                 })
         
         logger.info(f"Active contracts for league {league_id}: {len(active_contracts)}")
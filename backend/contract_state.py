@@ -0,0 +1,205 @@
+"""
+Materialized contract state.
+
+contract_state holds one row per contract with its amnesty, RFA and
+extension status already folded in, so reads are a single indexed scan by
+league. Writers call sync_contracts() inside their transaction (before
+commit), and commissioner actions go through record_commissioner_action();
+rebuild() recomputes a chain from scratch and runs when a new
+season is added to a chain, and verify() compares the projection with a
+full recompute (scripts/rebuild_contract_state.py).
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from .contract_status import ContractStatus, query_contract_status
+from .extensions import db
+from .models import CommissionerActionLog, Contract, ContractChange, ContractState, LeagueChain
+
+logger = logging.getLogger(__name__)
+
+STATE_FIELDS = (
+    "league_id", "player_id", "team_id", "contract_amount", "contract_length",
+    "start_season", "end_season", "extension_years", "is_amnestied", "amnesty_season", "is_rfa",
+)
+
+
+def _state_values(status: ContractStatus) -> Dict:
+    contract = status.contract
+    return {
+        "league_id": contract.league_id,
+        "player_id": contract.player_id,
+        "team_id": contract.team_id,
+        "contract_amount": contract.contract_amount,
+        "contract_length": contract.contract_length,
+        "start_season": contract.season,
+        "end_season": status.end_season,
+        "extension_years": status.extension_years,
+        "is_amnestied": status.is_amnestied,
+        "amnesty_season": status.amnesty_season,
+        "is_rfa": status.is_rfa,
+    }
+
+
+def sync_contracts(contract_ids: Iterable[Optional[int]]) -> None:
+    """Recompute state rows for contract_ids in the current transaction.
+
+    Pending writes are flushed first; the caller commits. Contracts that no
+    longer exist lose their state row. Each contract also gets a
+    contract_change row for incremental activity feed syncs.
+    """
+    ids = {int(cid) for cid in contract_ids if cid is not None}
+    if not ids:
+        return
+    db.session.flush()
+    statuses = {s.contract.id: s for s in query_contract_status(None, contract_ids=ids)}
+    existing = {
+        row.contract_id: row
+        for row in ContractState.query.filter(ContractState.contract_id.in_(ids)).all()
+    }
+    for contract_id in ids:
+        status = statuses.get(contract_id)
+        row = existing.get(contract_id)
+        source = status.contract if status is not None else row
+        if source is not None:
+            # Lets the activity feed re-diff just this player's local events
+            db.session.add(ContractChange(
+                league_id=source.league_id, player_id=source.player_id, contract_id=contract_id
+            ))
+        if status is None:
+            if row is not None:
+                db.session.delete(row)
+            continue
+        if row is None:
+            row = ContractState(contract_id=contract_id)
+            db.session.add(row)
+        for field, value in _state_values(status).items():
+            setattr(row, field, value)
+        row.updated_at = db.func.now()
+
+
+def record_commissioner_action(log_entry: CommissionerActionLog, contract_id: Optional[int]) -> None:
+    """Add log_entry and sync contract_id in the current transaction; the caller commits.
+
+    The player is logged in contract_change even without a contract, so the
+    activity feed re-diffs their rows (and picks up the log entry) on its
+    next sync.
+    """
+    db.session.add(log_entry)
+    sync_contracts([contract_id])
+    db.session.add(ContractChange(
+        league_id=log_entry.league_id, player_id=log_entry.player_id, contract_id=contract_id
+    ))
+
+
+def rebuild(league_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute the projection for league_ids (None = every league); returns rows written"""
+    league_ids = [int(lid) for lid in league_ids] if league_ids is not None else None
+    try:
+        query = ContractState.query
+        if league_ids is not None:
+            query = query.filter(ContractState.league_id.in_(league_ids))
+        query.delete(synchronize_session=False)
+        statuses = query_contract_status(league_ids)
+        db.session.add_all(
+            ContractState(contract_id=status.contract.id, **_state_values(status))
+            for status in statuses
+        )
+        db.session.commit()
+        return len(statuses)
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Contract state rebuild failed for {league_ids or 'all leagues'}: {e}")
+        raise
+
+
+def ensure_built() -> int:
+    """Build the projection once for databases that predate it, and rebuild
+    chains marked stale by a failed rollover rebuild; returns rows written"""
+    stale = LeagueChain.query.filter(LeagueChain.contract_state_stale.is_(True))
+    if ContractState.query.first() is None and Contract.query.first() is not None:
+        written = rebuild()
+        stale.update({LeagueChain.contract_state_stale: False}, synchronize_session=False)
+        db.session.commit()
+        return written
+    written = 0
+    for chain in stale.all():
+        try:
+            written += rebuild([int(lid) for lid in json.loads(chain.league_ids)])
+        except Exception:
+            logger.exception(f"Contract state rebuild failed for chain {chain.original_league_id}")
+            continue
+        chain.contract_state_stale = False
+        db.session.commit()
+    return written
+
+
+def verify(league_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+    """Differences between the projection and a full recompute (empty when in sync)"""
+    league_ids = [int(lid) for lid in league_ids] if league_ids is not None else None
+    expected = {s.contract.id: _state_values(s) for s in query_contract_status(league_ids)}
+    query = ContractState.query
+    if league_ids is not None:
+        query = query.filter(ContractState.league_id.in_(league_ids))
+    actual = {row.contract_id: {f: getattr(row, f) for f in STATE_FIELDS} for row in query.all()}
+
+    diffs = []
+    for contract_id in sorted(set(expected) | set(actual)):
+        want, have = expected.get(contract_id), actual.get(contract_id)
+        if want is None or have is None:
+            diffs.append({"contract_id": contract_id, "expected": want, "actual": have})
+            continue
+        fields = {f: (want[f], have[f]) for f in STATE_FIELDS if want[f] != have[f]}
+        if fields:
+            diffs.append({"contract_id": contract_id, "fields": fields})
+    return diffs
+
+
+def read_contracts(league_ids: Iterable[int], current_season: int) -> List[Dict]:
+    """Contract dicts for league_ids (same shape as ContractStatus.to_dict)"""
+    league_ids = [int(lid) for lid in league_ids]
+    if not league_ids:
+        return []
+    rows = (
+        ContractState.query
+        .filter(ContractState.league_id.in_(league_ids))
+        .order_by(ContractState.contract_id)
+        .all()
+    )
+    result = []
+    for row in rows:
+        is_expired = current_season > row.end_season
+        result.append({
+            'id': row.contract_id,
+            'league_id': row.league_id,
+            'player_id': row.player_id,
+            'team_id': row.team_id,
+            'contract_amount': row.contract_amount,
+            'contract_length': row.contract_length,
+            'contract_start_season': row.start_season,
+            'contract_end_season': row.end_season,
+            'is_active': not is_expired and not row.is_amnestied,
+            'is_expired': is_expired,
+            'is_amnestied': bool(row.is_amnestied),
+            'is_rfa': bool(row.is_rfa),
+            'extension_years': int(row.extension_years or 0),
+        })
+    return result
+
+
+def remaining_years(contracts: Iterable[Dict], current_season: int) -> Dict[str, int]:
+    """player_id -> seasons left (current season included) on their newest non-amnestied contract.
+
+    Extension years count. contracts are read_contracts() dicts; this is the
+    contract_years of the rosters response and the basis of /cap-outlook.
+    """
+    years: Dict[str, int] = {}
+    for contract in sorted(contracts, key=lambda c: c['id'], reverse=True):
+        pid = str(contract['player_id'])
+        if pid in years or contract.get('is_amnestied'):
+            continue
+        end_season = int(contract['contract_end_season']) + int(contract.get('extension_years') or 0)
+        years[pid] = max(0, end_season - current_season + 1)
+    return years
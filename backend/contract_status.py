@@ -0,0 +1,150 @@
+"""
+Set-based contract status queries.
+
+Contracts are loaded together with their amnesty, RFA and extension
+flags in one statement: each status table is aggregated per contract_id
+(restricted to the selected contracts) and outer-joined onto contract,
+instead of looking the flags up one contract at a time.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+
+from .extensions import db
+from .models import AmnestyPlayer, Contract, ExtensionPlayer, RfaPlayer
+
+
+@dataclass
+class ContractStatus:
+    """A contract row plus its amnesty / RFA / extension flags"""
+    contract: Contract
+    amnesty_count: int = 0
+    amnesty_season: Optional[int] = None
+    rfa_count: int = 0
+    extension_count: int = 0
+    extension_years: int = 0
+
+    @property
+    def is_amnestied(self) -> bool:
+        return self.amnesty_count > 0
+
+    @property
+    def is_rfa(self) -> bool:
+        return self.rfa_count > 0
+
+    @property
+    def is_extended(self) -> bool:
+        return self.extension_count > 0
+
+    @property
+    def end_season(self) -> int:
+        return self.contract.season + self.contract.contract_length - 1
+
+    def is_expired(self, current_season: int) -> bool:
+        return current_season > self.end_season
+
+    def is_active(self, current_season: int) -> bool:
+        return not self.is_expired(current_season) and not self.is_amnestied
+
+    def to_dict(self, current_season: int) -> Dict:
+        contract = self.contract
+        return {
+            'id': contract.id,
+            'league_id': contract.league_id,
+            'player_id': contract.player_id,
+            'team_id': contract.team_id,
+            'contract_amount': contract.contract_amount,
+            'contract_length': contract.contract_length,
+            'contract_start_season': contract.season,
+            'contract_end_season': self.end_season,
+            'is_active': self.is_active(current_season),
+            'is_expired': self.is_expired(current_season),
+            'is_amnestied': self.is_amnestied,
+            'is_rfa': self.is_rfa,
+            'extension_years': self.extension_years,
+        }
+
+
+def query_contract_status(
+    league_ids: Optional[Iterable[int]],
+    player_ids: Optional[Iterable[int]] = None,
+    newest_first: bool = False,
+    contract_ids: Optional[Iterable[int]] = None
+) -> List[ContractStatus]:
+    """Contracts in league_ids (optionally only player_ids / contract_ids) with
+    status flags, in one query. league_ids=None spans every league."""
+    conditions = []
+    if league_ids is not None:
+        league_ids = [int(lid) for lid in league_ids]
+        if not league_ids:
+            return []
+        conditions.append(Contract.league_id.in_(league_ids))
+    if contract_ids is not None:
+        contract_ids = [int(cid) for cid in contract_ids]
+        if not contract_ids:
+            return []
+        conditions.append(Contract.id.in_(contract_ids))
+    if player_ids is not None:
+        player_ids = [int(pid) for pid in player_ids]
+        if not player_ids:
+            return []
+        conditions.append(Contract.player_id.in_(player_ids))
+    selected_ids = select(Contract.id).where(*conditions) if conditions else select(Contract.id)
+
+    amnesty = (
+        select(
+            AmnestyPlayer.contract_id.label("contract_id"),
+            func.count().label("n"),
+            func.min(AmnestyPlayer.season).label("season"),
+        )
+        .where(AmnestyPlayer.contract_id.in_(selected_ids))
+        .group_by(AmnestyPlayer.contract_id)
+        .subquery()
+    )
+    rfa = (
+        select(RfaPlayer.contract_id.label("contract_id"), func.count().label("n"))
+        .where(RfaPlayer.contract_id.in_(selected_ids))
+        .group_by(RfaPlayer.contract_id)
+        .subquery()
+    )
+    extension = (
+        select(
+            ExtensionPlayer.contract_id.label("contract_id"),
+            func.count().label("n"),
+            func.coalesce(func.sum(ExtensionPlayer.contract_length), 0).label("years"),
+        )
+        .where(ExtensionPlayer.contract_id.in_(selected_ids))
+        .group_by(ExtensionPlayer.contract_id)
+        .subquery()
+    )
+
+    query = (
+        db.session.query(Contract, amnesty.c.n, amnesty.c.season, rfa.c.n, extension.c.n, extension.c.years)
+        .outerjoin(amnesty, amnesty.c.contract_id == Contract.id)
+        .outerjoin(rfa, rfa.c.contract_id == Contract.id)
+        .outerjoin(extension, extension.c.contract_id == Contract.id)
+        .filter(*conditions)
+        .order_by(Contract.id.desc() if newest_first else Contract.id)
+    )
+    return [
+        ContractStatus(
+            contract=contract,
+            amnesty_count=int(amnesty_n or 0),
+            amnesty_season=amnesty_season,
+            rfa_count=int(rfa_n or 0),
+            extension_count=int(extension_n or 0),
+            extension_years=int(extension_years or 0),
+        )
+        for contract, amnesty_n, amnesty_season, rfa_n, extension_n, extension_years in query.all()
+    ]
+
+
+def latest_contract_id(league_ids: Iterable[int], player_id: int, skip: str) -> Optional[int]:
+    """Newest contract for player_id that does not have the `skip` flag
+    ("is_amnestied", "is_rfa" or "is_extended"), or None"""
+    for status in query_contract_status(league_ids, [player_id], newest_first=True):
+        if not getattr(status, skip):
+            return status.contract.id
+    return None
@@ -0,0 +1,41 @@
+"""
+Lookups behind the contract write endpoints.
+
+A contract write needs two answers: does the player already hold an
+active contract anywhere in the league chain, and what are they paid
+right now. The first is one indexed query on the contract_state
+projection; the second comes from the cached roster index. Neither
+touches drafts, transactions or the enriched contract listings, and
+neither calls Sleeper beyond the cached rosters payload.
+"""
+
+from typing import List, Optional, Tuple
+
+from .extensions import db
+from .models import ContractState
+from .roster_index import get_roster_index
+
+
+def has_active_contract(league_chain_ids: List[int], player_id: int, current_season: int) -> bool:
+    """True if the player has a contract in the chain that is neither expired nor amnestied"""
+    league_chain_ids = [int(lid) for lid in league_chain_ids]
+    if not league_chain_ids:
+        return False
+    row = (
+        db.session.query(ContractState.contract_id)
+        .filter(ContractState.league_id.in_(league_chain_ids))
+        .filter(ContractState.player_id == int(player_id))
+        .filter(ContractState.is_amnestied.is_(False))
+        .filter(ContractState.end_season >= int(current_season))
+        .first()
+    )
+    return row is not None
+
+
+def current_salary(league_id, player_id) -> Tuple[Optional[int], Optional[int]]:
+    """(roster_id, amount) for the player on the league's current rosters.
+
+    amount is None while the chain's cost map has not been built yet.
+    """
+    index = get_roster_index(str(league_id))
+    return index.roster_of(player_id), index.amount(player_id)
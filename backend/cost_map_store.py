@@ -0,0 +1,120 @@
+"""
+Persistence for incrementally maintained player cost maps.
+
+Draft results never change once a draft is done and transactions only
+append, so a chain's cost map is stored with the draft signature it was
+built from and a watermark (newest processed timestamp and round).
+Refreshes then only fold in transactions past the watermark.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .codec import decode_payload, encode_payload
+from .extensions import db
+from .models import CostMapState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CostMapSnapshot:
+    draft_signature: str
+    draft_map: Dict[str, int]
+    tx_map: Dict[str, List[int]]
+    tx_watermark_ts: int
+    tx_watermark_round: int
+
+    def cost_map(self) -> Dict[str, int]:
+        """player_id -> amount; draft prices take precedence over transactions"""
+        cost_map = {pid: amount for pid, (amount, _) in self.tx_map.items()}
+        cost_map.update(self.draft_map)
+        return cost_map
+
+
+def _league_id_from_key(cache_key: str) -> int:
+    # Keys look like "<league_id>:<chain ids>" or "<league_id>-<season>"
+    head = cache_key.split(":", 1)[0].split("-", 1)[0]
+    return int(head) if head.isdigit() else 0
+
+
+def draft_signature(draft_picks_data: Dict) -> str:
+    """Stable fingerprint of the drafts (and pick counts) a draft map was built from"""
+    counts = {
+        str(draft_id): len(picks) if isinstance(picks, list) else 0
+        for draft_id, picks in draft_picks_data.items()
+    }
+    # Order matters: earlier drafts take precedence in the draft map
+    return json.dumps(list(counts.items()), separators=(",", ":"))
+
+
+def load(cache_key: str) -> Optional[CostMapSnapshot]:
+    try:
+        row = db.session.get(CostMapState, cache_key)
+        if row is None:
+            return None
+        return CostMapSnapshot(
+            draft_signature=row.draft_signature,
+            draft_map=decode_payload(row.draft_map_json),
+            tx_map=decode_payload(row.tx_map_json),
+            tx_watermark_ts=int(row.tx_watermark_ts or 0),
+            tx_watermark_round=int(row.tx_watermark_round or 0),
+        )
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Cost map state read failed for {cache_key}: {e}")
+        return None
+
+
+def watermark_round(cache_key: str) -> int:
+    """First transaction round that can still hold unprocessed transactions"""
+    state = load(cache_key)
+    return state.tx_watermark_round if state is not None else 0
+
+
+def save(
+    cache_key: str,
+    signature: str,
+    draft_map: Dict[str, int],
+    tx_map: Dict[str, List[int]],
+    new_transactions: List[Dict],
+    previous: Optional[CostMapSnapshot] = None
+) -> None:
+    watermark_ts = previous.tx_watermark_ts if previous else 0
+    watermark_rnd = previous.tx_watermark_round if previous else 0
+    for tx in new_transactions:
+        if not isinstance(tx, dict):
+            continue
+        # Same ordering key build_cost_map filters on
+        try:
+            watermark_ts = max(watermark_ts, int(tx.get("status_updated") or tx.get("created") or 0))
+        except Exception:
+            pass
+        try:
+            watermark_rnd = max(watermark_rnd, int(tx.get("leg") or 0))
+        except Exception:
+            pass
+
+    if (
+        previous is not None
+        and signature == previous.draft_signature
+        and (watermark_ts, watermark_rnd) == (previous.tx_watermark_ts, previous.tx_watermark_round)
+    ):
+        return  # nothing new since the last build
+    try:
+        row = db.session.get(CostMapState, cache_key)
+        if row is None:
+            row = CostMapState(cache_key=cache_key, league_id=_league_id_from_key(cache_key))
+            db.session.add(row)
+        row.draft_signature = signature
+        row.draft_map_json = encode_payload(draft_map)
+        row.tx_map_json = encode_payload(tx_map)
+        row.tx_watermark_ts = watermark_ts
+        row.tx_watermark_round = watermark_rnd
+        row.updated_at = db.func.now()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Cost map state write failed for {cache_key}: {e}")
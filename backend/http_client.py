@@ -0,0 +1,156 @@
+"""
+Pooled HTTP client for upstream Sleeper calls.
+Reuses keep-alive connections per host and retries failed connects. Requests
+that reached the server (429/5xx) are not retried here: callers retry them
+through the rate limiter so every attempt spends a token (see retry_delay).
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _empty_host_stats() -> Dict[str, int]:
+    return {
+        "requests": 0,
+        "errors": 0,
+        "connections_opened": 0,
+        "pool_requests": 0,
+        "connections_reused": 0,
+    }
+
+
+class PooledHttpClient:
+    """Thread-safe shared requests.Session with a bounded connection pool"""
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        timeout: int = 10
+    ):
+        self.pool_size = pool_size or int(os.getenv("SLEEPER_HTTP_POOL_SIZE", "20"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("SLEEPER_HTTP_RETRIES", "3"))
+        self.backoff_factor = (
+            backoff_factor if backoff_factor is not None else float(os.getenv("SLEEPER_HTTP_BACKOFF", "0.5"))
+        )
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests_by_host: Dict[str, int] = {}
+        self._errors_by_host: Dict[str, int] = {}
+
+    def _build_session(self) -> requests.Session:
+        # Only connect errors: the request never reached Sleeper's rate limit
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=self.backoff_factor,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self._adapter = adapter
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        # Rebuild after fork so gunicorn workers never share sockets
+        pid = os.getpid()
+        if self._session is None or self._pid != pid:
+            with self._lock:
+                if self._session is None or self._pid != pid:
+                    self._session = self._build_session()
+                    self._pid = pid
+                    logger.info(f"Created pooled HTTP session (pool_size={self.pool_size}, retries={self.max_retries})")
+        return self._session
+
+    def get(self, url: str, timeout: Optional[int] = None, **kwargs) -> requests.Response:
+        """GET through the shared pool, recording per-host request counts"""
+        host = urlsplit(url).netloc
+        try:
+            resp = self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+        except Exception:
+            with self._stats_lock:
+                self._errors_by_host[host] = self._errors_by_host.get(host, 0) + 1
+            raise
+        with self._stats_lock:
+            self._requests_by_host[host] = self._requests_by_host.get(host, 0) + 1
+            if resp.status_code >= 400:
+                self._errors_by_host[host] = self._errors_by_host.get(host, 0) + 1
+        return resp
+
+    def retry_delay(self, resp: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying resp, or None if it should not be retried.
+
+        attempt counts from 0; honours a numeric Retry-After.
+        """
+        if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        delay = self.backoff_factor * (2 ** attempt)
+        try:
+            delay = max(delay, float(resp.headers.get("Retry-After", 0)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-host request counts and connection reuse from the live pools"""
+        result: Dict[str, Dict] = {}
+        with self._stats_lock:
+            for host in set(self._requests_by_host) | set(self._errors_by_host):
+                entry = result.setdefault(host, _empty_host_stats())
+                entry["requests"] = self._requests_by_host.get(host, 0)
+                entry["errors"] = self._errors_by_host.get(host, 0)
+
+        adapter = self._adapter
+        if adapter is None or self._pid != os.getpid():
+            return result
+
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            entry = result.setdefault(host, _empty_host_stats())
+            entry["connections_opened"] += pool.num_connections
+            entry["pool_requests"] += pool.num_requests
+            entry["connections_reused"] = max(0, entry["pool_requests"] - entry["connections_opened"])
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._adapter = None
+            self._pid = None
+
+
+# Global pooled client shared by all Sleeper requests in this process
+sleeper_http = PooledHttpClient()
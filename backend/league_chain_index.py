@@ -0,0 +1,189 @@
+"""
+Persistent league chain index.
+
+A chain is stored once in league_chain and normalized into
+league_chain_member rows, so any member league ID resolves to the whole
+chain with one indexed lookup. previous_league_id links never change, so
+an indexed chain only ever grows by appending a new head season.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import aliased
+
+from .extensions import db
+from .models import LeagueChain, LeagueChainMember
+
+logger = logging.getLogger(__name__)
+
+
+def lookup_chain(league_id: int) -> Optional[List[int]]:
+    """Full chain containing league_id, newest first, or None if not indexed"""
+    try:
+        league_id = int(league_id)
+        anchor = aliased(LeagueChainMember)
+        rows = (
+            db.session.query(LeagueChainMember.league_id)
+            .join(anchor, anchor.chain_id == LeagueChainMember.chain_id)
+            .filter(anchor.league_id == league_id)
+            .order_by(LeagueChainMember.position.desc())
+            .all()
+        )
+        if rows:
+            return [int(lid) for (lid,) in rows]
+
+        # Chains written before the member table existed
+        chain = LeagueChain.query.filter(
+            (LeagueChain.current_league_id == league_id) |
+            (LeagueChain.original_league_id == league_id)
+        ).first()
+        if chain:
+            league_ids = [int(lid) for lid in json.loads(chain.league_ids)]
+            _sync_members(chain, league_ids)
+            db.session.commit()
+            return league_ids
+        return None
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"League chain lookup failed for {league_id}: {e}")
+        return None
+
+
+def lookup_chains(league_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """lookup_chain for many leagues in one query; unindexed leagues are left out"""
+    try:
+        league_ids = sorted({int(lid) for lid in league_ids})
+        if not league_ids:
+            return {}
+        anchor = aliased(LeagueChainMember)
+        rows = (
+            db.session.query(anchor.league_id, LeagueChainMember.league_id)
+            .join(anchor, anchor.chain_id == LeagueChainMember.chain_id)
+            .filter(anchor.league_id.in_(league_ids))
+            .order_by(anchor.league_id, LeagueChainMember.position.desc())
+            .all()
+        )
+        chains: Dict[int, List[int]] = {}
+        for anchor_id, member_id in rows:
+            chains.setdefault(int(anchor_id), []).append(int(member_id))
+
+        # Chains written before the member table existed
+        missing = [lid for lid in league_ids if lid not in chains]
+        if missing:
+            legacy = LeagueChain.query.filter(
+                LeagueChain.current_league_id.in_(missing) |
+                LeagueChain.original_league_id.in_(missing)
+            ).all()
+            for chain in legacy:
+                chain_ids = [int(lid) for lid in json.loads(chain.league_ids)]
+                _sync_members(chain, chain_ids)
+                for lid in missing:
+                    if lid in (chain.current_league_id, chain.original_league_id):
+                        chains[lid] = chain_ids
+            if legacy:
+                db.session.commit()
+        return chains
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"League chain bulk lookup failed: {e}")
+        return {}
+
+
+def _sync_members(chain: LeagueChain, league_ids: List[int]) -> int:
+    """Insert/move member rows for league_ids (newest first); returns rows added"""
+    existing = {
+        m.league_id: m
+        for m in LeagueChainMember.query.filter(LeagueChainMember.league_id.in_(league_ids)).all()
+    }
+    added = 0
+    for idx, lid in enumerate(league_ids):
+        position = len(league_ids) - 1 - idx
+        member = existing.get(lid)
+        if member is None:
+            db.session.add(LeagueChainMember(league_id=lid, chain_id=chain.id, position=position))
+            added += 1
+        elif member.chain_id != chain.id or member.position != position:
+            member.chain_id = chain.id
+            member.position = position
+    return added
+
+
+def _extends(league_ids: List[int], stored: List[int]) -> bool:
+    """True if league_ids is stored with one or more newer seasons in front"""
+    return len(league_ids) > len(stored) and league_ids[len(league_ids) - len(stored):] == stored
+
+
+def _rebuild_contract_state(chain: LeagueChain) -> None:
+    """Rebuild the chain's contract projection; on failure mark it for contract_state.ensure_built"""
+    from .contract_state import rebuild
+
+    try:
+        rebuild([int(lid) for lid in json.loads(chain.league_ids)])
+        stale = False
+    except Exception:
+        logger.exception(f"Contract state rebuild failed for chain {chain.original_league_id}; marked stale")
+        stale = True
+    if chain.contract_state_stale != stale:
+        chain.contract_state_stale = stale
+        db.session.commit()
+
+
+def save_chain(league_ids: List, touch: bool = True) -> None:
+    """Persist a chain (newest first), appending any new head seasons.
+
+    The league_chain row's JSON league_ids and current_league_id are kept
+    in sync for older readers, and only replaced by a chain that extends
+    the stored head: a walk started from an older season never shrinks
+    it. touch=False leaves last_updated alone. A new season joining an
+    indexed chain rebuilds its contract projection; a chain whose rebuild
+    failed is retried on its next save.
+    """
+    league_ids = [int(lid) for lid in league_ids]
+    if not league_ids:
+        return
+    try:
+        original_league_id = league_ids[-1]
+        payload = json.dumps(league_ids)
+        chain = LeagueChain.query.filter_by(original_league_id=original_league_id).first()
+        if chain is None:
+            chain = LeagueChain(
+                original_league_id=original_league_id,
+                current_league_id=league_ids[0],
+                league_ids=payload
+            )
+            db.session.add(chain)
+            db.session.flush()
+        else:
+            if _extends(league_ids, [int(lid) for lid in json.loads(chain.league_ids or "[]")]):
+                chain.current_league_id = league_ids[0]
+                chain.league_ids = payload
+            if touch:
+                chain.last_updated = db.func.now()
+        rollover = chain.id is not None and LeagueChainMember.query.filter_by(chain_id=chain.id).first() is not None
+        added = _sync_members(chain, league_ids)
+        db.session.commit()
+        if added:
+            logger.info(f"Indexed {added} new league(s) in chain {original_league_id}: {league_ids}")
+        if (added and rollover) or chain.contract_state_stale:
+            _rebuild_contract_state(chain)
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Failed to save league chain {league_ids}: {e}")
+
+
+def backfill_members() -> int:
+    """Index chains stored before league_chain_member existed; returns chains indexed"""
+    indexed = {cid for (cid,) in db.session.query(LeagueChainMember.chain_id).distinct().all()}
+    count = 0
+    for chain in LeagueChain.query.all():
+        if chain.id in indexed:
+            continue
+        try:
+            _sync_members(chain, [int(lid) for lid in json.loads(chain.league_ids)])
+            count += 1
+        except Exception as e:
+            logger.warning(f"Could not index league chain {chain.original_league_id}: {e}")
+    db.session.commit()
+    return count
@@ -135,6 +135,7 @@ class LocalPlayer(db.Model):
     first_name = db.Column(db.String)
     last_name = db.Column(db.String)
     position = db.Column(db.String)
+    updated_at = db.Column(db.DateTime, nullable=True, default=db.func.now())  # re-read by player_registry
 
 # Cached player headshots from Sleeper CDN (base64-encoded)
 class PlayerImage(db.Model):
@@ -145,6 +146,18 @@ class PlayerImage(db.Model):
     content_type = db.Column(db.String, nullable=False, default="image/jpeg")
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
 
+
+class PlayerImageBlob(db.Model):
+    """Player headshot as raw bytes; base64 player_images rows are moved here on first read"""
+    __tablename__ = 'player_image_blob'
+
+    player_id = db.Column(BigInteger, primary_key=True, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    content_type = db.Column(db.String, nullable=False, default="image/jpeg")
+    etag = db.Column(db.String(64), nullable=False)  # sha256 hex of data
+    size = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
 # Add this LeagueChain model to models.py
 
 class LeagueChain(db.Model):
@@ -156,11 +169,24 @@ class LeagueChain(db.Model):
     current_league_id = db.Column(BigInteger, nullable=False)  # Most recent league ID
     league_ids = db.Column(db.String, nullable=False)  # JSON list of all league IDs in order
     last_updated = db.Column(db.DateTime, default=db.func.now())
+    contract_state_stale = db.Column(db.Boolean, nullable=False, default=False)  # rollover rebuild failed
     
     def __repr__(self):
         return f"<LeagueChain original={self.original_league_id} current={self.current_league_id}>"
 
 
+class LeagueChainMember(db.Model):
+    """One row per league in a chain so any season's league ID resolves to its chain"""
+    __tablename__ = 'league_chain_member'
+
+    league_id = db.Column(BigInteger, primary_key=True)
+    chain_id = db.Column(db.Integer, ForeignKey('league_chain.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)  # 0 = original league, head has the highest
+
+    def __repr__(self):
+        return f"<LeagueChainMember league={self.league_id} chain={self.chain_id} position={self.position}>"
+
+
 class SleeperApiCache(db.Model):
     """Persistent cache for Sleeper API responses"""
     __tablename__ = 'sleeper_api_cache'
@@ -176,6 +202,7 @@ class SleeperLeague(db.Model):
     league_id = db.Column(BigInteger, primary_key=True, nullable=False)
     data_json = db.Column(db.Text, nullable=False)
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    no_expiry = db.Column(db.Boolean, nullable=True, default=False)  # completed season, never refetch
 
 
 class SleeperRosters(db.Model):
@@ -184,6 +211,7 @@ class SleeperRosters(db.Model):
     league_id = db.Column(BigInteger, primary_key=True, nullable=False)
     data_json = db.Column(db.Text, nullable=False)  # list of rosters
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    no_expiry = db.Column(db.Boolean, nullable=True, default=False)  # completed season, never refetch
 
 
 class SleeperUsers(db.Model):
@@ -192,6 +220,7 @@ class SleeperUsers(db.Model):
     league_id = db.Column(BigInteger, primary_key=True, nullable=False)
     data_json = db.Column(db.Text, nullable=False)  # list of users
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    no_expiry = db.Column(db.Boolean, nullable=True, default=False)  # completed season, never refetch
 
 
 class SleeperDrafts(db.Model):
@@ -200,6 +229,7 @@ class SleeperDrafts(db.Model):
     league_id = db.Column(BigInteger, primary_key=True, nullable=False)
     data_json = db.Column(db.Text, nullable=False)  # list of drafts
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    no_expiry = db.Column(db.Boolean, nullable=True, default=False)  # completed season, never refetch
 
 
 class SleeperDraftPicks(db.Model):
@@ -208,6 +238,7 @@ class SleeperDraftPicks(db.Model):
     draft_id = db.Column(BigInteger, primary_key=True, nullable=False)
     data_json = db.Column(db.Text, nullable=False)  # list of picks
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    no_expiry = db.Column(db.Boolean, nullable=True, default=False)  # completed season, never refetch
 
 
 class SleeperTransactions(db.Model):
@@ -217,3 +248,85 @@ class SleeperTransactions(db.Model):
     round_num = db.Column(db.Integer, primary_key=True, nullable=False)
     data_json = db.Column(db.Text, nullable=False)  # list of transactions
     updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+    no_expiry = db.Column(db.Boolean, nullable=True, default=False)  # completed season, never refetch
+
+
+class CostMapState(db.Model):
+    """Persisted player cost map for a league chain, with a transaction watermark"""
+    __tablename__ = 'cost_map_state'
+
+    cache_key = db.Column(db.String, primary_key=True)  # "<current league>:<chain ids>"
+    league_id = db.Column(BigInteger, nullable=False, index=True)  # current league in the chain
+    draft_signature = db.Column(db.Text, nullable=False)  # JSON draft_id -> pick count
+    draft_map_json = db.Column(db.Text, nullable=False)  # player_id -> amount from drafts
+    tx_map_json = db.Column(db.Text, nullable=False)  # player_id -> [amount, created] from transactions
+    tx_watermark_ts = db.Column(BigInteger, nullable=False, default=0)  # newest processed created/status_updated
+    tx_watermark_round = db.Column(db.Integer, nullable=False, default=0)  # highest processed round (leg)
+    updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    def __repr__(self):
+        return f"<CostMapState {self.cache_key} watermark={self.tx_watermark_ts}/{self.tx_watermark_round}>"
+
+
+class ContractState(db.Model):
+    """Materialized contract status, kept in step by the contract/amnesty/RFA/extension writers"""
+    __tablename__ = 'contract_state'
+
+    contract_id = db.Column(db.Integer, primary_key=True)  # contract.id (no FK: rows go with the contract)
+    league_id = db.Column(BigInteger, nullable=False)
+    player_id = db.Column(BigInteger, nullable=False)
+    team_id = db.Column(BigInteger)
+    contract_amount = db.Column(db.Integer, nullable=True)
+    contract_length = db.Column(db.Integer, nullable=False)
+    start_season = db.Column(db.Integer, nullable=False)
+    end_season = db.Column(db.Integer, nullable=False)  # before extensions
+    extension_years = db.Column(db.Integer, nullable=False, default=0)
+    is_amnestied = db.Column(db.Boolean, nullable=False, default=False)
+    amnesty_season = db.Column(db.Integer, nullable=True)
+    is_rfa = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    __table_args__ = (
+        db.Index('ix_contract_state_league_contract', 'league_id', 'contract_id'),
+    )
+
+
+class ContractChange(db.Model):
+    """Append-only log of players whose local rows changed, written by contract_state"""
+    __tablename__ = 'contract_change'
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    league_id = db.Column(BigInteger, nullable=False)  # league of the contract
+    player_id = db.Column(BigInteger, nullable=False)
+    contract_id = db.Column(db.Integer, nullable=True)  # None for actions without a contract
+    created_at = db.Column(db.DateTime, nullable=False, default=db.func.now(), index=True)
+
+
+class ActivityEvent(db.Model):
+    """Display-ready league activity item, enriched once and appended as it appears"""
+    __tablename__ = 'activity_event'
+
+    league_id = db.Column(BigInteger, primary_key=True)  # league the feed is served for
+    uid = db.Column(db.String, primary_key=True)  # "tx:<round>:<transaction_id>", "contract:<id>", ...
+    source = db.Column(db.String(16), nullable=False)  # transaction | local
+    created = db.Column(BigInteger, nullable=False)  # ms timestamp used for ordering
+    version = db.Column(db.String, nullable=False)  # fingerprint of the source row; re-enriched when it changes
+    item_json = db.Column(db.Text, nullable=False)  # enriched feed item
+
+    __table_args__ = (
+        db.Index('ix_activity_event_league_created', 'league_id', 'created', 'uid'),
+    )
+
+
+class ActivityFeedState(db.Model):
+    """Ingestion watermark for a league's persisted activity feed"""
+    __tablename__ = 'activity_feed_state'
+
+    league_id = db.Column(BigInteger, primary_key=True)
+    tx_watermark_round = db.Column(db.Integer, nullable=False, default=0)  # highest round with transactions
+    event_count = db.Column(db.Integer, nullable=False, default=0)
+    local_change_seq = db.Column(BigInteger, nullable=True)  # last contract_change seq applied; null = full diff
+    updated_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    def __repr__(self):
+        return f"<ActivityFeedState {self.league_id} round={self.tx_watermark_round} events={self.event_count}>"
@@ -0,0 +1,162 @@
+"""
+Player headshot store.
+
+Images are kept as raw bytes in player_image_blob with a sha256 digest
+that doubles as a strong ETag, so serving a hit is one row read with no
+base64 work and a revalidation never loads the bytes. Rows still in the
+old base64 player_images table are moved over the first time they are
+read. Misses are fetched from the Sleeper CDN on a small background
+pool instead of in the request; headshots the CDN does not have are
+remembered for a day.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .bulk_upsert import bulk_upsert
+from .cache import player_image_missing_cache
+from .extensions import db
+from .http_client import sleeper_http
+from .models import PlayerImage, PlayerImageBlob
+
+logger = logging.getLogger(__name__)
+
+CDN_URL = "https://sleepercdn.com/content/nfl/players/{player_id}.jpg"
+# Browsers and proxies may reuse an image this long before revalidating
+MAX_AGE_SECONDS = int(os.getenv("PLAYER_IMAGE_MAX_AGE", str(60 * 60 * 24 * 7)))  # 7 days
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="player-image")
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def cdn_url(player_id: int) -> str:
+    return CDN_URL.format(player_id=player_id)
+
+
+def store(player_id: int, data: bytes, content_type: str = "image/jpeg") -> Dict:
+    """Upsert a player's image bytes (dropping any legacy base64 row); caller commits"""
+    row = {
+        "player_id": int(player_id),
+        "data": data,
+        "content_type": content_type or "image/jpeg",
+        "etag": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        # Whole seconds, as Last-Modified / If-Modified-Since carry no more
+        "updated_at": datetime.utcnow().replace(microsecond=0),
+    }
+    bulk_upsert(PlayerImageBlob, [row])
+    PlayerImage.query.filter_by(player_id=int(player_id)).delete(synchronize_session=False)
+    return row
+
+
+def _migrate_legacy(player_id: int):
+    legacy = PlayerImage.query.filter_by(player_id=player_id).first()
+    if legacy is None or not legacy.image_base64:
+        return None
+    try:
+        store(player_id, base64.b64decode(legacy.image_base64), legacy.content_type)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Failed to migrate base64 image for {player_id}: {e}")
+        return None
+    return load_meta(player_id, migrate=False)
+
+
+def load_meta(player_id: int, migrate: bool = True):
+    """(etag, content_type, size, updated_at) for a stored image, or None"""
+    meta = (
+        db.session.query(
+            PlayerImageBlob.etag,
+            PlayerImageBlob.content_type,
+            PlayerImageBlob.size,
+            PlayerImageBlob.updated_at,
+        )
+        .filter(PlayerImageBlob.player_id == int(player_id))
+        .first()
+    )
+    if meta is None and migrate:
+        return _migrate_legacy(int(player_id))
+    return meta
+
+
+def load_data(player_id: int) -> Optional[bytes]:
+    """The stored image bytes; None if the blob is gone"""
+    row = (
+        db.session.query(PlayerImageBlob.data)
+        .filter(PlayerImageBlob.player_id == int(player_id))
+        .first()
+    )
+    return row[0] if row else None
+
+
+def last_modified(meta) -> Optional[datetime]:
+    if not meta or not meta.updated_at:
+        return None
+    return meta.updated_at.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def not_modified(request, meta) -> bool:
+    """True if the request's validators still match the stored image"""
+    if request.if_none_match:
+        # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+        return request.if_none_match.contains_weak(meta.etag)
+    modified = last_modified(meta)
+    return bool(request.if_modified_since and modified and request.if_modified_since >= modified)
+
+
+def fetch_from_cdn(player_id: int) -> bool:
+    """Download and store one headshot; returns True if stored"""
+    try:
+        resp = sleeper_http.get(cdn_url(player_id), timeout=10)
+    except Exception as e:
+        logger.warning(f"CDN fetch failed for player image {player_id}: {e}")
+        return False
+    if resp.status_code != 200 or not resp.content:
+        if resp.status_code == 404:
+            player_image_missing_cache.set(str(player_id), True)
+        return False
+    content_type = (resp.headers.get("Content-Type") or "image/jpeg").split(";")[0].strip()
+    try:
+        store(player_id, resp.content, content_type)
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Failed to store image for {player_id}: {e}")
+        return False
+
+
+def is_known_missing(player_id: int) -> bool:
+    return player_image_missing_cache.get(str(player_id)) is not None
+
+
+def fetch_in_background(app, player_id: int) -> None:
+    """Queue a CDN fetch for player_id (once per player at a time)"""
+    player_id = int(player_id)
+    with _pending_lock:
+        if player_id in _pending:
+            return
+        _pending.add(player_id)
+
+    def _run():
+        try:
+            with app.app_context():
+                fetch_from_cdn(player_id)
+        finally:
+            with _pending_lock:
+                _pending.discard(player_id)
+
+    try:
+        _executor.submit(_run)
+    except RuntimeError:
+        # Executor shut down (interpreter exit)
+        with _pending_lock:
+            _pending.discard(player_id)
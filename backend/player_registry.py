@@ -0,0 +1,343 @@
+"""
+Compact, read-only player registry backed by a binary snapshot.
+
+The snapshot packs every local player into flat arrays (sorted int64 IDs,
+string-table indices for first/last name and position, an open-addressing
+hash table of rows) plus one deduplicated UTF-8 string blob. Loading it is
+a single mmap, so forked workers share the same pages, and lookups are
+O(1) probes that only build a PlayerData for the player asked for.
+
+Players stored after the snapshot was built live in a small per-process
+overlay, topped up periodically from local_players; a rebuilt snapshot
+file is picked up by mtime. Rebuild the snapshot with
+scripts/build_player_snapshot.py.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .data_schemas import PlayerData
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SPLR"
+VERSION = 1
+# magic, version, players, hash slots, strings, string blob bytes
+HEADER = struct.Struct("<4sIIIII")
+
+SNAPSHOT_PATH = os.getenv(
+    "PLAYER_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "players.snapshot")
+)
+
+PlayerRow = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+
+def _slot(player_id: int, mask: int) -> int:
+    return ((player_id * 0x9E3779B1) >> 7) & mask
+
+
+def encode_snapshot(rows: Iterable[PlayerRow]) -> bytes:
+    """Pack (player_id, first_name, last_name, position) rows into snapshot bytes"""
+    if sys.byteorder != "little":
+        raise RuntimeError("Player snapshots are only supported on little-endian hosts")
+
+    players: Dict[int, Tuple[str, str, str]] = {}
+    for player_id, first_name, last_name, position in rows:
+        try:
+            pid = int(player_id)
+        except (TypeError, ValueError):
+            continue
+        players[pid] = (first_name or "Unknown", last_name or "Unknown", position or "N/A")
+
+    ids = array("q", sorted(players))
+    strings: Dict[str, int] = {}
+    names = array("I")
+    for pid in ids:
+        for value in players[pid]:
+            names.append(strings.setdefault(value, len(strings)))
+
+    slots = 8
+    while slots < len(ids) * 2:
+        slots *= 2
+    mask = slots - 1
+    table = array("I", bytes(4 * slots))
+    for row, pid in enumerate(ids):
+        i = _slot(pid, mask)
+        while table[i]:
+            i = (i + 1) & mask
+        table[i] = row + 1
+
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in strings:  # dicts keep insertion order == string index
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+
+    header = HEADER.pack(MAGIC, VERSION, len(ids), slots, len(strings), len(blob))
+    return b"".join([header, ids.tobytes(), names.tobytes(), table.tobytes(), offsets.tobytes(), bytes(blob)])
+
+
+def write_snapshot(rows: Iterable[PlayerRow], path: str = SNAPSHOT_PATH) -> int:
+    """Write a snapshot atomically; returns the bytes written.
+
+    The file is replaced, not rewritten, so workers with the old snapshot
+    mapped keep reading consistent pages.
+    """
+    data = encode_snapshot(rows)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+class PlayerRegistry(Mapping):
+    """Mapping of player_id (string) -> PlayerData over snapshot bytes"""
+
+    def __init__(self, buf, source: str = "memory"):
+        view = memoryview(buf)
+        magic, version, count, slots, n_strings, blob_len = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a v{VERSION} player snapshot")
+
+        offset = HEADER.size
+        self._ids = view[offset:offset + 8 * count].cast("q")
+        offset += 8 * count
+        self._names = view[offset:offset + 12 * count].cast("I")
+        offset += 12 * count
+        self._table = view[offset:offset + 4 * slots].cast("I")
+        offset += 4 * slots
+        self._offsets = view[offset:offset + 4 * (n_strings + 1)].cast("I")
+        offset += 4 * (n_strings + 1)
+        self._blob = view[offset:offset + blob_len]
+        if len(self._blob) != blob_len:
+            raise ValueError("Truncated player snapshot")
+
+        self._buf = buf  # keeps the mmap alive
+        self._count = count
+        self._mask = slots - 1
+        self._overlay: Dict[str, PlayerData] = {}
+        self._lock = threading.Lock()
+        self.source = source
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[PlayerRow]) -> "PlayerRegistry":
+        return cls(encode_snapshot(rows))
+
+    @classmethod
+    def load(cls, path: str = SNAPSHOT_PATH) -> Optional["PlayerRegistry"]:
+        """Memory-map a snapshot file, or None if it is missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(buf, source=path)
+        except Exception as e:
+            logger.warning(f"Could not load player snapshot {path}: {e}")
+            return None
+
+    def _row(self, player_id: int) -> int:
+        i = _slot(player_id, self._mask)
+        while True:
+            row = self._table[i]
+            if row == 0:
+                return -1
+            if self._ids[row - 1] == player_id:
+                return row - 1
+            i = (i + 1) & self._mask
+
+    def _string(self, index: int) -> str:
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def _player(self, row: int) -> PlayerData:
+        base = row * 3
+        return PlayerData(
+            player_id=str(self._ids[row]),
+            first_name=self._string(self._names[base]),
+            last_name=self._string(self._names[base + 1]),
+            position=self._string(self._names[base + 2]),
+        )
+
+    def __getitem__(self, player_id) -> PlayerData:
+        key = str(player_id)
+        player = self._overlay.get(key)
+        if player is not None:
+            return player
+        if key.isdigit():
+            row = self._row(int(key))
+            if row >= 0:
+                return self._player(row)
+        raise KeyError(key)
+
+    def __contains__(self, player_id) -> bool:
+        key = str(player_id)
+        return key in self._overlay or (key.isdigit() and self._row(int(key)) >= 0)
+
+    def __iter__(self) -> Iterator[str]:
+        for pid in self._ids:
+            key = str(pid)
+            if key not in self._overlay:
+                yield key
+        yield from list(self._overlay)
+
+    def __len__(self) -> int:
+        extra = sum(1 for key in self._overlay if not (key.isdigit() and self._row(int(key)) >= 0))
+        return self._count + extra
+
+    def add(self, players: Iterable[PlayerData]) -> None:
+        """Overlay players stored after the snapshot was built"""
+        with self._lock:
+            for player in players:
+                self._overlay[str(player.player_id)] = player
+
+    def snapshot_ids(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def stats(self) -> Dict:
+        return {
+            "source": self.source,
+            "players": self._count,
+            "overlay": len(self._overlay),
+            "bytes": len(memoryview(self._buf)),
+        }
+
+
+_registry: Optional[PlayerRegistry] = None
+_registry_lock = threading.Lock()
+_snapshot_mtime: Optional[float] = None  # mtime of the snapshot file behind _registry
+_players_since: Optional[datetime] = None  # local_players rows updated since are re-read
+_checked_at = 0.0
+
+# How often a worker looks for a rebuilt snapshot or newly stored players
+REFRESH_SECONDS = int(os.getenv("PLAYER_REGISTRY_REFRESH", "300"))
+# Overlap for rows committed while the previous re-read ran
+_REREAD_SKEW = timedelta(minutes=1)
+
+
+def _local_player_rows(player_ids: Optional[Iterable[int]] = None, updated_since: Optional[datetime] = None):
+    from .extensions import db
+    from .models import LocalPlayer
+
+    query = db.session.query(
+        LocalPlayer.player_id, LocalPlayer.first_name, LocalPlayer.last_name, LocalPlayer.position
+    )
+    if player_ids is not None:
+        query = query.filter(LocalPlayer.player_id.in_(list(player_ids)))
+    if updated_since is not None:
+        query = query.filter(LocalPlayer.updated_at >= updated_since)
+    return query.all()
+
+
+def _player_data(rows) -> Iterator[PlayerData]:
+    for pid, first, last, pos in rows:
+        yield PlayerData(
+            player_id=str(pid),
+            first_name=first or "Unknown",
+            last_name=last or "Unknown",
+            position=pos or "N/A",
+        )
+
+
+def _snapshot_mtime_now() -> Optional[float]:
+    try:
+        return os.stat(SNAPSHOT_PATH).st_mtime
+    except OSError:
+        return None
+
+
+def _load_registry() -> PlayerRegistry:
+    from .extensions import db
+    from .models import LocalPlayer
+
+    registry = PlayerRegistry.load(SNAPSHOT_PATH)
+    if registry is None:
+        registry = PlayerRegistry.from_rows(_local_player_rows())
+        logger.info(f"Packed player registry from local DB ({registry.stats()['players']} players)")
+        return registry
+    try:
+        stored = {pid for (pid,) in db.session.query(LocalPlayer.player_id).all()}
+        stored.difference_update(registry.snapshot_ids())
+        if stored:
+            registry.add(_player_data(_local_player_rows(stored)))
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Could not reconcile player snapshot with local DB: {e}")
+    logger.info(f"Loaded player snapshot {registry.source}: {registry.stats()}")
+    return registry
+
+
+def _refresh_registry() -> None:
+    """Swap in a rebuilt snapshot, or overlay local players stored since the last read"""
+    global _registry, _snapshot_mtime, _players_since
+    from .extensions import db
+
+    started = datetime.utcnow()
+    mtime = _snapshot_mtime_now()
+    if mtime != _snapshot_mtime:
+        _registry = _load_registry()
+        _snapshot_mtime = mtime
+        _players_since = started
+        return
+    try:
+        rows = _local_player_rows(updated_since=_players_since - _REREAD_SKEW)
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Could not re-read local players: {e}")
+        return
+    if rows:
+        _registry.add(_player_data(rows))
+        logger.info(f"Overlaid {len(rows)} local players stored since {_players_since}")
+    _players_since = started
+
+
+def get_player_registry() -> PlayerRegistry:
+    """Process-wide registry: the mmapped snapshot plus any newer local players.
+
+    Without a snapshot file the registry is packed from local_players in
+    memory, which still avoids one PlayerData object per player. Every
+    REFRESH_SECONDS a lookup reloads a rebuilt snapshot file (by mtime) or
+    overlays local_players rows updated since the last read, so players
+    stored by other workers show up without a restart.
+    """
+    global _registry, _snapshot_mtime, _players_since, _checked_at
+    registry = _registry
+    if registry is not None and time.monotonic() - _checked_at < REFRESH_SECONDS:
+        return registry
+    if registry is not None:
+        # One thread refreshes; the rest keep serving the current registry
+        if not _registry_lock.acquire(blocking=False):
+            return registry
+        try:
+            if time.monotonic() - _checked_at >= REFRESH_SECONDS:
+                _refresh_registry()
+                _checked_at = time.monotonic()
+            return _registry
+        finally:
+            _registry_lock.release()
+    with _registry_lock:
+        if _registry is None:
+            started = datetime.utcnow()
+            _snapshot_mtime = _snapshot_mtime_now()
+            _registry = _load_registry()
+            _players_since = started
+            _checked_at = time.monotonic()
+        return _registry
+
+
+def reset_player_registry() -> None:
+    """Drop the process registry so the next lookup reloads it"""
+    global _registry
+    with _registry_lock:
+        _registry = None
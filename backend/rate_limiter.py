@@ -0,0 +1,135 @@
+"""
+Process-wide token bucket for upstream Sleeper requests.
+Waiters are served in priority order so user-facing fetches go ahead of
+background warmups and refreshes.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {PRIORITY_USER: "user", PRIORITY_BACKGROUND: "background"}
+
+_priority: ContextVar[int] = ContextVar("sleeper_request_priority", default=PRIORITY_USER)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Mark upstream calls made inside the block as background work"""
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimited(Exception):
+    """Raised when no token became available within the caller's wait budget"""
+
+
+class TokenBucketLimiter:
+    """Thread-safe token bucket with priority-ordered waiters"""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = max(rate_per_minute, 1) / 60.0  # tokens per second
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute / 10)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.cond = threading.Condition()
+        self._waiters = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._stats: Dict[int, Dict[str, float]] = {}
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def _record(self, priority: int, waited: float, granted: bool) -> None:
+        stats = self._stats.setdefault(priority, {
+            "granted": 0,
+            "rejected": 0,
+            "wait_total_ms": 0.0,
+            "wait_max_ms": 0.0,
+        })
+        stats["granted" if granted else "rejected"] += 1
+        waited_ms = waited * 1000
+        stats["wait_total_ms"] += waited_ms
+        stats["wait_max_ms"] = max(stats["wait_max_ms"], waited_ms)
+
+    def acquire(self, priority: int = PRIORITY_USER, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting up to timeout seconds behind higher-priority callers"""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        ticket = (priority, next(self._seq))
+        with self.cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    at_head = self._waiters[0] == ticket
+                    if at_head and self.tokens >= 1:
+                        self.tokens -= 1
+                        self._record(priority, now - start, True)
+                        return True
+                    if deadline is not None and now >= deadline:
+                        self._record(priority, now - start, False)
+                        return False
+                    wait_for = (1 - self.tokens) / self.rate if at_head else 0.05
+                    if deadline is not None:
+                        wait_for = min(wait_for, deadline - now)
+                    self.cond.wait(max(wait_for, 0.001))
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self.cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self.cond:
+            self._refill(time.monotonic())
+            by_priority = {}
+            for priority, stats in self._stats.items():
+                calls = stats["granted"] + stats["rejected"]
+                by_priority[PRIORITY_NAMES.get(priority, str(priority))] = {
+                    **stats,
+                    "wait_avg_ms": stats["wait_total_ms"] / calls if calls else 0.0,
+                }
+            return {
+                "rate_per_minute": self.rate * 60,
+                "burst": self.capacity,
+                "tokens_available": round(self.tokens, 2),
+                "queued": len(self._waiters),
+                "by_priority": by_priority,
+            }
+
+
+def _per_worker_rate() -> float:
+    # Sleeper limits per egress IP; split the budget across gunicorn workers
+    total = float(os.getenv("SLEEPER_RATE_LIMIT_PER_MIN", "900"))
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    return total / workers
+
+
+# Max seconds a caller waits for a token before degrading to stale cache
+WAIT_BUDGET_SECONDS = {
+    PRIORITY_USER: float(os.getenv("SLEEPER_RATE_LIMIT_USER_WAIT", "2")),
+    PRIORITY_BACKGROUND: float(os.getenv("SLEEPER_RATE_LIMIT_BACKGROUND_WAIT", "30")),
+}
+
+sleeper_rate_limiter = TokenBucketLimiter(_per_worker_rate())
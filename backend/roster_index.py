@@ -0,0 +1,97 @@
+"""
+Roster membership index for write-path validation.
+
+A league's player -> (roster_id, amount) map, built from the cached
+Sleeper rosters payload and the league chain's cost map. Commissioner
+writes only need to know whether a player sits on a roster and what
+they cost, so they read this instead of the enriched rosters response
+(players map, contracts, allowances, league info).
+
+The cost map is only read (process cache, then cost_map_state), never
+built here: a chain that was never priced gets an unpriced index and is
+handed to the cache warmer, which prices it off the request path.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+
+from . import cost_map_store
+from .cache import roster_index_cache
+from .cache_warmer import cache_warmer
+from .data_schemas import validate_sleeper_roster
+from .sleeper_service import sleeper_service
+
+
+@dataclass(frozen=True)
+class RosterIndex:
+    league_id: str  # current league of the chain
+    roster_by_player: Dict[str, int]
+    amounts: Dict[str, int]
+    owned_rosters: FrozenSet[int]  # rosters with an owner (teams in the rosters response)
+    priced: bool = True  # False until the chain's cost map exists
+
+    def roster_of(self, player_id) -> Optional[int]:
+        return self.roster_by_player.get(str(player_id))
+
+    def amount(self, player_id) -> Optional[int]:
+        """The player's current salary; None if the chain is not priced yet"""
+        if not self.priced:
+            return None
+        return self.amounts.get(str(player_id), 0)
+
+    def on_roster(self, roster_id, player_id) -> bool:
+        """True if the player is on roster_id and that roster is an owned team"""
+        roster = self.roster_of(player_id)
+        return roster is not None and str(roster) == str(roster_id) and roster in self.owned_rosters
+
+
+def _cost_map(league_chain, current_league_id: str) -> Optional[Dict[str, int]]:
+    """The chain's cost map from the process cache or cost_map_state; None if never priced"""
+    from .roster_service import RosterService
+
+    cache_key = f"{current_league_id}:{','.join(league_chain)}"
+    cost_map = RosterService.get_cached_cost_map(cache_key)
+    if cost_map is not None:
+        return cost_map
+    state = cost_map_store.load(cache_key)
+    return state.cost_map() if state is not None else None
+
+
+def build_roster_index(league_id: str) -> RosterIndex:
+    try:
+        league_chain = sleeper_service.get_league_chain(str(league_id)) or [str(league_id)]
+    except Exception:
+        league_chain = [str(league_id)]
+    current_league_id = str(league_chain[0])
+
+    roster_by_player: Dict[str, int] = {}
+    owned_rosters = set()
+    for raw_roster in sleeper_service.get_rosters(current_league_id) or []:
+        roster = validate_sleeper_roster(raw_roster)
+        if roster.get('owner_id'):
+            owned_rosters.add(roster.get('roster_id'))
+        for player_id in roster.get('players', []):
+            roster_by_player.setdefault(str(player_id), roster.get('roster_id'))
+
+    cost_map = _cost_map(league_chain, current_league_id)
+    if cost_map is None:
+        cache_warmer.record_activity(current_league_id)
+        return RosterIndex(current_league_id, roster_by_player, {}, frozenset(owned_rosters), priced=False)
+    amounts = {pid: int(cost_map.get(pid, 0) or 0) for pid in roster_by_player}
+    return RosterIndex(current_league_id, roster_by_player, amounts, frozenset(owned_rosters))
+
+
+def get_roster_index(league_id: str) -> RosterIndex:
+    """Cached roster membership index for a league (any league in its chain).
+
+    Only Sleeper data goes into the index, so local contract writes leave
+    it alone (no chain tags); it expires with the rosters TTL. Unpriced
+    indexes are not cached, so the next call sees the warmed cost map.
+    """
+    key = str(league_id)
+    index = roster_index_cache.get(key)
+    if index is None:
+        index = build_roster_index(key)
+        if index.priced:
+            roster_index_cache.set(key, index)
+    return index
@@ -4,19 +4,26 @@ Separates business logic from API routes.
 """
 
 import logging
-import time
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping
+from flask import current_app
 from sqlalchemy import func
 from .sleeper_service import sleeper_service
+from .cache import CacheManager, chain_tags
+from .rate_limiter import PRIORITY_USER, current_priority
+from . import league_chain_index
+from . import cost_map_store
+from .allowance_store import allowance_writer
+from .bulk_upsert import bulk_upsert
+from .contract_state import read_contracts, remaining_years
+from .player_registry import get_player_registry
 from .data_schemas import (
     PlayerData, RosterPlayer, TeamRoster, RostersResponse,
     validate_sleeper_roster, validate_sleeper_user, validate_draft_pick
 )
 from .utils import get_league_info, get_all_contracts_in_chain
-from .models import LeagueChain, RfaPlayer, AmnestyPlayer, ExtensionPlayer, RfaTeam, AmnestyTeam, ExtensionTeam, LocalPlayer
+from .models import RfaPlayer, AmnestyPlayer, ExtensionPlayer, LocalPlayer
 from .extensions import db
-import json
 import os
 
 logger = logging.getLogger(__name__)
@@ -25,74 +32,60 @@ logger = logging.getLogger(__name__)
 class RosterService:
     """Service for processing and enriching roster data"""
 
-    _players_map_cache: Dict[str, PlayerData] = {}
-    _players_map_cache_ts: float = 0.0
-    _players_map_cache_ttl: int = 60 * 60 * 24  # 24 hours
-    _cost_map_cache: Dict[str, Dict[str, int]] = {}
-    _cost_map_cache_ts: Dict[str, float] = {}
-    _cost_map_cache_ttl: int = 60 * 10  # 10 minutes
-    _response_cache: Dict[Tuple[str, str], Dict] = {}
-    _response_cache_ts: Dict[Tuple[str, str], float] = {}
-    _response_cache_ttl: int = 30  # 30 seconds
+    # Shared across workers when CACHE_BACKEND is configured
+    # Player IDs Sleeper doesn't know; not retried until the entry expires
+    _unknown_players_cache = CacheManager(maxsize=5000, ttl=60 * 60 * 6, namespace="unknown_players")  # 6 hours
+    _cost_map_cache = CacheManager(maxsize=500, ttl=60 * 10, namespace="cost_map")  # 10 minutes
+    # Keyed by resolved league only: the payload is the same for every user
+    _response_cache = CacheManager(
+        maxsize=int(os.getenv("ROSTERS_RESPONSE_CACHE_SIZE", "200")),
+        ttl=30,
+        namespace="rosters_response"
+    )  # 30 seconds, LRU-bounded
     
     @staticmethod
-    def build_players_map(league_id: str, player_ids: List[str] | None = None) -> Dict[str, PlayerData]:
+    def build_players_map(league_id: str, player_ids: List[str] | None = None) -> Mapping[str, PlayerData]:
         """
-        Build a map of players from the local database.
+        Build a map of players from the player registry (local database).
         Maps player_id (string) -> PlayerData
+
+        Without player_ids the shared registry itself is returned.
         """
-        now = time.time()
+        registry = get_player_registry()
         if player_ids is None:
-            if (
-                RosterService._players_map_cache
-                and (now - RosterService._players_map_cache_ts) < RosterService._players_map_cache_ttl
-            ):
-                logger.info("Using cached players map")
-                return RosterService._players_map_cache
-
-        logger.info(f"Building players map from local DB for league {league_id}")
-
-        query = LocalPlayer.query
-        if player_ids:
-            try:
-                ids = [int(pid) for pid in player_ids]
-            except Exception:
-                ids = []
-            if ids:
-                query = query.filter(LocalPlayer.player_id.in_(ids))
-        players = query.all()
+            return registry
 
         players_map: Dict[str, PlayerData] = {}
-        for p in players:
-            players_map[str(p.player_id)] = PlayerData(
-                player_id=str(p.player_id),
-                first_name=p.first_name or "Unknown",
-                last_name=p.last_name or "Unknown",
-                position=p.position or "N/A",
-            )
+        unknown_ids = set()
+        for pid in player_ids:
+            pid = str(pid)
+            player = registry.get(pid)
+            if player is not None:
+                players_map[pid] = player
+            elif pid.isdigit():
+                unknown_ids.add(int(pid))
+
+        # Stored by another worker since this registry was loaded
+        if unknown_ids:
+            stored = [
+                PlayerData(
+                    player_id=str(p.player_id),
+                    first_name=p.first_name or "Unknown",
+                    last_name=p.last_name or "Unknown",
+                    position=p.position or "N/A",
+                )
+                for p in LocalPlayer.query.filter(LocalPlayer.player_id.in_(unknown_ids)).all()
+            ]
+            registry.add(stored)
+            players_map.update((p.player_id, p) for p in stored)
 
-        logger.info(f"Built players map with {len(players_map)} players from local DB")
-        if player_ids is None:
-            RosterService._players_map_cache = players_map
-            RosterService._players_map_cache_ts = now
+        logger.info(f"Built players map with {len(players_map)} players for league {league_id}")
         return players_map
     
     @staticmethod
-    def build_cost_map(draft_picks_data: Dict, transactions: List[Dict], cache_key: str = "") -> Dict[str, int]:
-        """
-        Build player cost map from draft picks.
-        Maps player_id (string) -> amount
-        """
-        now = time.time()
-        if cache_key:
-            cached = RosterService._cost_map_cache.get(cache_key)
-            cached_ts = RosterService._cost_map_cache_ts.get(cache_key, 0.0)
-            if cached is not None and (now - cached_ts) < RosterService._cost_map_cache_ttl:
-                logger.info("Using cached cost map")
-                return cached
-
+    def _draft_cost_map(draft_picks_data: Dict) -> Dict[str, int]:
+        """player_id -> amount from draft picks; earlier drafts in the dict win"""
         cost_map = {}
-        
         for draft_id, picks in draft_picks_data.items():
             if not isinstance(picks, list):
                 logger.warning(f"Draft {draft_id}: picks is not a list")
@@ -110,55 +103,123 @@ class RosterService:
                 # Only keep first cost found for each player
                 if amount and player_id not in cost_map:
                     cost_map[player_id] = amount
-        
-        # Fall back to transactions (waiver/FAAB/auction adds) for players
-        # not already priced by draft picks.
-        if isinstance(transactions, list) and transactions:
-            def _tx_sort_key(tx):
-                ts = tx.get('created') or tx.get('status_updated') or tx.get('status') or 0
-                try:
-                    return int(ts)
-                except Exception:
-                    return 0
-
-            def _extract_tx_amount(settings: Dict) -> int:
-                if not isinstance(settings, dict):
-                    return 0
-                for key in ('waiver_bid', 'faab_bid', 'bid', 'price', 'amount'):
-                    val = settings.get(key)
-                    if val is None:
-                        continue
-                    try:
-                        val_int = int(val)
-                    except Exception:
-                        continue
-                    if val_int > 0:
-                        return val_int
-                return 0
+        return cost_map
+
+    @staticmethod
+    def _tx_int(tx: Dict, *keys: str) -> int:
+        for key in keys:
+            try:
+                value = int(tx.get(key) or 0)
+            except Exception:
+                continue
+            if value:
+                return value
+        return 0
+
+    @staticmethod
+    def _extract_tx_amount(settings: Dict) -> int:
+        if not isinstance(settings, dict):
+            return 0
+        for key in ('waiver_bid', 'faab_bid', 'bid', 'price', 'amount'):
+            val = settings.get(key)
+            if val is None:
+                continue
+            try:
+                val_int = int(val)
+            except Exception:
+                continue
+            if val_int > 0:
+                return val_int
+        return 0
+
+    @staticmethod
+    def _apply_transactions(tx_map: Dict[str, List[int]], transactions: List[Dict]) -> None:
+        """Fold transactions into player_id -> [amount, created]; the newest created wins"""
+        for tx in transactions:
+            if not isinstance(tx, dict):
+                continue
+            amount = RosterService._extract_tx_amount(tx.get('settings', {}))
+            if not amount:
+                continue
+            created = RosterService._tx_int(tx, 'created', 'status_updated')
+            adds = tx.get('adds')
+            if isinstance(adds, dict):
+                player_ids = list(adds.keys())
+            elif isinstance(adds, list):
+                player_ids = adds
+            else:
+                player_ids = []
+
+            for pid in player_ids:
+                current = tx_map.get(str(pid))
+                if current is None or created > current[1]:
+                    tx_map[str(pid)] = [amount, created]
+
+    @staticmethod
+    def build_cost_map(
+        draft_picks_data: Dict,
+        transactions: List[Dict],
+        cache_key: str = "",
+        cache_tags: List[str] | None = None,
+        refresh: bool = False
+    ) -> Dict[str, int]:
+        """
+        Build player cost map from draft picks, falling back to transactions
+        (waiver/FAAB/auction adds) for players not priced by a draft.
+        Maps player_id (string) -> amount
+
+        With a cache_key the result is persisted in cost_map_state: the
+        draft map is only rebuilt when the drafts change, and only
+        transactions newer than the stored watermark are applied.
+        refresh rebuilds the map over a cached one.
+        """
+        if cache_key and refresh:
+            RosterService._cost_map_cache.note_miss(cache_key)
+        elif cache_key:
+            cached = RosterService._cost_map_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached cost map")
+                return cached
+
+        state = cost_map_store.load(cache_key) if cache_key else None
+        draft_picks_data = draft_picks_data if isinstance(draft_picks_data, dict) else {}
+        draft_signature = cost_map_store.draft_signature(draft_picks_data)
+        transactions = transactions if isinstance(transactions, list) else []
+
+        if state is not None and (not draft_picks_data or draft_signature == state.draft_signature):
+            draft_map = state.draft_map
+        else:
+            draft_map = RosterService._draft_cost_map(draft_picks_data)
+
+        if state is not None:
+            tx_map = state.tx_map
+            watermark_ts = state.tx_watermark_ts
+            new_transactions = [
+                tx for tx in transactions
+                if isinstance(tx, dict) and RosterService._tx_int(tx, 'status_updated', 'created') >= watermark_ts
+            ]
+        else:
+            tx_map = {}
+            new_transactions = transactions
+        RosterService._apply_transactions(tx_map, new_transactions)
+
+        cost_map = {pid: amount for pid, (amount, _) in tx_map.items()}
+        cost_map.update(draft_map)
+        logger.info(
+            f"Built cost map for {len(cost_map)} players "
+            f"({len(new_transactions)} new of {len(transactions)} transactions)"
+        )
 
-            for tx in sorted(transactions, key=_tx_sort_key, reverse=True):
-                if not isinstance(tx, dict):
-                    continue
-                amount = _extract_tx_amount(tx.get('settings', {}))
-                if not amount:
-                    continue
-                adds = tx.get('adds')
-                if isinstance(adds, dict):
-                    player_ids = list(adds.keys())
-                elif isinstance(adds, list):
-                    player_ids = adds
-                else:
-                    player_ids = []
-
-                for pid in player_ids:
-                    pid_str = str(pid)
-                    if pid_str not in cost_map:
-                        cost_map[pid_str] = amount
-
-        logger.info(f"Built cost map for {len(cost_map)} players")
         if cache_key:
-            RosterService._cost_map_cache[cache_key] = cost_map
-            RosterService._cost_map_cache_ts[cache_key] = now
+            cost_map_store.save(
+                cache_key,
+                draft_signature if draft_picks_data or state is None else state.draft_signature,
+                draft_map,
+                tx_map,
+                new_transactions,
+                previous=state,
+            )
+            RosterService._cost_map_cache.set(cache_key, cost_map, tags=cache_tags)
         return cost_map
 
     @staticmethod
@@ -166,12 +227,7 @@ class RosterService:
         """Return cached cost map if still fresh, otherwise None."""
         if not cache_key:
             return None
-        now = time.time()
-        cached = RosterService._cost_map_cache.get(cache_key)
-        cached_ts = RosterService._cost_map_cache_ts.get(cache_key, 0.0)
-        if cached is not None and (now - cached_ts) < RosterService._cost_map_cache_ttl:
-            return cached
-        return None
+        return RosterService._cost_map_cache.get(cache_key)
     
     @staticmethod
     def process_rosters(
@@ -183,7 +239,9 @@ class RosterService:
         current_season: int,
         transactions: List[Dict],
         commissioner_id: str | None = None,
-        cost_map_cache_key: str = ""
+        cost_map_cache_key: str = "",
+        cost_map_tags: List[str] | None = None,
+        refresh_cost_map: bool = False
     ) -> List[Dict]:
         """
         Process roster data efficiently.
@@ -207,34 +265,23 @@ class RosterService:
             if isinstance(r, dict):
                 roster_player_ids.extend([str(pid) for pid in r.get('players', [])])
         players_map = RosterService.build_players_map(league_id, player_ids=roster_player_ids)
+        # Resolve every player missing from the local DB at once
+        players_map.update(RosterService.resolve_missing_players(
+            pid for pid in roster_player_ids if pid not in players_map
+        ))
         skip_cost_map = os.getenv("SKIP_COST_MAP", "0") == "1"
-        cost_map = {} if skip_cost_map else RosterService.build_cost_map(draft_picks, transactions, cache_key=cost_map_cache_key)
+        cost_map = {} if skip_cost_map else RosterService.build_cost_map(
+            draft_picks, transactions, cache_key=cost_map_cache_key, cache_tags=cost_map_tags,
+            refresh=refresh_cost_map
+        )
 
         # Precompute remaining contract years per player (avoid per-player DB queries)
-        contract_years_map: Dict[str, int] = {}
         try:
             from .utils import get_league_chain_ids
-            from .models import Contract, AmnestyPlayer
             league_chain_ids = get_league_chain_ids(int(league_id))
             if not league_chain_ids:
                 league_chain_ids = [int(league_id)]
-            contracts = (
-                Contract.query.filter(Contract.league_id.in_(league_chain_ids))
-                .order_by(Contract.id.desc())
-                .all()
-            )
-            amnestied_ids = {
-                a.contract_id
-                for a in AmnestyPlayer.query.filter(AmnestyPlayer.league_id.in_(league_chain_ids)).all()
-            }
-            for contract in contracts:
-                if contract.id in amnestied_ids:
-                    continue
-                pid = str(contract.player_id)
-                if pid in contract_years_map:
-                    continue
-                remaining = contract.contract_length - (current_season - contract.season)
-                contract_years_map[pid] = max(0, remaining)
+            contract_years_map = remaining_years(read_contracts(league_chain_ids, current_season), current_season)
         except Exception:
             contract_years_map = {}
         
@@ -272,17 +319,8 @@ class RosterService:
                 player = players_map.get(player_id_str)
                 
                 if not player:
-                    # Avoid heavy Sleeper player downloads in constrained environments
-                    if os.getenv("SKIP_PLAYER_FALLBACK", "0") == "1":
-                        player = PlayerData.placeholder(player_id_str)
-                    else:
-                        # Fallback to Sleeper API for missing player, then cache locally
-                        player = RosterService._fetch_player_from_sleeper(player_id_str)
-                        if player:
-                            players_map[player_id_str] = player
-                        else:
-                            player = PlayerData.placeholder(player_id_str)
-                            logger.warning(f"Player {player_id_str} not found in local DB or Sleeper API, using placeholder")
+                    player = PlayerData.placeholder(player_id_str)
+                    logger.warning(f"Player {player_id_str} not found in local DB or Sleeper API, using placeholder")
                 
                 # Get contract info for this player
                 contract_years = contract_years_map.get(player_id_str, 0)
@@ -332,42 +370,75 @@ class RosterService:
         return [r.to_dict() for r in processed_rosters]
 
     @staticmethod
-    def _fetch_player_from_sleeper(player_id: str) -> PlayerData | None:
-        """Fetch a single player from Sleeper /players/nfl as fallback and upsert into local DB."""
+    def resolve_missing_players(player_ids) -> Dict[str, PlayerData]:
+        """
+        Resolve players missing from local_players in one pass.
+
+        Loads the Sleeper /players/nfl snapshot at most once, bulk-upserts
+        every hit into local_players in a single statement and remembers
+        IDs Sleeper doesn't know so they aren't retried. Returns
+        player_id (string) -> PlayerData for the resolved players.
+        """
+        if os.getenv("SKIP_PLAYER_FALLBACK", "0") == "1":
+            return {}
+        pending = []
+        for pid in {str(p) for p in player_ids or [] if p not in (None, "")}:
+            if RosterService._unknown_players_cache.get(pid) is None:
+                pending.append(pid)
+        if not pending:
+            return {}
+
         try:
             players = sleeper_service.get_players_nfl()
-            if not isinstance(players, dict):
-                return None
-            data = players.get(str(player_id))
-            if not isinstance(data, dict):
-                return None
-            if not data.get('first_name') or not data.get('last_name'):
-                return None
+        except Exception as e:
+            logger.warning(f"Could not load Sleeper players for {len(pending)} missing IDs: {e}")
+            return {}
+        if not isinstance(players, dict) or not players:
+            return {}
+
+        resolved: Dict[str, PlayerData] = {}
+        for pid in pending:
+            data = players.get(pid)
+            if isinstance(data, dict) and data.get('first_name') and data.get('last_name'):
+                resolved[pid] = PlayerData.from_sleeper_response(pid, data)
+            else:
+                RosterService._unknown_players_cache.set(pid, True)
 
-            player = PlayerData.from_sleeper_response(player_id, data)
+        if resolved:
+            RosterService._upsert_local_players(resolved.values())
+        logger.info(f"Resolved {len(resolved)}/{len(pending)} missing players from Sleeper")
+        return resolved
 
-            try:
-                existing = LocalPlayer.query.filter_by(player_id=int(player_id)).first()
-                if existing:
-                    existing.first_name = player.first_name
-                    existing.last_name = player.last_name
-                    existing.position = player.position
-                    db.session.add(existing)
-                else:
-                    db.session.add(LocalPlayer(
-                        player_id=int(player_id),
-                        first_name=player.first_name,
-                        last_name=player.last_name,
-                        position=player.position
-                    ))
-                db.session.commit()
-            except Exception:
-                db.session.rollback()
+    @staticmethod
+    def _upsert_local_players(players) -> None:
+        """Insert or update local_players rows in a single statement"""
+        # Team defenses ("DEN") have no numeric ID and are not stored
+        rows = [
+            {
+                "player_id": int(p.player_id),
+                "first_name": p.first_name,
+                "last_name": p.last_name,
+                "position": p.position,
+                "updated_at": datetime.utcnow(),
+            }
+            for p in players
+            if str(p.player_id).isdigit()
+        ]
+        if not rows:
+            return
+        try:
+            bulk_upsert(LocalPlayer, rows)
+            db.session.commit()
+            get_player_registry().add(players)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Failed to store {len(rows)} resolved players: {e}")
+
+    @staticmethod
+    def _fetch_player_from_sleeper(player_id: str) -> PlayerData | None:
+        """Fetch a single player from Sleeper /players/nfl as fallback and upsert into local DB."""
+        return RosterService.resolve_missing_players([player_id]).get(str(player_id))
 
-            return player
-        except Exception:
-            return None
-    
     @staticmethod
     def get_rosters_response(
         league_id: str,
@@ -376,17 +447,23 @@ class RosterService:
         users: List[Dict],
         draft_picks: Dict,
         current_season: int,
-        transactions: List[Dict]
+        transactions: List[Dict],
+        refresh: bool = False
     ) -> Dict:
         """
         Get complete rosters response with all enrichment.
+
+        The response does not depend on user_id, so it is cached once per
+        league; use select_team() for a single user's view. refresh
+        rebuilds the response and cost map and overwrites the cached ones.
         """
-        # Short-term response cache for identical requests (user + league)
-        cache_key = (str(league_id), str(user_id))
-        now = time.time()
-        cached_resp = RosterService._response_cache.get(cache_key)
-        cached_ts = RosterService._response_cache_ts.get(cache_key, 0.0)
-        if cached_resp is not None and (now - cached_ts) < RosterService._response_cache_ttl:
+        cache_key = str(league_id)
+        if refresh:
+            RosterService._response_cache.note_miss(cache_key)
+            cached_resp = None
+        else:
+            cached_resp = RosterService._response_cache.get(cache_key)
+        if cached_resp is not None:
             logger.info("Using cached rosters response")
             return cached_resp
 
@@ -424,25 +501,9 @@ class RosterService:
         current_league_id = league_chain[0] if league_chain else starting_league_id
         original_league_id = league_chain[-1] if league_chain else starting_league_id
 
-        # Upsert league_chain in database so downstream callers can read it
-        try:
-            existing = LeagueChain.query.filter_by(original_league_id=int(original_league_id)).first()
-            payload = json.dumps([int(lid) for lid in league_chain])
-            if existing:
-                existing.current_league_id = int(current_league_id)
-                existing.league_ids = payload
-                existing.last_updated = db.func.now()
-                db.session.add(existing)
-            else:
-                new_chain = LeagueChain(
-                    original_league_id=int(original_league_id),
-                    current_league_id=int(current_league_id),
-                    league_ids=payload
-                )
-                db.session.add(new_chain)
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
+        # Upsert league_chain in database so downstream callers can read it.
+        # Warmups must not keep an idle chain looking active.
+        league_chain_index.save_chain(league_chain, touch=current_priority() == PRIORITY_USER)
 
         # If rosters/users/draft_picks/transactions were not provided (None),
         # fetch them for the resolved current league id so we operate on
@@ -460,7 +521,7 @@ class RosterService:
                 users = []
 
         cost_map_cache_key = f"{current_league_id}:{','.join(league_chain)}"
-        cached_cost_map = RosterService.get_cached_cost_map(cost_map_cache_key)
+        cached_cost_map = None if refresh else RosterService.get_cached_cost_map(cost_map_cache_key)
 
         # Build draft picks if not provided and no cached cost map
         if (not draft_picks or not isinstance(draft_picks, dict)) and cached_cost_map is None:
@@ -495,10 +556,11 @@ class RosterService:
                     return (ts_val, league_rank)
 
                 # Newest drafts first so they take precedence in build_cost_map
-                for draft, _ in sorted(draft_sources, key=_draft_sort_key, reverse=True):
-                    draft_id = draft.get('draft_id')
-                    if draft_id and draft_id not in draft_picks:
-                        draft_picks[draft_id] = sleeper_service.get_draft_picks(draft_id)
+                ordered_draft_ids = [
+                    draft.get('draft_id')
+                    for draft, _ in sorted(draft_sources, key=_draft_sort_key, reverse=True)
+                ]
+                draft_picks = sleeper_service.get_draft_picks_bulk(ordered_draft_ids)
             except Exception:
                 draft_picks = {}
         elif cached_cost_map is not None:
@@ -507,9 +569,10 @@ class RosterService:
         # Transactions
         if (not isinstance(transactions, list) or len(transactions) == 0) and cached_cost_map is None:
             try:
-                transactions = []
-                for round_num in range(0, 18):
-                    transactions.extend(sleeper_service.get_transactions(current_league_id, round_num) or [])
+                # Rounds before the stored watermark are already folded into the cost map
+                transactions = sleeper_service.get_all_transactions(
+                    current_league_id, 18, start_round=cost_map_store.watermark_round(cost_map_cache_key)
+                )
             except Exception:
                 transactions = []
         elif cached_cost_map is not None:
@@ -531,7 +594,9 @@ class RosterService:
             current_season,
             transactions,
             commissioner_id=commissioner_id,
-            cost_map_cache_key=cost_map_cache_key
+            cost_map_cache_key=cost_map_cache_key,
+            cost_map_tags=chain_tags(league_chain),
+            refresh_cost_map=refresh
         )
 
         # Get league info for the current league (fallback to original league if missing)
@@ -657,6 +722,7 @@ class RosterService:
                     .all()
                 )
 
+            allowances = {}
             for team in team_info:
                 roster_id = owner_to_roster.get(str(team.get("owner_id")))
                 if roster_id is None:
@@ -669,29 +735,10 @@ class RosterService:
                 team["extension_left"] = extension_left
                 team["contracts"] = int(active_contract_counts.get(roster_id, 0))
 
-                base_league_id = int(original_league_id)
-                rfa_team = RfaTeam.query.filter_by(league_id=base_league_id, team_id=roster_id).first()
-                if not rfa_team:
-                    rfa_team = RfaTeam(league_id=base_league_id, team_id=roster_id, rfa_left=rfa_left)
-                    db.session.add(rfa_team)
-                else:
-                    rfa_team.rfa_left = rfa_left
-
-                amnesty_team = AmnestyTeam.query.filter_by(league_id=base_league_id, team_id=roster_id).first()
-                if not amnesty_team:
-                    amnesty_team = AmnestyTeam(league_id=base_league_id, team_id=roster_id, amnesty_left=amnesty_left)
-                    db.session.add(amnesty_team)
-                else:
-                    amnesty_team.amnesty_left = amnesty_left
-
-                extension_team = ExtensionTeam.query.filter_by(league_id=base_league_id, team_id=roster_id).first()
-                if not extension_team:
-                    extension_team = ExtensionTeam(league_id=base_league_id, team_id=roster_id, extension_left=extension_left)
-                    db.session.add(extension_team)
-                else:
-                    extension_team.extension_left = extension_left
+                allowances[int(roster_id)] = (rfa_left, amnesty_left, extension_left)
 
-            db.session.commit()
+            # Persisted off the request path, and only when the values changed
+            allowance_writer.submit(current_app._get_current_object(), int(original_league_id), allowances)
         except Exception:
             db.session.rollback()
 
@@ -703,6 +750,18 @@ class RosterService:
             'original_league_id': str(original_league_id),
             'league_chain': [str(x) for x in league_chain]
         }
-        RosterService._response_cache[cache_key] = response
-        RosterService._response_cache_ts[cache_key] = now
+        tags = chain_tags(league_chain)
+        RosterService._response_cache.set(cache_key, response, tags=tags)
+        if str(current_league_id) != cache_key:
+            RosterService._response_cache.set(str(current_league_id), response, tags=tags)
         return response
+
+    @staticmethod
+    def select_team(response: Dict, user_id: str) -> Dict | None:
+        """The requesting user's team from a league-wide rosters response"""
+        if not isinstance(response, dict) or not user_id:
+            return None
+        for team in response.get('team_info', []) or []:
+            if str(team.get('owner_id')) == str(user_id):
+                return team
+        return None
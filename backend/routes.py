@@ -1,25 +1,34 @@
 import logging
+import os
 import time
-import base64
 from datetime import datetime
-import requests
-from flask import Blueprint, jsonify, request, Response, g
+from flask import Blueprint, current_app, jsonify, redirect, request, Response, g
 from flask_cors import cross_origin
 from typing import Dict, List, Tuple
 
 from .sleeper_service import sleeper_service
 from .roster_service import RosterService
+from .allowance_store import allowance_writer
+from .cache_warmer import cache_warmer
+from .cap_projection import DEFAULT_CAP_LIMIT, project_cap
+from .player_registry import get_player_registry
+from .roster_index import get_roster_index
+from .cache import activity_page_cache, chain_tags, contract_listing_cache
 from .auth import require_auth, maybe_set_auth_context
 from .utils import (
     get_rosters_response,
     get_all_contracts_in_chain,
-    get_all_amnestied_players_in_chain,
     get_league_info,
     get_league_chain_ids,
+    get_league_chain_ids_many,
+    invalidate_league_caches,
 )
+from . import activity_store, contract_state, player_images
+from .contract_status import latest_contract_id
+from .contract_writes import current_salary, has_active_contract
 from .models import (
     Contract, LocalPlayer, AmnestyPlayer, RfaPlayer, 
-    ExtensionPlayer, AmnestyTeam, RfaTeam, ExtensionTeam, PlayerImage, LeagueInfo,
+    ExtensionPlayer, AmnestyTeam, RfaTeam, ExtensionTeam, LeagueInfo,
     CommissionerActionLog, AuthUser
 )
 from .extensions import db
@@ -32,28 +41,16 @@ logger = logging.getLogger(__name__)
 def _attach_auth_context():
     maybe_set_auth_context()
 
-def _get_team_player_from_rosters(league_id: int, team_id: int, player_id: int):
-    """Return (team, player) from current rosters if player is on the team."""
+def _roster_player_amount(league_id: int, team_id: int, player_id: int):
+    """Return the player's amount if they are currently on the team, else None."""
     try:
-        response = get_rosters_response(str(league_id), "")
-        teams = response.get("team_info", []) if isinstance(response, dict) else []
-    except Exception:
-        teams = []
-
-    target_team = None
-    for team in teams:
-        if str(team.get("roster_id")) == str(team_id):
-            target_team = team
-            break
-
-    if not target_team:
-        return None, None
-
-    for player in target_team.get("players", []) or []:
-        if str(player.get("player_id")) == str(player_id):
-            return target_team, player
-
-    return target_team, None
+        index = get_roster_index(str(league_id))
+    except Exception as e:
+        logger.warning(f"Roster index unavailable for league {league_id}: {e}")
+        return None
+    if not index.on_roster(team_id, player_id):
+        return None
+    return index.amount(player_id) or 0
 
 @api.errorhandler(Exception)
 def handle_error(error):
@@ -148,24 +145,32 @@ def get_league_config_status():
         if not isinstance(league_ids_raw, list):
             return jsonify({"status": "error", "message": "league_ids must be a list", "data": None}), 400
 
-        results: Dict[str, Dict] = {}
         # Cap list size to keep this endpoint predictable.
+        league_ids: List[int] = []
+        for raw_id in league_ids_raw[:100]:
+            try:
+                league_ids.append(int(raw_id))
+            except Exception:
+                continue
+
+        chains = get_league_chain_ids_many(league_ids) if league_ids else {}
+        member_ids = {chain_id for chain_ids in chains.values() for chain_id in chain_ids}
+        infos = {
+            int(info.league_id): info
+            for info in (LeagueInfo.query.filter(LeagueInfo.league_id.in_(member_ids)).all() if member_ids else [])
+        }
+
+        results: Dict[str, Dict] = {}
         for raw_id in league_ids_raw[:100]:
-            league_id_str = str(raw_id)
             configured = False
             source_league_id = None
-            chain_ids: List[int] = []
-
             try:
-                chain_ids = get_league_chain_ids(int(raw_id)) or [int(raw_id)]
+                chain_ids = chains.get(int(raw_id), [])
             except Exception:
-                try:
-                    chain_ids = [int(raw_id)]
-                except Exception:
-                    chain_ids = []
+                chain_ids = []
 
             for chain_id in chain_ids:
-                info = LeagueInfo.query.filter_by(league_id=chain_id).first()
+                info = infos.get(chain_id)
                 if not info:
                     continue
                 if int(info.money_per_team or 0) > 0 and bool(info.creation_date):
@@ -173,7 +178,7 @@ def get_league_config_status():
                     source_league_id = str(chain_id)
                     break
 
-            results[league_id_str] = {
+            results[str(raw_id)] = {
                 "configured": configured,
                 "source_league_id": source_league_id,
             }
@@ -241,11 +246,7 @@ def get_selected_roster(league_id: str, user_id: str):
     try:
         response_data = get_rosters_response(league_id, user_id)
         current_season = response_data.get('current_season') if isinstance(response_data, dict) else None
-        team = None
-        for t in response_data.get('team_info', []):
-            if t.get('owner_id') == user_id:
-                team = t
-                break
+        team = RosterService.select_team(response_data, user_id)
 
         return jsonify({
             "status": "success",
@@ -263,6 +264,45 @@ def get_selected_roster(league_id: str, user_id: str):
             "data": None
         }), 500
 
+@api.route('/cap-outlook/<league_id>', methods=['GET'])
+@cross_origin()
+@require_auth
+def get_cap_outlook(league_id: str):
+    """Committed salary, contracts and cap space per team for the next N seasons."""
+    try:
+        seasons = int(request.args.get('seasons', 5))
+    except Exception:
+        return jsonify({"status": "error", "message": "seasons must be numeric", "data": None}), 400
+    try:
+        seasons = min(max(seasons, 1), 10)
+        response_data = get_rosters_response(league_id, '')
+        if not isinstance(response_data, dict):
+            response_data = {}
+        current_season = response_data.get('current_season')
+        if current_season is None:
+            nfl_state = sleeper_service.get_current_nfl_state() or {}
+            current_season = nfl_state.get('league_season', nfl_state.get('season'))
+        current_season = int(current_season)
+        league_info = response_data.get('league_info') or {}
+        cap_limit = int(league_info.get('money_per_team') or DEFAULT_CAP_LIMIT)
+        league_chain = response_data.get('league_chain') or [league_id]
+
+        outlook = project_cap(
+            response_data.get('team_info', []) or [],
+            contract_state.read_contracts(league_chain, current_season),
+            current_season,
+            cap_limit,
+            seasons
+        )
+        return jsonify({"status": "success", "data": outlook}), 200
+    except Exception as e:
+        logger.error(f"Error in get_cap_outlook: {str(e)}", exc_info=True)
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "data": None
+        }), 500
+
 @api.route('/contracts/<league_id>', methods=['GET'])
 @cross_origin()
 @require_auth
@@ -309,47 +349,16 @@ def add_contract():
         current_season = int(nfl_state.get('league_season', 2026))
 
         # Ensure no active contract exists in the league chain
-        all_contracts = get_all_contracts_in_chain(league_id, current_season)
-        amnestied = get_all_amnestied_players_in_chain(league_id)
-        amnestied_contract_ids = {a['contract_id'] for a in amnestied}
-
-        for contract in all_contracts:
-            if int(contract['player_id']) != player_id:
-                continue
-            contract_id = contract['id']
-            if contract_id in amnestied_contract_ids:
-                continue
-            if contract.get('is_expired'):
-                continue
+        league_chain_ids = get_league_chain_ids(league_id) or [league_id]
+        if has_active_contract(league_chain_ids, player_id, current_season):
             return jsonify({
                 "status": "error",
                 "message": "Active contract already exists for this player",
                 "data": None
             }), 409
 
-        league_chain_ids = get_league_chain_ids(league_id)
-        current_league_id = league_chain_ids[0] if league_chain_ids else league_id
-
-        rosters = sleeper_service.get_rosters(current_league_id) or []
-        team_id = None
-        for roster in rosters:
-            if str(player_id) in [str(pid) for pid in roster.get('players', [])]:
-                team_id = roster.get('roster_id')
-                break
-
-        # Compute current salary from draft/transaction cost map
-        drafts = sleeper_service.get_drafts(current_league_id)
-        draft_picks_data = {}
-        if drafts and isinstance(drafts, list):
-            for draft in drafts:
-                draft_id = draft.get('draft_id')
-                if draft_id:
-                    draft_picks_data[draft_id] = sleeper_service.get_draft_picks(draft_id)
-
-        transactions = []
-        for round_num in range(18):
-            tx = sleeper_service.get_transactions(current_league_id, round_num) or []
-            transactions.extend(tx)
+        # Current team and salary from the roster index (cached rosters + cost map)
+        team_id, roster_amount = current_salary(league_chain_ids[0], player_id)
 
         contract_amount = 0
         if contract_amount_payload not in (None, ""):
@@ -358,17 +367,13 @@ def add_contract():
             except Exception:
                 contract_amount = 0
         if contract_amount <= 0:
-            try:
-                from .roster_service import RosterService
-                cache_key = f"{current_league_id}:{','.join([str(x) for x in league_chain_ids])}"
-                cost_map = RosterService.build_cost_map(
-                    draft_picks_data,
-                    transactions,
-                    cache_key=cache_key
-                )
-                contract_amount = int(cost_map.get(str(player_id), 0))
-            except Exception as e:
-                logger.warning(f"Failed to build cost map for contract amount: {str(e)}")
+            if roster_amount is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "Salaries for this league are still being computed; retry shortly or pass contract_amount",
+                    "data": None
+                }), 503
+            contract_amount = roster_amount
 
         new_contract = Contract(
             league_id=league_id,
@@ -379,7 +384,10 @@ def add_contract():
             season=current_season
         )
         db.session.add(new_contract)
+        db.session.flush()
+        contract_state.sync_contracts([new_contract.id])
         db.session.commit()
+        invalidate_league_caches(league_id)
 
         return jsonify({
             "status": "success",
@@ -408,229 +416,35 @@ def add_contract():
 def get_league_activity(league_id: str):
     """Return a combined activity feed for a league."""
     try:
-        offset = int(request.args.get('offset', 0))
-        limit = int(request.args.get('limit', 20))
-        rounds = int(request.args.get('rounds', 18))
-
-        # Resolve team names for transactions
-        rosters = sleeper_service.get_rosters(league_id) or []
-        users = sleeper_service.get_users(league_id) or []
-        users_map = {u.get('user_id'): u for u in users if isinstance(u, dict)}
-        roster_owner_map = {
-            r.get('roster_id'): r.get('owner_id')
-            for r in rosters
-            if isinstance(r, dict)
-        }
-        team_name_map = {}
-        owner_name_map = {}
-        for roster_id, owner_id in roster_owner_map.items():
-            user = users_map.get(owner_id) or {}
-            display_name = user.get('display_name') or user.get('username')
-            if display_name:
-                team_name_map[str(roster_id)] = display_name
-                owner_name_map[str(owner_id)] = display_name
-
-        # Build player name lookups (local db + Sleeper)
         try:
-            from .roster_service import RosterService
-            players_map = RosterService.build_players_map(str(league_id))
+            offset = int(request.args.get('offset', 0))
+            limit = int(request.args.get('limit', 20))
         except Exception:
-            players_map = {}
-
-        transactions = []
-        for round_num in range(rounds):
-            tx = sleeper_service.get_transactions(league_id, round_num) or []
-            transactions.extend(tx)
-
-        # Local contract-related events (no timestamps available, use season as proxy)
-        league_chain_ids = get_league_chain_ids(league_id) or [int(league_id)]
-        contracts = Contract.query.filter(Contract.league_id.in_(league_chain_ids)).all()
-        amnesties = AmnestyPlayer.query.filter(AmnestyPlayer.league_id.in_(league_chain_ids)).all()
-        rfas = RfaPlayer.query.filter(RfaPlayer.league_id.in_(league_chain_ids)).all()
-        extensions = ExtensionPlayer.query.filter(ExtensionPlayer.league_id.in_(league_chain_ids)).all()
-        commissioner_logs = CommissionerActionLog.query.filter(
-            CommissionerActionLog.league_id.in_(league_chain_ids)
-        ).all()
-        contracts_by_id = {c.id: c for c in contracts}
-
-        local_player_ids = set()
-        for c in contracts:
-            local_player_ids.add(str(c.player_id))
-        for a in amnesties:
-            local_player_ids.add(str(a.player_id))
-        for r in rfas:
-            local_player_ids.add(str(r.player_id))
-        for e in extensions:
-            local_player_ids.add(str(e.player_id))
-        for log in commissioner_logs:
-            local_player_ids.add(str(log.player_id))
-
-        players_db = LocalPlayer.query.filter(LocalPlayer.player_id.in_(list(local_player_ids))).all() if local_player_ids else []
-        local_players_map = {str(p.player_id): p for p in players_db}
-
-        def _player_name(pid: str) -> str:
-            player = local_players_map.get(str(pid))
-            if player:
-                first = player.first_name or ""
-                last = player.last_name or ""
-                return f"{first} {last}".strip()
-            sleeper_player = players_map.get(str(pid))
-            if sleeper_player:
-                first = sleeper_player.first_name or ""
-                last = sleeper_player.last_name or ""
-                return f"{first} {last}".strip()
-            return f"Player {pid}"
-
-        def _player_position(pid: str) -> str:
-            player = local_players_map.get(str(pid))
-            if player and player.position:
-                return player.position
-            sleeper_player = players_map.get(str(pid))
-            if sleeper_player and sleeper_player.position:
-                return sleeper_player.position
-            return "N/A"
-
-        def _extract_player_ids(raw) -> List[str]:
-            if isinstance(raw, dict):
-                return [str(pid) for pid in raw.keys()]
-            if isinstance(raw, list):
-                return [str(pid) for pid in raw]
-            return []
-
-        def _player_details(raw) -> List[Dict]:
-            details = []
-            for pid in _extract_player_ids(raw):
-                details.append({
-                    "player_id": pid,
-                    "name": _player_name(pid),
-                    "position": _player_position(pid)
-                })
-            return details
-
-        def _created_ts(created_at, season: int):
-            if isinstance(created_at, datetime):
-                return int(created_at.timestamp() * 1000)
-            try:
-                return int(season) * 1000000
-            except Exception:
-                return 0
-
-        local_events = []
-        for c in contracts:
-            local_events.append({
-                "type": "contract",
-                "player_id": c.player_id,
-                "team_id": c.team_id,
-                "contract_id": c.id,
-                "contract_amount": c.contract_amount,
-                "contract_length": c.contract_length,
-                "season": c.season,
-                "created": _created_ts(c.created_at, c.season),
-                "label": f"Contract added: {_player_name(c.player_id)} ({c.contract_length}y)"
-            })
-        for a in amnesties:
-            contract = contracts_by_id.get(a.contract_id)
-            local_events.append({
-                "type": "amnesty",
-                "player_id": a.player_id,
-                "team_id": a.team_id,
-                "contract_id": a.contract_id,
-                "contract_amount": getattr(contract, "contract_amount", None),
-                "contract_length": getattr(contract, "contract_length", None),
-                "season": a.season,
-                "created": _created_ts(a.created_at, a.season),
-                "label": f"Amnesty used: {_player_name(a.player_id)}"
-            })
-        for r in rfas:
-            contract = contracts_by_id.get(r.contract_id)
-            local_events.append({
-                "type": "rfa",
-                "player_id": r.player_id,
-                "team_id": r.team_id,
-                "contract_id": r.contract_id,
-                "contract_amount": getattr(contract, "contract_amount", None),
-                "contract_length": r.contract_length,
-                "season": r.season,
-                "created": _created_ts(r.created_at, r.season),
-                "label": f"RFA tagged: {_player_name(r.player_id)} ({r.contract_length}y)"
-            })
-        for e in extensions:
-            contract = contracts_by_id.get(e.contract_id)
-            local_events.append({
-                "type": "extension",
-                "player_id": e.player_id,
-                "team_id": e.team_id,
-                "contract_id": e.contract_id,
-                "contract_amount": getattr(contract, "contract_amount", None),
-                "contract_length": e.contract_length,
-                "season": e.season,
-                "created": _created_ts(e.created_at, e.season),
-                "label": f"Extension added: {_player_name(e.player_id)} ({e.contract_length}y)"
-            })
-        for log in commissioner_logs:
-            action_label = str(log.action_type or "action").upper()
-            op_label = "Added" if (log.operation or "").lower() == "add" else "Removed"
-            length_suffix = ""
-            if log.contract_length:
-                length_suffix = f" ({log.contract_length}y)"
-            local_events.append({
-                "type": "commissioner",
-                "player_id": log.player_id,
-                "team_id": log.team_id,
-                "contract_amount": log.contract_amount,
-                "contract_length": log.contract_length,
-                "season": log.season,
-                "created": _created_ts(log.created_at, log.season or 0),
-                "label": f"Commissioner {op_label}: {action_label} for {_player_name(log.player_id)}{length_suffix}",
-            })
-
-        def _tx_sort_key(tx):
-            return tx.get('created') or tx.get('status_updated') or 0
-
-        combined = []
-        # Enrich transactions with player and team info
-        for tx in transactions:
-            if not isinstance(tx, dict):
-                continue
-            roster_id = tx.get('roster_id') or tx.get('team_id')
-            roster_ids = tx.get('roster_ids') if isinstance(tx.get('roster_ids'), list) else []
-            creator_id = tx.get('creator') or tx.get('creator_id')
-
-            tx_team_name = None
-            if roster_id is not None:
-                tx_team_name = team_name_map.get(str(roster_id))
-            if not tx_team_name and roster_ids:
-                tx_team_name = team_name_map.get(str(roster_ids[0]))
-            if not tx_team_name and creator_id:
-                tx_team_name = owner_name_map.get(str(creator_id))
-
-            resolved_team_id = roster_id if roster_id is not None else (roster_ids[0] if roster_ids else None)
-            combined.append({
-                "source": "transaction",
-                **tx,
-                "team_id": resolved_team_id,
-                "team_name": tx_team_name,
-                "adds_detail": _player_details(tx.get('adds')),
-                "drops_detail": _player_details(tx.get('drops')),
-            })
-        combined.extend([{"source": "local", **evt} for evt in local_events])
-
-        # Attach team name to local events if possible
-        for evt in combined:
-            if evt.get("source") == "local":
-                team_id = evt.get("team_id")
-                if team_id is not None and not evt.get("team_name"):
-                    evt["team_name"] = team_name_map.get(str(team_id))
-
-        combined_sorted = sorted(combined, key=_tx_sort_key, reverse=True)
-        sliced = combined_sorted[offset:offset + limit]
+            return jsonify({"status": "error", "message": "offset and limit must be numeric", "data": None}), 400
+        before = request.args.get('before')
+        try:
+            activity_store.parse_cursor(before)
+        except ValueError:
+            return jsonify({"status": "error", "message": "before must be a next_cursor value", "data": None}), 400
+
+        page_key = (str(league_id), before or "", offset if not before else 0, limit)
+        page = activity_page_cache.get(page_key)
+        if page is None:
+            league_chain_ids = get_league_chain_ids(league_id) or [int(league_id)]
+            total = activity_store.refresh(str(league_id), league_chain_ids)
+
+            # Keyset paging with ?before=<cursor>; ?offset= still works for older clients
+            items, next_cursor = activity_store.read_page(str(league_id), before, offset, limit)
+            page = {
+                "items": items,
+                "total": total,
+                "next_cursor": next_cursor
+            }
+            activity_page_cache.set(page_key, page, tags=chain_tags(league_chain_ids))
 
         return jsonify({
             "status": "success",
-            "data": {
-                "items": sliced,
-                "total": len(combined_sorted)
-            }
+            "data": page
         }), 200
     except Exception as e:
         logger.error(f"Error in get_league_activity: {str(e)}", exc_info=True)
@@ -689,19 +503,7 @@ def add_amnesty():
             }), 409
 
         # Find latest contract for player in chain
-        contracts = (
-            Contract.query.filter(Contract.player_id == player_id)
-            .filter(Contract.league_id.in_(league_chain_ids or [league_id]))
-            .order_by(Contract.id.desc())
-            .all()
-        )
-        contract_id = None
-        for c in contracts:
-            already_amnestied = AmnestyPlayer.query.filter_by(contract_id=c.id).first()
-            if already_amnestied:
-                continue
-            contract_id = c.id
-            break
+        contract_id = latest_contract_id(league_chain_ids or [league_id], player_id, skip="is_amnestied")
 
         if not contract_id:
             return jsonify({
@@ -718,14 +520,10 @@ def add_amnesty():
             season=current_season,
         )
         db.session.add(amnesty)
+        contract_state.sync_contracts([contract_id])
         db.session.commit()
 
-        try:
-            from .roster_service import RosterService
-            RosterService._response_cache.clear()
-            RosterService._response_cache_ts.clear()
-        except Exception:
-            pass
+        invalidate_league_caches(league_id)
 
         return jsonify({
             "status": "success",
@@ -793,19 +591,7 @@ def add_rfa():
                 "data": None
             }), 409
 
-        contracts = (
-            Contract.query.filter(Contract.player_id == player_id)
-            .filter(Contract.league_id.in_(league_chain_ids or [league_id]))
-            .order_by(Contract.id.desc())
-            .all()
-        )
-        contract_id = None
-        for c in contracts:
-            already_rfa = RfaPlayer.query.filter_by(contract_id=c.id).first()
-            if already_rfa:
-                continue
-            contract_id = c.id
-            break
+        contract_id = latest_contract_id(league_chain_ids or [league_id], player_id, skip="is_rfa")
 
         if not contract_id:
             return jsonify({
@@ -824,14 +610,10 @@ def add_rfa():
             season=current_season,
         )
         db.session.add(rfa)
+        contract_state.sync_contracts([contract_id])
         db.session.commit()
 
-        try:
-            from .roster_service import RosterService
-            RosterService._response_cache.clear()
-            RosterService._response_cache_ts.clear()
-        except Exception:
-            pass
+        invalidate_league_caches(league_id)
 
         return jsonify({
             "status": "success",
@@ -900,19 +682,7 @@ def add_extension():
                 "data": None
             }), 409
 
-        contracts = (
-            Contract.query.filter(Contract.player_id == player_id)
-            .filter(Contract.league_id.in_(league_chain_ids or [league_id]))
-            .order_by(Contract.id.desc())
-            .all()
-        )
-        contract_id = None
-        for c in contracts:
-            already_extended = ExtensionPlayer.query.filter_by(contract_id=c.id).first()
-            if already_extended:
-                continue
-            contract_id = c.id
-            break
+        contract_id = latest_contract_id(league_chain_ids or [league_id], player_id, skip="is_extended")
 
         if not contract_id:
             return jsonify({
@@ -931,14 +701,10 @@ def add_extension():
             season=current_season,
         )
         db.session.add(extension)
+        contract_state.sync_contracts([contract_id])
         db.session.commit()
 
-        try:
-            from .roster_service import RosterService
-            RosterService._response_cache.clear()
-            RosterService._response_cache_ts.clear()
-        except Exception:
-            pass
+        invalidate_league_caches(league_id)
 
         return jsonify({
             "status": "success",
@@ -986,8 +752,8 @@ def commissioner_add_action():
         action_type = str(action_type).lower()
 
         # Ensure player is currently on the team
-        _, roster_player = _get_team_player_from_rosters(league_id, team_id, player_id)
-        if roster_player is None:
+        roster_amount = _roster_player_amount(league_id, team_id, player_id)
+        if roster_amount is None:
             return jsonify({
                 "status": "error",
                 "message": "Player is not currently on this team",
@@ -1011,7 +777,13 @@ def commissioner_add_action():
                     "data": None
                 }), 400
             contract_length = int(contract_length)
-            contract_amount = int(roster_player.get("amount") or 0)
+            _, contract_amount = current_salary(league_id, player_id)
+            if contract_amount is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "Salaries for this league are still being computed; retry shortly",
+                    "data": None
+                }), 503
             new_contract = Contract(
                 league_id=league_id,
                 player_id=player_id,
@@ -1021,7 +793,7 @@ def commissioner_add_action():
                 season=current_season
             )
             db.session.add(new_contract)
-            db.session.commit()
+            db.session.flush()
             log_entry = CommissionerActionLog(
                 league_id=league_id,
                 team_id=team_id,
@@ -1032,7 +804,7 @@ def commissioner_add_action():
                 contract_amount=contract_amount,
                 season=current_season,
             )
-            db.session.add(log_entry)
+            contract_state.record_commissioner_action(log_entry, new_contract.id)
             db.session.commit()
             result = {
                 "id": new_contract.id,
@@ -1076,7 +848,6 @@ def commissioner_add_action():
                 season=current_season
             )
             db.session.add(rfa)
-            db.session.commit()
             log_entry = CommissionerActionLog(
                 league_id=league_id,
                 team_id=team_id,
@@ -1086,7 +857,7 @@ def commissioner_add_action():
                 contract_length=rfa_length,
                 season=current_season,
             )
-            db.session.add(log_entry)
+            contract_state.record_commissioner_action(log_entry, contract_id)
             db.session.commit()
             result = {
                 "league_id": league_id,
@@ -1126,7 +897,6 @@ def commissioner_add_action():
                 season=current_season
             )
             db.session.add(amnesty)
-            db.session.commit()
             log_entry = CommissionerActionLog(
                 league_id=league_id,
                 team_id=team_id,
@@ -1135,7 +905,7 @@ def commissioner_add_action():
                 operation="add",
                 season=current_season,
             )
-            db.session.add(log_entry)
+            contract_state.record_commissioner_action(log_entry, contract_id)
             db.session.commit()
             result = {
                 "league_id": league_id,
@@ -1176,7 +946,6 @@ def commissioner_add_action():
                 season=current_season
             )
             db.session.add(extension)
-            db.session.commit()
             log_entry = CommissionerActionLog(
                 league_id=league_id,
                 team_id=team_id,
@@ -1186,7 +955,7 @@ def commissioner_add_action():
                 contract_length=extension_length,
                 season=current_season,
             )
-            db.session.add(log_entry)
+            contract_state.record_commissioner_action(log_entry, contract_id)
             db.session.commit()
             result = {
                 "league_id": league_id,
@@ -1201,12 +970,7 @@ def commissioner_add_action():
                 "data": None
             }), 400
 
-        try:
-            from .roster_service import RosterService
-            RosterService._response_cache.clear()
-            RosterService._response_cache_ts.clear()
-        except Exception:
-            pass
+        invalidate_league_caches(league_id)
 
         return jsonify({"status": "success", "data": result}), 201
     except Exception as e:
@@ -1242,8 +1006,8 @@ def commissioner_remove_action():
         player_id = int(player_id)
         action_type = str(action_type).lower()
 
-        _, roster_player = _get_team_player_from_rosters(league_id, team_id, player_id)
-        if roster_player is None:
+        roster_amount = _roster_player_amount(league_id, team_id, player_id)
+        if roster_amount is None:
             return jsonify({
                 "status": "error",
                 "message": "Player is not currently on this team",
@@ -1257,6 +1021,7 @@ def commissioner_remove_action():
         removed = False
         removed_length = None
         removed_amount = None
+        affected_contract_id = None
         nfl_state = sleeper_service.get_current_nfl_state() or {}
         current_season = int(nfl_state.get("league_season", 2026))
         if action_type == "contract":
@@ -1270,6 +1035,7 @@ def commissioner_remove_action():
             if contract:
                 removed_length = contract.contract_length
                 removed_amount = contract.contract_amount
+                affected_contract_id = contract.id
                 # Remove dependent rows first to avoid NULL FK updates
                 ExtensionPlayer.query.filter_by(contract_id=contract.id).delete(synchronize_session=False)
                 AmnestyPlayer.query.filter_by(contract_id=contract.id).delete(synchronize_session=False)
@@ -1285,6 +1051,7 @@ def commissioner_remove_action():
                 .first()
             )
             if record:
+                affected_contract_id = record.contract_id
                 removed_length = record.contract_length
                 db.session.delete(record)
                 removed = True
@@ -1297,6 +1064,7 @@ def commissioner_remove_action():
                 .first()
             )
             if record:
+                affected_contract_id = record.contract_id
                 db.session.delete(record)
                 removed = True
         elif action_type == "extension":
@@ -1308,6 +1076,7 @@ def commissioner_remove_action():
                 .first()
             )
             if record:
+                affected_contract_id = record.contract_id
                 removed_length = record.contract_length
                 db.session.delete(record)
                 removed = True
@@ -1325,8 +1094,6 @@ def commissioner_remove_action():
                 "data": None
             }), 404
 
-        db.session.commit()
-
         log_entry = CommissionerActionLog(
             league_id=league_id,
             team_id=team_id,
@@ -1337,15 +1104,10 @@ def commissioner_remove_action():
             contract_amount=removed_amount,
             season=current_season,
         )
-        db.session.add(log_entry)
+        contract_state.record_commissioner_action(log_entry, affected_contract_id)
         db.session.commit()
 
-        try:
-            from .roster_service import RosterService
-            RosterService._response_cache.clear()
-            RosterService._response_cache_ts.clear()
-        except Exception:
-            pass
+        invalidate_league_caches(league_id)
 
         return jsonify({"status": "success", "data": {"removed": True}}), 200
     except Exception as e:
@@ -1370,41 +1132,30 @@ def get_player_image(player_id: str):
         except Exception:
             return jsonify({"status": "error", "message": "player_id must be numeric", "data": None}), 400
 
-        cached = PlayerImage.query.filter_by(player_id=player_id_int).first()
-        if cached and cached.image_base64:
-            try:
-                image_bytes = base64.b64decode(cached.image_base64)
-                return Response(image_bytes, mimetype=cached.content_type or "image/jpeg")
-            except Exception as e:
-                logger.warning(f"Failed to decode cached image for {player_id}: {e}")
-
-        # Fallback to Sleeper CDN, then store in DB
-        cdn_url = f"https://sleepercdn.com/content/nfl/players/{player_id}.jpg"
-        resp = requests.get(cdn_url, timeout=10)
-        if resp.status_code != 200 or not resp.content:
-            return jsonify({"status": "error", "message": "Image not found", "data": None}), 404
-
-        content_type = (resp.headers.get("Content-Type") or "image/jpeg").split(";")[0].strip()
-        encoded = base64.b64encode(resp.content).decode("ascii")
-
-        try:
-            if cached:
-                cached.image_base64 = encoded
-                cached.content_type = content_type
-                cached.updated_at = db.func.now()
-                db.session.add(cached)
-            else:
-                db.session.add(PlayerImage(
-                    player_id=player_id_int,
-                    image_base64=encoded,
-                    content_type=content_type
-                ))
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            logger.warning(f"Failed to store image for {player_id}: {e}")
-
-        return Response(resp.content, mimetype=content_type)
+        meta = player_images.load_meta(player_id_int)
+        data = None
+        if meta is not None and not player_images.not_modified(request, meta):
+            data = player_images.load_data(player_id_int)
+            if data is None:
+                meta = None  # blob deleted since the metadata read: serve it like a miss
+        if meta is None:
+            if player_images.is_known_missing(player_id_int):
+                return jsonify({"status": "error", "message": "Image not found", "data": None}), 404
+            # Don't hold the worker on the CDN: send the client there and store a copy for next time
+            player_images.fetch_in_background(current_app._get_current_object(), player_id_int)
+            response = redirect(player_images.cdn_url(player_id_int), code=302)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+
+        if data is None:
+            response = Response(status=304)
+        else:
+            response = Response(data, mimetype=meta.content_type or "image/jpeg")
+        response.set_etag(meta.etag)
+        response.last_modified = player_images.last_modified(meta)
+        response.cache_control.public = True
+        response.cache_control.max_age = player_images.MAX_AGE_SECONDS
+        return response
     except Exception as e:
         logger.error(f"Error fetching player image {player_id}: {str(e)}", exc_info=True)
         return jsonify({"status": "error", "message": str(e), "data": None}), 500
@@ -1479,12 +1230,7 @@ def update_league_info(league_id: str):
 
         db.session.commit()
 
-        try:
-            from .roster_service import RosterService
-            RosterService._response_cache.clear()
-            RosterService._response_cache_ts.clear()
-        except Exception:
-            pass
+        invalidate_league_caches(base_league_id)
 
         return jsonify({
             "status": "success",
@@ -1514,24 +1260,20 @@ def get_all_contracts(league_id: str):
         nfl_state = sleeper_service.get_current_nfl_state()
         current_season = int(nfl_state.get('league_season', 2026))
         logger.info(f"Current NFL season: {current_season}")
+
+        listing_key = (str(league_id), current_season)
+        cached_listing = contract_listing_cache.get(listing_key)
+        if cached_listing is not None:
+            return jsonify({"status": "success", **cached_listing}), 200
         
         # Step 2: Get all contracts across the entire league chain (historical + current)
         all_contracts = get_all_contracts_in_chain(int(league_id), current_season)
         logger.info(f"Found {len(all_contracts)} total contracts across league chain")
         
-        # Step 3: Get amnestied + RFA players to mark contracts as invalid/include
-        amnestied = get_all_amnestied_players_in_chain(int(league_id))
-        amnestied_contract_ids = {a['contract_id'] for a in amnestied}
-        logger.info(f"Found {len(amnestied_contract_ids)} amnestied contracts")
-
+        # Step 3: Amnesty / RFA / extension flags come with the contracts
         league_chain_ids = get_league_chain_ids(int(league_id))
         if not league_chain_ids:
             league_chain_ids = [int(league_id)]
-        rfas = RfaPlayer.query.filter(RfaPlayer.league_id.in_(league_chain_ids)).all()
-        logger.info(f"Found {len(rfas)} RFA records")
-
-        extensions = ExtensionPlayer.query.filter(ExtensionPlayer.league_id.in_(league_chain_ids)).all()
-        logger.info(f"Found {len(extensions)} extension records")
         
         # Step 4: Fetch current rosters from Sleeper API (use current league in chain)
         current_league_id = league_chain_ids[0] if league_chain_ids else int(league_id)
@@ -1565,6 +1307,9 @@ def get_all_contracts(league_id: str):
         try:
             from .roster_service import RosterService
             sleeper_players_map = RosterService.build_players_map(str(league_id), player_ids=list(player_ids))
+            sleeper_players_map.update(RosterService.resolve_missing_players(
+                pid for pid in player_ids if pid not in players_db_map and pid not in sleeper_players_map
+            ))
         except Exception:
             sleeper_players_map = {}
         logger.info(f"Found {len(players_db_map)} players in local database")
@@ -1573,15 +1318,11 @@ def get_all_contracts(league_id: str):
         drafts = sleeper_service.get_drafts(current_league_id)
         draft_picks_data = {}
         if drafts and isinstance(drafts, list):
-            for draft in drafts:
-                draft_id = draft.get('draft_id')
-                if draft_id:
-                    draft_picks_data[draft_id] = sleeper_service.get_draft_picks(draft_id)
+            draft_picks_data = sleeper_service.get_draft_picks_bulk(
+                [draft.get('draft_id') for draft in drafts]
+            )
 
-        transactions = []
-        for round_num in range(18):
-            tx = sleeper_service.get_transactions(current_league_id, round_num) or []
-            transactions.extend(tx)
+        transactions = sleeper_service.get_all_transactions(current_league_id, 18)
 
         player_cost_map = {}
         try:
@@ -1589,7 +1330,8 @@ def get_all_contracts(league_id: str):
             player_cost_map = RosterService.build_cost_map(
                 draft_picks_data,
                 transactions,
-                cache_key=f"{league_id}-{current_season}"
+                cache_key=f"{league_id}-{current_season}",
+                cache_tags=chain_tags(league_chain_ids)
             )
         except Exception as e:
             logger.warning(f"Failed to build cost map: {str(e)}")
@@ -1598,15 +1340,13 @@ def get_all_contracts(league_id: str):
         
         # Step 7: Build response with contract status
         data = []
-        contract_ids = [c['id'] for c in all_contracts]
-        contracts_db = Contract.query.filter(Contract.id.in_(contract_ids)).all() if contract_ids else []
+        # Only contracts missing contract_amount are loaded for the backfill
+        backfill_ids = [
+            c['id'] for c in all_contracts
+            if c.get('contract_amount') is None and player_cost_map.get(str(c['player_id']))
+        ]
+        contracts_db = Contract.query.filter(Contract.id.in_(backfill_ids)).all() if backfill_ids else []
         contracts_db_map = {c.id: c for c in contracts_db}
-        extension_years_map = {}
-        for ext in extensions:
-            if ext.contract_id is None:
-                continue
-            extension_years_map[ext.contract_id] = extension_years_map.get(ext.contract_id, 0) + int(ext.contract_length or 0)
-        rfa_contract_ids = {r.contract_id for r in rfas if r.contract_id is not None}
         
         active_count = 0
         expired_count = 0
@@ -1630,21 +1370,12 @@ def get_all_contracts(league_id: str):
                     last_name = sleeper_player.last_name or 'Unknown'
                     position = sleeper_player.position or 'N/A'
                 else:
-                    try:
-                        sleeper_player = RosterService._fetch_player_from_sleeper(player_id)
-                    except Exception:
-                        sleeper_player = None
-                    if sleeper_player:
-                        first_name = sleeper_player.first_name or 'Unknown'
-                        last_name = sleeper_player.last_name or 'Unknown'
-                        position = sleeper_player.position or 'N/A'
-                    else:
-                        first_name = 'Unknown'
-                        last_name = f'(ID: {player_id})'
-                        position = 'N/A'
+                    first_name = 'Unknown'
+                    last_name = f'(ID: {player_id})'
+                    position = 'N/A'
             
             # Determine contract status
-            if contract_id in amnestied_contract_ids:
+            if contract['is_amnestied']:
                 status = 'EXPIRED'
                 is_active = False
                 amnestied_count += 1
@@ -1669,7 +1400,7 @@ def get_all_contracts(league_id: str):
                 contract_db.contract_amount = int(amount)
                 contract_amount_updates += 1
             
-            extended_years = extension_years_map.get(contract_id, 0)
+            extended_years = contract.get('extension_years', 0)
             adjusted_end_season = contract['contract_end_season']
             if adjusted_end_season is not None and extended_years:
                 adjusted_end_season = int(adjusted_end_season) + int(extended_years)
@@ -1689,10 +1420,10 @@ def get_all_contracts(league_id: str):
                 'extension_years': extended_years,
                 'is_extended': True if extended_years else False,
                 'amount': amount,
-                'contract_amount': getattr(contracts_db_map.get(contract_id), "contract_amount", None),
+                'contract_amount': getattr(contract_db, "contract_amount", None) if contract_db else contract.get('contract_amount'),
                 'status': status,
-                'is_amnestied': True if contract_id in amnestied_contract_ids else False,
-                'is_rfa': True if contract_id in rfa_contract_ids else False,
+                'is_amnestied': bool(contract['is_amnestied']),
+                'is_rfa': bool(contract.get('is_rfa')),
                 'is_active': is_active,
                 'on_current_roster': on_current_roster,
                 'years_remaining': max(0, (adjusted_end_season or 0) - current_season + 1) if not contract['is_expired'] else 0
@@ -1700,6 +1431,7 @@ def get_all_contracts(league_id: str):
 
         if contract_amount_updates:
             try:
+                contract_state.sync_contracts(contracts_db_map.keys())
                 db.session.commit()
                 logger.info(f"Backfilled contract_amount for {contract_amount_updates} contracts")
             except Exception:
@@ -1707,9 +1439,8 @@ def get_all_contracts(league_id: str):
 
         logger.info(f"Contract summary: {active_count} active, {expired_count} expired, {amnestied_count} amnestied")
         logger.info(f"Returning {len(data)} total contracts")
-        
-        return jsonify({
-            "status": "success",
+
+        listing = {
             "data": data,
             "summary": {
                 "total": len(data),
@@ -1718,7 +1449,9 @@ def get_all_contracts(league_id: str):
                 "amnestied": amnestied_count,
                 "current_season": current_season
             }
-        }), 200
+        }
+        contract_listing_cache.set(listing_key, listing, tags=chain_tags(league_chain_ids))
+        return jsonify({"status": "success", **listing}), 200
     
     except Exception as e:
         logger.error(f"Error fetching all contracts: {str(e)}", exc_info=True)
@@ -1728,6 +1461,24 @@ def get_all_contracts(league_id: str):
             "data": None
         }), 500
 
+@api.route('/debug/sleeper-stats', methods=['GET'])
+@cross_origin()
+def debug_sleeper_stats():
+    """Upstream Sleeper connection pool stats for this worker process"""
+    return jsonify({
+        "status": "success",
+        "data": {
+            "pid": os.getpid(),
+            "http": sleeper_service.get_http_stats(),
+            "single_flight": sleeper_service.get_coalescing_stats(),
+            "stale_while_revalidate": sleeper_service.get_swr_stats(),
+            "rate_limit": sleeper_service.get_rate_limit_stats(),
+            "cache_warmer": cache_warmer.stats(),
+            "player_registry": get_player_registry().stats(),
+            "allowance_writer": allowance_writer.stats(),
+        }
+    }), 200
+
 @api.route('/debug/rosters/<league_id>/<username>', methods=['GET'])
 @cross_origin()
 def debug_rosters(league_id: str, username: str):
@@ -1783,10 +1534,9 @@ def debug_rosters(league_id: str, username: str):
         # Get draft picks
         draft_picks_data = {}
         if drafts and isinstance(drafts, list):
-            for draft in drafts:
-                draft_id = draft.get('draft_id')
-                if draft_id:
-                    draft_picks_data[draft_id] = sleeper_service.get_draft_picks(draft_id)
+            draft_picks_data = sleeper_service.get_draft_picks_bulk(
+                [draft.get('draft_id') for draft in drafts]
+            )
         
         # Build comparison data
         comparison = {
@@ -1804,21 +1554,21 @@ def debug_rosters(league_id: str, username: str):
         # Now test player lookup
         if raw_user_roster:
             test_players = raw_user_roster.get('players', [])[:10]
+            from .roster_service import RosterService
+            resolved_players = RosterService.resolve_missing_players(
+                str(pid) for pid in test_players if str(pid) not in all_players_response
+            )
             for player_id in test_players:
                 player_id_str = str(player_id)
                 player_data = all_players_response.get(player_id_str) if isinstance(all_players_response, dict) else None
                 if not player_data:
-                    try:
-                        from .roster_service import RosterService
-                        sleeper_player = RosterService._fetch_player_from_sleeper(player_id_str)
-                        if sleeper_player:
-                            player_data = {
-                                "first_name": sleeper_player.first_name,
-                                "last_name": sleeper_player.last_name,
-                                "position": sleeper_player.position
-                            }
-                    except Exception:
-                        player_data = None
+                    sleeper_player = resolved_players.get(player_id_str)
+                    if sleeper_player:
+                        player_data = {
+                            "first_name": sleeper_player.first_name,
+                            "last_name": sleeper_player.last_name,
+                            "position": sleeper_player.position
+                        }
                 comparison["player_lookups"].append({
                     "player_id": player_id_str,
                     "found_in_all_players": player_data is not None,
@@ -1890,10 +1640,9 @@ def debug_full_flow(league_id: str, username: str):
         drafts = sleeper_service.get_drafts(league_id)
         draft_picks_data = {}
         if drafts and isinstance(drafts, list):
-            for draft in drafts:
-                draft_id = draft.get('draft_id')
-                if draft_id:
-                    draft_picks_data[draft_id] = sleeper_service.get_draft_picks(draft_id)
+            draft_picks_data = sleeper_service.get_draft_picks_bulk(
+                [draft.get('draft_id') for draft in drafts]
+            )
         
         nfl_state = sleeper_service.get_current_nfl_state()
         current_season = int(nfl_state.get('league_season', 2026))
@@ -1981,10 +1730,9 @@ def debug_compare(league_id: str, username: str):
         drafts = sleeper_service.get_drafts(league_id)
         draft_picks_data = {}
         if drafts and isinstance(drafts, list):
-            for draft in drafts:
-                draft_id = draft.get('draft_id')
-                if draft_id:
-                    draft_picks_data[draft_id] = sleeper_service.get_draft_picks(draft_id)
+            draft_picks_data = sleeper_service.get_draft_picks_bulk(
+                [draft.get('draft_id') for draft in drafts]
+            )
         
         nfl_state = sleeper_service.get_current_nfl_state()
         current_season = int(nfl_state.get('league_season', 2026))
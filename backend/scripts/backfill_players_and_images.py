@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 import argparse
-import base64
 import time
 from typing import Dict, Any
 
@@ -8,7 +7,8 @@ import requests
 
 from backend.app import create_app
 from backend.extensions import db
-from backend.models import LocalPlayer, PlayerImage
+from backend.models import LocalPlayer, PlayerImage, PlayerImageBlob
+from backend.player_images import cdn_url, store
 from backend.sleeper_service import sleeper_service
 
 
@@ -72,7 +72,9 @@ def backfill_images(
     start: int = 0,
     batch_size: int = 50
 ) -> int:
-    existing_ids = {pid for (pid,) in db.session.query(PlayerImage.player_id).all()}
+    # Legacy base64 rows count as present; they move to player_image_blob when first served
+    existing_ids = {pid for (pid,) in db.session.query(PlayerImageBlob.player_id).all()}
+    existing_ids.update(pid for (pid,) in db.session.query(PlayerImage.player_id).all())
     stored = 0
     pending = 0
     processed = 0
@@ -86,9 +88,8 @@ def backfill_images(
         if pid in existing_ids:
             continue
 
-        url = f"https://sleepercdn.com/content/nfl/players/{pid}.jpg"
         try:
-            resp = requests.get(url, timeout=10)
+            resp = requests.get(cdn_url(pid), timeout=10)
         except Exception:
             continue
 
@@ -96,14 +97,9 @@ def backfill_images(
             continue
 
         content_type = (resp.headers.get("Content-Type") or "image/jpeg").split(";")[0].strip()
-        encoded = base64.b64encode(resp.content).decode("ascii")
 
         if not dry_run:
-            db.session.add(PlayerImage(
-                player_id=int(pid),
-                image_base64=encoded,
-                content_type=content_type
-            ))
+            store(int(pid), resp.content, content_type)
         stored += 1
         pending += 1
 
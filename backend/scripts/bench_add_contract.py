@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""Benchmark the lookups behind POST /contracts.
+
+"legacy" replays add_contract as it was before the contract-write
+service: the chain's contracts with one amnesty query per contract, the
+chain's amnesty rows, then drafts, each draft's picks and 18 transaction
+rounds fetched one call at a time, priced by the old drafts-then-
+transactions cost map (kept in process for 10 minutes, as before).
+"current" is the active contract check on contract_state plus the
+roster index. Sleeper calls go through today's sleeper_service on both
+paths, so only the add_contract lookups differ. No contracts are
+written; each run reports p50/p99 latency and SQL statements per call
+for a sample of rostered players.
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.contract_writes import current_salary, has_active_contract
+from backend.data_schemas import validate_draft_pick
+from backend.extensions import db
+from backend.models import AmnestyPlayer, Contract
+from backend.sleeper_service import sleeper_service
+from backend.utils import get_league_chain_ids
+
+LEGACY_COST_MAP_TTL = 60 * 10
+_legacy_cost_maps: Dict[str, Tuple[float, Dict[str, int]]] = {}
+
+
+def _legacy_tx_amount(settings: Dict) -> int:
+    if not isinstance(settings, dict):
+        return 0
+    for key in ('waiver_bid', 'faab_bid', 'bid', 'price', 'amount'):
+        try:
+            value = int(settings.get(key))
+        except Exception:
+            continue
+        if value > 0:
+            return value
+    return 0
+
+
+def _legacy_cost_map(draft_picks_data: Dict, transactions: List[Dict], cache_key: str) -> Dict[str, int]:
+    """The old RosterService.build_cost_map: draft amounts first, then the newest transaction bids"""
+    now = time.time()
+    cached = _legacy_cost_maps.get(cache_key)
+    if cached is not None and now - cached[0] < LEGACY_COST_MAP_TTL:
+        return cached[1]
+    cost_map: Dict[str, int] = {}
+    for picks in draft_picks_data.values():
+        for pick in picks if isinstance(picks, list) else []:
+            pick = validate_draft_pick(pick)
+            amount = int(pick.get('metadata', {}).get('amount', 0))
+            if pick.get('player_id') and amount:
+                cost_map.setdefault(str(pick['player_id']), amount)
+
+    def _tx_sort_key(tx):
+        try:
+            return int(tx.get('created') or tx.get('status_updated') or 0)
+        except Exception:
+            return 0
+
+    for tx in sorted((tx for tx in transactions if isinstance(tx, dict)), key=_tx_sort_key, reverse=True):
+        amount = _legacy_tx_amount(tx.get('settings', {}))
+        adds = tx.get('adds')
+        player_ids = list(adds.keys()) if isinstance(adds, dict) else adds if isinstance(adds, list) else []
+        for pid in player_ids if amount else []:
+            cost_map.setdefault(str(pid), amount)
+    _legacy_cost_maps[cache_key] = (now, cost_map)
+    return cost_map
+
+
+def legacy_lookup(league_id: int, player_id: int, current_season: int) -> Dict:
+    # get_all_contracts_in_chain and get_all_amnestied_players_in_chain, one chain lookup each
+    contracts = [
+        {
+            "id": c.id,
+            "player_id": c.player_id,
+            "is_amnestied": bool(AmnestyPlayer.query.filter_by(contract_id=c.id).all()),
+            "is_expired": current_season > c.season + c.contract_length - 1,
+        }
+        for c in Contract.query.filter(Contract.league_id.in_(get_league_chain_ids(league_id))).all()
+    ]
+    amnestied_contract_ids = {
+        a.contract_id
+        for a in AmnestyPlayer.query.filter(AmnestyPlayer.league_id.in_(get_league_chain_ids(league_id))).all()
+    }
+    active = any(
+        int(c["player_id"]) == player_id and c["id"] not in amnestied_contract_ids and not c["is_expired"]
+        for c in contracts
+    )
+
+    league_chain_ids = get_league_chain_ids(league_id)
+    current_league_id = league_chain_ids[0] if league_chain_ids else league_id
+    team_id = None
+    for roster in sleeper_service.get_rosters(current_league_id) or []:
+        if str(player_id) in [str(pid) for pid in roster.get('players', [])]:
+            team_id = roster.get('roster_id')
+            break
+    draft_picks_data = {}
+    for draft in sleeper_service.get_drafts(current_league_id) or []:
+        if draft.get('draft_id'):
+            draft_picks_data[draft['draft_id']] = sleeper_service.get_draft_picks(draft['draft_id'])
+    transactions = []
+    for round_num in range(18):
+        transactions.extend(sleeper_service.get_transactions(current_league_id, round_num) or [])
+    cost_map = _legacy_cost_map(
+        draft_picks_data,
+        transactions,
+        cache_key=f"{current_league_id}:{','.join(str(x) for x in league_chain_ids)}",
+    )
+    return {"active": active, "team_id": team_id, "amount": int(cost_map.get(str(player_id), 0))}
+
+
+def current_lookup(league_id: int, player_id: int, current_season: int) -> Dict:
+    league_chain_ids = get_league_chain_ids(league_id) or [league_id]
+    active = has_active_contract(league_chain_ids, player_id, current_season)
+    team_id, amount = current_salary(league_chain_ids[0], player_id)
+    return {"active": active, "team_id": team_id, "amount": int(amount or 0)}
+
+
+def bench(label: str, fn: Callable, league_id: int, player_ids: List[int], current_season: int, repeat: int) -> Dict:
+    statements = [0]
+
+    def _count(*_args):
+        statements[0] += 1
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    samples = []
+    try:
+        for i in range(repeat):
+            player_id = player_ids[i % len(player_ids)]
+            start = time.perf_counter()
+            fn(league_id, player_id, current_season)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    percentiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return {
+        "label": label,
+        "p50_ms": statistics.median(samples),
+        "p99_ms": percentiles[98],
+        "statements": statements[0] / max(1, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark add_contract lookups (legacy vs contract-write service).")
+    parser.add_argument("--league", type=int, required=True, help="Any league ID in the chain.")
+    parser.add_argument("--players", type=int, default=50, help="Rostered players to cycle through.")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per implementation.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        nfl_state = sleeper_service.get_current_nfl_state() or {}
+        current_season = int(nfl_state.get('league_season', 2026))
+        league_chain_ids = get_league_chain_ids(args.league) or [args.league]
+        player_ids = [
+            int(pid)
+            for roster in sleeper_service.get_rosters(league_chain_ids[0]) or []
+            for pid in roster.get('players', []) or []
+            if str(pid).isdigit()
+        ][:args.players]
+        if not player_ids:
+            parser.error(f"No rostered players found for league {args.league}")
+
+        # Also warms both paths; legacy priced the chain from the current league's
+        # drafts only, so its amounts can differ for players drafted in older seasons
+        mismatches = [
+            pid for pid in player_ids
+            if current_lookup(args.league, pid, current_season) != legacy_lookup(args.league, pid, current_season)
+        ]
+        results = [
+            bench("legacy", legacy_lookup, args.league, player_ids, current_season, args.repeat),
+            bench("current", current_lookup, args.league, player_ids, current_season, args.repeat),
+        ]
+
+    print(f"{'path':<10}{'p50 ms':>10}{'p99 ms':>10}{'SQL/call':>10}")
+    for row in results:
+        print(f"{row['label']:<10}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['statements']:>10.1f}")
+    if mismatches:
+        print(f"{len(mismatches)} players differ between paths: {mismatches[:10]}")
+
+
+if __name__ == "__main__":
+    main()
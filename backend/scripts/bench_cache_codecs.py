@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Compare cache payload codecs on real Sleeper payloads.
+
+Reports stored bytes and encode/decode time per codec for each fixture:
+backend/players.json, any --fixture JSON files, and (with --db) the cached
+rows already sitting in a SQLite database's sleeper_* tables.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from backend.codec import CODECS, decode_payload
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_TABLES = {
+    "sleeper_api_cache": "response_json",
+    "sleeper_league": "data_json",
+    "sleeper_rosters": "data_json",
+    "sleeper_users": "data_json",
+    "sleeper_drafts": "data_json",
+    "sleeper_draft_picks": "data_json",
+    "sleeper_transactions": "data_json",
+}
+
+
+def _load_fixtures(paths: List[str], db_path: str | None, max_rows: int) -> List[Tuple[str, Any]]:
+    fixtures = []
+    for path in paths:
+        with open(path, "r") as f:
+            fixtures.append((os.path.basename(path), json.load(f)))
+
+    if db_path:
+        conn = sqlite3.connect(db_path)
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        for table, column in CACHE_TABLES.items():
+            if table not in existing:
+                continue
+            rows = conn.execute(f"SELECT {column} FROM {table} LIMIT ?", (max_rows,)).fetchall()
+            if rows:
+                fixtures.append((f"{table} ({len(rows)} rows)", [decode_payload(r[0]) for r in rows]))
+        conn.close()
+    return fixtures
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(fixtures: List[Tuple[str, Any]], repeat: int) -> List[Dict]:
+    results = []
+    for label, payload in fixtures:
+        # Table rows are benchmarked one row per encode/decode like the cache does
+        items = payload if label.startswith("sleeper_") else [payload]
+        baseline = None
+        for name, codec in CODECS.items():
+            encoded = [codec.encode(item) for item in items]
+            stored = sum(len(e.encode("utf-8")) for e in encoded)
+            if baseline is None:
+                baseline = stored
+            results.append({
+                "fixture": label,
+                "codec": name,
+                "bytes": stored,
+                "ratio": baseline / stored if stored else 0.0,
+                "encode_ms": _time_ms(lambda: [codec.encode(item) for item in items], repeat),
+                "decode_ms": _time_ms(lambda: [decode_payload(e) for e in encoded], repeat),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Sleeper cache payload codecs.")
+    parser.add_argument("--fixture", action="append", default=[], help="Extra JSON fixture file (repeatable).")
+    parser.add_argument("--db", default=None, help="SQLite database with cached sleeper_* rows.")
+    parser.add_argument("--max-rows", type=int, default=200, help="Rows to sample per cache table.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (median is reported).")
+    args = parser.parse_args()
+
+    paths = [os.path.join(BACKEND_DIR, "players.json")] + args.fixture
+    fixtures = _load_fixtures(paths, args.db, args.max_rows)
+
+    print(f"{'fixture':<36} {'codec':<6} {'bytes':>12} {'ratio':>7} {'encode ms':>10} {'decode ms':>10}")
+    for row in bench(fixtures, args.repeat):
+        print(
+            f"{row['fixture']:<36} {row['codec']:<6} {row['bytes']:>12,} "
+            f"{row['ratio']:>6.1f}x {row['encode_ms']:>10.2f} {row['decode_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
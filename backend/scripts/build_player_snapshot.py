@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Build the binary player snapshot that workers memory-map.
+
+Reads local_players by default, or a players.json-style file (a list of
+player dicts or a player_id -> player dict mapping) with --json. Rerun
+after backfilling players; running workers see the file's new mtime and
+reload it within PLAYER_REGISTRY_REFRESH seconds, no restart needed.
+"""
+import argparse
+import json
+import time
+
+from backend.player_registry import SNAPSHOT_PATH, PlayerRegistry, write_snapshot
+
+
+def _rows_from_json(path: str):
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [{"player_id": pid, **(p or {})} for pid, p in data.items() if isinstance(p, dict)]
+    for player in data:
+        if isinstance(player, dict):
+            yield (player.get("player_id"), player.get("first_name"), player.get("last_name"), player.get("position"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mappable player snapshot.")
+    parser.add_argument("--json", default=None, help="Build from a players JSON file instead of local_players.")
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="Snapshot path (PLAYER_SNAPSHOT_PATH).")
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.json:
+        size = write_snapshot(_rows_from_json(args.json), args.output)
+    else:
+        from backend.app import create_app
+        from backend.player_registry import _local_player_rows
+
+        app = create_app()
+        with app.app_context():
+            size = write_snapshot(_local_player_rows(), args.output)
+
+    registry = PlayerRegistry.load(args.output)
+    players = registry.stats()["players"] if registry else 0
+    print(f"Wrote {players} players ({size} bytes) to {args.output} in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
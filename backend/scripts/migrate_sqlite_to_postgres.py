@@ -42,6 +42,7 @@ def main():
         "extension_team",
         "commissioner_action_log",
         "player_images",
+        "player_image_blob",
         "sleeper_api_cache",
         "sleeper_league",
         "sleeper_rosters",
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Rebuild and/or verify the materialized contract_state projection.
+
+--verify compares the projection with a full recompute from contract,
+amnesty_player, rfa_players and extension_players and exits non-zero on
+any difference. Run a rebuild after importing contracts outside the API
+(scripts/contracts.py, scripts/am.py).
+"""
+import argparse
+import json
+import sys
+
+from backend.app import create_app
+from backend.contract_state import rebuild, verify
+from backend.utils import get_league_chain_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the contract_state projection.")
+    parser.add_argument("--league", type=int, action="append", default=None,
+                        help="Limit to the chain of this league ID (repeatable). Default: all leagues.")
+    parser.add_argument("--verify", action="store_true", help="Only compare the projection with a full recompute.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        league_ids = None
+        if args.league:
+            league_ids = sorted({lid for league in args.league for lid in (get_league_chain_ids(league) or [league])})
+
+        if not args.verify:
+            written = rebuild(league_ids)
+            print(f"Rebuilt contract_state: {written} contracts")
+
+        diffs = verify(league_ids)
+        if diffs:
+            print(f"contract_state differs from a full recompute for {len(diffs)} contracts:")
+            for diff in diffs[:50]:
+                print(json.dumps(diff, default=str))
+            sys.exit(1)
+        print("contract_state matches a full recompute")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Warm Sleeper caches for recently active league chains.
+
+Run as a standalone worker next to the web processes (one instance per
+deployment), or with --once from cron.
+"""
+import argparse
+import logging
+
+from backend.app import create_app
+from backend.cache_warmer import CacheWarmer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh Sleeper caches for active league chains.")
+    parser.add_argument("--once", action="store_true", help="Run a single warm pass and exit.")
+    parser.add_argument("--interval", type=int, default=None, help="Seconds between passes (CACHE_WARMER_INTERVAL).")
+    parser.add_argument("--active-hours", type=float, default=None, help="Chains updated within this window are warmed.")
+    parser.add_argument("--concurrency", type=int, default=None, help="Chains warmed in parallel.")
+    parser.add_argument("--budget", type=int, default=None, help="Max upstream requests per pass.")
+    parser.add_argument("--max-chains", type=int, default=None, help="Max chains considered per pass.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app()
+    warmer = CacheWarmer(
+        interval_seconds=args.interval,
+        active_hours=args.active_hours,
+        concurrency=args.concurrency,
+        request_budget=args.budget,
+        max_chains=args.max_chains,
+    )
+    if args.once:
+        print(warmer.run_once(app))
+    else:
+        warmer.run_forever(app)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
-import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, List, Dict, Optional, Tuple
 import requests
-from .cache import sleeper_api_cache, league_cache
+from flask import current_app, has_app_context
+from .cache import sleeper_api_cache, league_cache, pinned_entity_cache, SingleFlight
+from .http_client import sleeper_http
+from .codec import decode_payload, encode_payload
+from . import league_chain_index
+from .rate_limiter import (
+    PRIORITY_USER,
+    RateLimited,
+    WAIT_BUDGET_SECONDS,
+    background_priority,
+    current_priority,
+    sleeper_rate_limiter,
+)
 from .extensions import db
 from .models import (
     SleeperApiCache,
@@ -17,6 +32,28 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+FANOUT_WORKERS = int(os.getenv("SLEEPER_FANOUT_WORKERS", "8"))
+REFRESH_WORKERS = int(os.getenv("SLEEPER_REFRESH_WORKERS", "2"))
+SWR_ENABLED = os.getenv("SLEEPER_SWR_ENABLED", "1") == "1"
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """Lazily created, bounded thread pools shared across requests"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max(1, max_workers),
+                    thread_name_prefix=f"sleeper-{name}"
+                )
+                _executors[name] = executor
+    return executor
+
+
 class SleeperAPIService:
     """Optimized Sleeper API service with caching and batching"""
     
@@ -24,6 +61,35 @@ class SleeperAPIService:
     TIMEOUT = 10
     DEFAULT_TTL_SECONDS = 300
 
+    # Stale entity rows are served (and refreshed in the background) until
+    # they are this old; past the cutoff the request waits for upstream.
+    MAX_STALENESS_SECONDS = {
+        "sleeper_league": 60 * 60 * 24,  # 24 hours
+        "sleeper_rosters": 60 * 60,  # 1 hour
+        "sleeper_users": 60 * 60 * 24,  # 24 hours
+        "sleeper_drafts": 60 * 60 * 24,  # 24 hours
+        "sleeper_draft_picks": 60 * 60 * 24,  # 24 hours
+        "sleeper_transactions": 60 * 60,  # 1 hour
+    }
+
+    def __init__(self):
+        # Concurrent misses for the same URL / entity row share one fetch
+        self._upstream_flight = SingleFlight("sleeper_upstream")
+        self._entity_flight = SingleFlight("sleeper_entity")
+        # Background (stale-while-revalidate) refresh bookkeeping
+        self._refresh_lock = threading.Lock()
+        self._refresh_pending = set()
+        self._swr_stats = {
+            "stale_served": 0,
+            "refresh_scheduled": 0,
+            "refresh_failed": 0,
+            "stale_fallback": 0,
+        }
+        # Completed seasons are immutable; their rows are stored without expiry
+        self._completion_lock = threading.Lock()
+        self._completed_leagues = set()
+        self._completed_drafts = set()
+
     def _ttl_for_url(self, url: str) -> int:
         if "/players/nfl" in url:
             return 60 * 60 * 24  # 24 hours
@@ -37,14 +103,19 @@ class SleeperAPIService:
             return 60 * 5  # 5 minutes
         return self.DEFAULT_TTL_SECONDS
 
-    def _get_db_cache(self, url: str, ttl_seconds: int) -> Optional[Dict]:
+    def _get_db_cache(self, url: str, ttl_seconds: Optional[int]) -> Optional[Dict]:
+        """Read a cached URL response; ttl_seconds=None accepts any age"""
         try:
             cached = SleeperApiCache.query.filter_by(url=url).first()
             if not cached:
                 return None
-            if cached.updated_at and datetime.utcnow() - cached.updated_at > timedelta(seconds=ttl_seconds):
+            if (
+                ttl_seconds is not None
+                and cached.updated_at
+                and datetime.utcnow() - cached.updated_at > timedelta(seconds=ttl_seconds)
+            ):
                 return None
-            return json.loads(cached.response_json)
+            return decode_payload(cached.response_json)
         except Exception as e:
             logger.warning(f"DB cache read failed for {url}: {e}")
             return None
@@ -54,35 +125,200 @@ class SleeperAPIService:
             return False
         return (datetime.utcnow() - updated_at) <= timedelta(seconds=ttl_seconds)
 
-    def _load_entity_cache(self, model, filters: Dict, ttl_seconds: int):
+    def _load_entity_row(self, model, filters: Dict) -> Tuple[Optional[Any], Optional[float]]:
+        """Return (data, age_seconds) for a cached entity row, or (None, None).
+
+        Rows flagged no_expiry report an age of 0 and are pinned in memory.
+        """
         try:
             row = model.query.filter_by(**filters).first()
-            if not row or not self._entity_cache_fresh(row.updated_at, ttl_seconds):
-                return None
-            return json.loads(row.data_json)
+            if not row or not row.updated_at:
+                return None, None
+            data = decode_payload(row.data_json)
+            if row.no_expiry:
+                pinned_entity_cache.set(self._entity_key(model, filters), data)
+                return data, 0.0
+            age = (datetime.utcnow() - row.updated_at).total_seconds()
+            return data, age
         except Exception as e:
             logger.warning(f"Entity cache read failed for {model.__tablename__}: {e}")
+            return None, None
+
+    def _load_entity_cache(self, model, filters: Dict, ttl_seconds: int):
+        data, age = self._load_entity_row(model, filters)
+        if data is None or age > ttl_seconds:
             return None
+        return data
+
+    def _can_serve_stale(self, model, age: Optional[float]) -> bool:
+        if not SWR_ENABLED or age is None:
+            return False
+        return age <= self.MAX_STALENESS_SECONDS.get(model.__tablename__, 0)
+
+    def _schedule_refresh(self, key: str, job: Callable[[], Any]) -> None:
+        """Run job once per key on the background refresh pool, in an app context"""
+        if not has_app_context():
+            return
+        app = current_app._get_current_object()
+        with self._refresh_lock:
+            if key in self._refresh_pending:
+                return
+            self._refresh_pending.add(key)
+            self._swr_stats["refresh_scheduled"] += 1
+
+        def _run():
+            try:
+                with app.app_context(), background_priority():
+                    job()
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {key}: {e}")
+                with self._refresh_lock:
+                    self._swr_stats["refresh_failed"] += 1
+            finally:
+                with self._refresh_lock:
+                    self._refresh_pending.discard(key)
 
-    def _store_entity_cache(self, model, filters: Dict, data):
         try:
-            payload = json.dumps(data)
+            _get_executor("refresh", REFRESH_WORKERS).submit(_run)
+        except RuntimeError:
+            # Executor shut down (interpreter exit); serve stale without refresh
+            with self._refresh_lock:
+                self._refresh_pending.discard(key)
+
+    def _mark_stale_served(self, count: int = 1) -> None:
+        with self._refresh_lock:
+            self._swr_stats["stale_served"] += count
+
+    def _mark_stale_fallback(self, count: int = 1) -> None:
+        with self._refresh_lock:
+            self._swr_stats["stale_fallback"] += count
+
+    def _store_entity_cache(self, model, filters: Dict, data, no_expiry: bool = False):
+        try:
+            payload = encode_payload(data)
             row = model.query.filter_by(**filters).first()
             if row:
                 row.data_json = payload
                 row.updated_at = db.func.now()
+                row.no_expiry = no_expiry
                 db.session.add(row)
             else:
-                row = model(**filters, data_json=payload)
+                row = model(**filters, data_json=payload, no_expiry=no_expiry)
                 db.session.add(row)
             db.session.commit()
+            if no_expiry:
+                pinned_entity_cache.set(self._entity_key(model, filters), data)
         except Exception as e:
             db.session.rollback()
             logger.warning(f"Entity cache write failed for {model.__tablename__}: {e}")
 
+    def _load_entity_rows_many(
+        self,
+        model,
+        key_column: str,
+        keys: List[int],
+        filters: Optional[Dict] = None
+    ) -> Dict[int, Tuple[Any, float]]:
+        """Read entity rows for many keys in a single query: key -> (data, age_seconds)"""
+        if not keys:
+            return {}
+        try:
+            query = model.query.filter_by(**(filters or {})).filter(getattr(model, key_column).in_(keys))
+            now = datetime.utcnow()
+            result = {}
+            for row in query.all():
+                if not row.updated_at:
+                    continue
+                key = getattr(row, key_column)
+                data = decode_payload(row.data_json)
+                if row.no_expiry:
+                    pinned_entity_cache.set(self._entity_key(model, {**(filters or {}), key_column: key}), data)
+                    result[key] = (data, 0.0)
+                else:
+                    result[key] = (data, (now - row.updated_at).total_seconds())
+            return result
+        except Exception as e:
+            logger.warning(f"Entity cache bulk read failed for {model.__tablename__}: {e}")
+            return {}
+
+    def _store_entity_cache_many(
+        self,
+        model,
+        key_column: str,
+        items: Dict[int, Any],
+        filters: Optional[Dict] = None,
+        no_expiry: bool = False
+    ) -> None:
+        """Upsert many entity rows with a single commit"""
+        if not items:
+            return
+        try:
+            base_filters = filters or {}
+            existing = {
+                getattr(row, key_column): row
+                for row in model.query.filter_by(**base_filters)
+                .filter(getattr(model, key_column).in_(list(items.keys())))
+                .all()
+            }
+            for key, data in items.items():
+                payload = encode_payload(data)
+                row = existing.get(key)
+                if row:
+                    row.data_json = payload
+                    row.updated_at = db.func.now()
+                    row.no_expiry = no_expiry
+                else:
+                    row = model(**base_filters, **{key_column: key}, data_json=payload, no_expiry=no_expiry)
+                db.session.add(row)
+            db.session.commit()
+            if no_expiry:
+                for key, data in items.items():
+                    pinned_entity_cache.set(self._entity_key(model, {**base_filters, key_column: key}), data)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Entity cache bulk write failed for {model.__tablename__}: {e}")
+
+    def _get_db_cache_many(self, urls: List[str], stale_ok: bool = False) -> Dict[str, Any]:
+        if not urls:
+            return {}
+        try:
+            result = {}
+            for cached in SleeperApiCache.query.filter(SleeperApiCache.url.in_(urls)).all():
+                ttl_seconds = self._ttl_for_url(cached.url)
+                expired = cached.updated_at and datetime.utcnow() - cached.updated_at > timedelta(seconds=ttl_seconds)
+                if expired and not stale_ok:
+                    continue
+                result[cached.url] = decode_payload(cached.response_json)
+            return result
+        except Exception as e:
+            logger.warning(f"DB cache bulk read failed: {e}")
+            return {}
+
+    def _set_db_cache_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        try:
+            existing = {
+                row.url: row
+                for row in SleeperApiCache.query.filter(SleeperApiCache.url.in_(list(items.keys()))).all()
+            }
+            for url, data in items.items():
+                payload = encode_payload(data)
+                cached = existing.get(url)
+                if cached:
+                    cached.response_json = payload
+                    cached.updated_at = db.func.now()
+                    db.session.add(cached)
+                else:
+                    db.session.add(SleeperApiCache(url=url, response_json=payload))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"DB cache bulk write failed: {e}")
+
     def _set_db_cache(self, url: str, data: Dict) -> None:
         try:
-            payload = json.dumps(data)
+            payload = encode_payload(data)
             cached = SleeperApiCache.query.filter_by(url=url).first()
             if cached:
                 cached.response_json = payload
@@ -95,10 +331,54 @@ class SleeperAPIService:
             db.session.rollback()
             logger.warning(f"DB cache write failed for {url}: {e}")
     
-    def fetch(self, url: str, use_cache: bool = True) -> Dict:
-        """Fetch data with optional caching"""
+    def _fetch_upstream(self, url: str, priority: Optional[int] = None) -> Optional[Any]:
+        """Fetch from Sleeper without touching any cache tier.
+
+        Safe to call from worker threads (no app context needed).
+        Throttled/5xx responses are retried here, each attempt taking its
+        own request token. Returns None on any error; raises RateLimited
+        when no request token frees up within the caller's wait budget.
+        """
+        if priority is None:
+            priority = current_priority()
+        attempt = 0
+        while True:
+            if not sleeper_rate_limiter.acquire(priority, WAIT_BUDGET_SECONDS.get(priority)):
+                raise RateLimited(url)
+            try:
+                resp = sleeper_http.get(url, timeout=self.TIMEOUT)
+                if resp.status_code == 200:
+                    return resp.json()
+            except requests.Timeout:
+                logger.error(f"Timeout fetching {url}")
+                return None
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {e}")
+                return None
+            delay = sleeper_http.retry_delay(resp, attempt)
+            if delay is None:
+                logger.error(f"API error {resp.status_code}: {url}")
+                return None
+            logger.warning(f"API error {resp.status_code}, retrying in {delay:.1f}s: {url}")
+            time.sleep(delay)
+            attempt += 1
+
+    def fetch(
+        self,
+        url: str,
+        use_cache: bool = True,
+        force_refresh: bool = False,
+        allow_stale: bool = True
+    ) -> Dict:
+        """Fetch data with optional caching.
+
+        force_refresh skips the cache reads but still writes the result back.
+        When the upstream budget is exhausted an expired cached response is
+        returned instead (allow_stale=False returns {} so the caller can
+        fall back to its own copy).
+        """
         
-        if use_cache:
+        if use_cache and not force_refresh:
             cached = sleeper_api_cache.get(url)
             if cached is not None:
                 logger.debug(f"Cache hit: {url}")
@@ -110,68 +390,252 @@ class SleeperAPIService:
                 logger.debug(f"DB cache hit: {url}")
                 return db_cached
         
+        fetcher = self._fetch_and_store if use_cache else self._fetch_upstream
         try:
-            resp = requests.get(url, timeout=self.TIMEOUT)
-            if resp.status_code == 200:
-                data = resp.json()
-                if use_cache:
-                    sleeper_api_cache.set(url, data)
-                    self._set_db_cache(url, data)
-                return data
-            else:
-                logger.error(f"API error {resp.status_code}: {url}")
-                return {}
-        except requests.Timeout:
-            logger.error(f"Timeout fetching {url}")
-            return {}
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
-            return {}
-    
-    def get_league_chain(self, league_id: str) -> List[str]:
-        """Get all league IDs from current year back to original"""
+            data = self._upstream_flight.do(url, lambda: fetcher(url))
+        except RateLimited:
+            logger.warning(f"Upstream budget exhausted, serving stale cache for {url}")
+            data = self._get_db_cache(url, None) if use_cache and allow_stale else None
+            if data is not None:
+                self._mark_stale_fallback()
+        return data if data is not None else {}
+
+    def _fetch_and_store(self, url: str) -> Optional[Any]:
+        data = self._fetch_upstream(url)
+        if data is not None:
+            sleeper_api_cache.set(url, data)
+            self._set_db_cache(url, data)
+        return data
+
+    def fetch_many(
+        self,
+        urls: Iterable[str],
+        use_cache: bool = True,
+        force_refresh: bool = False,
+        allow_stale: bool = True
+    ) -> Dict[str, Any]:
+        """Fetch many URLs, running cache misses concurrently.
+
+        Memory and DB tiers are checked first (one query for all URLs);
+        only the remaining misses go upstream on the shared fan-out pool.
+        Rate-limited fetches fall back to expired cached responses like
+        fetch(); other failures map to {}.
+        """
+        urls = list(dict.fromkeys(urls))
+        results: Dict[str, Any] = {}
+        misses = urls
+
+        if use_cache and not force_refresh:
+            misses = []
+            for url in urls:
+                cached = sleeper_api_cache.get(url)
+                if cached is not None:
+                    results[url] = cached
+                else:
+                    misses.append(url)
+            db_cached = self._get_db_cache_many(misses)
+            for url, data in db_cached.items():
+                sleeper_api_cache.set(url, data)
+                results[url] = data
+            misses = [url for url in misses if url not in db_cached]
+
+        if not misses:
+            return results
+
+        # Pool threads don't inherit the caller's context; pass priority along
+        priority = current_priority()
+        rate_limited = []
+
+        def _coalesced_fetch(url: str) -> Optional[Any]:
+            try:
+                return self._upstream_flight.do(url, lambda: self._fetch_upstream(url, priority))
+            except RateLimited:
+                rate_limited.append(url)
+                return None
+
+        if len(misses) == 1:
+            fetched = {misses[0]: _coalesced_fetch(misses[0])}
+        else:
+            executor = _get_executor("fanout", FANOUT_WORKERS)
+            fetched = dict(zip(misses, executor.map(_coalesced_fetch, misses)))
+        logger.info(f"Fetched {len(misses)} URLs upstream concurrently")
+
+        if rate_limited:
+            logger.warning(f"Upstream budget exhausted for {len(rate_limited)} of {len(misses)} URLs")
+            if use_cache and allow_stale:
+                stale = self._get_db_cache_many(rate_limited, stale_ok=True)
+                results.update(stale)
+                self._mark_stale_fallback(len(stale))
+                for url in stale:
+                    fetched.pop(url, None)
+
+        to_store = {}
+        for url, data in fetched.items():
+            if data is None:
+                results[url] = {}
+                continue
+            results[url] = data
+            if use_cache:
+                sleeper_api_cache.set(url, data)
+                to_store[url] = data
+        self._set_db_cache_many(to_store)
+        return results
+
+    def get_http_stats(self) -> Dict[str, Dict]:
+        """Per-host upstream request and connection reuse counters"""
+        return sleeper_http.stats()
+
+    def get_swr_stats(self) -> Dict[str, int]:
+        """Stale-while-revalidate counters for the entity caches"""
+        with self._refresh_lock:
+            stats = {**self._swr_stats, "refresh_pending": len(self._refresh_pending)}
+        with self._completion_lock:
+            stats["completed_leagues"] = len(self._completed_leagues)
+            stats["completed_drafts"] = len(self._completed_drafts)
+        return stats
+
+    def _mark_league_complete(self, league_id) -> None:
+        with self._completion_lock:
+            self._completed_leagues.add(int(league_id))
+
+    def is_league_complete(self, league_id) -> bool:
+        """True once Sleeper reports the league's season as complete"""
+        try:
+            league_id = int(league_id)
+        except (TypeError, ValueError):
+            return False
+        with self._completion_lock:
+            if league_id in self._completed_leagues:
+                return True
+        data = self.get_league_data(str(league_id)) or {}
+        return isinstance(data, dict) and data.get("status") == "complete"
+
+    def _is_league_complete_cached(self, league_id) -> bool:
+        """is_league_complete from the stored league row only; never fetches upstream"""
+        try:
+            league_id = int(league_id)
+        except (TypeError, ValueError):
+            return False
+        with self._completion_lock:
+            if league_id in self._completed_leagues:
+                return True
+        # "complete" is final, so a row of any age answers it
+        filters = {"league_id": league_id}
+        data = pinned_entity_cache.get(self._entity_key(SleeperLeague, filters))
+        if data is None:
+            data, _ = self._load_entity_row(SleeperLeague, filters)
+        if isinstance(data, dict) and data.get("status") == "complete":
+            self._mark_league_complete(league_id)
+            return True
+        return False
+
+    def _should_pin(self, model, filters: Dict, data) -> bool:
+        """Completed-season rows never change again; store them without expiry.
+
+        Runs while storing, so completeness comes from cached league data;
+        a league not loaded yet is simply not pinned this time.
+        """
+        if model is SleeperLeague:
+            return isinstance(data, dict) and data.get("status") == "complete"
+        if model is SleeperDraftPicks:
+            with self._completion_lock:
+                return int(filters.get("draft_id", 0)) in self._completed_drafts
+        league_id = filters.get("league_id")
+        return league_id is not None and self._is_league_complete_cached(league_id)
+
+    def get_rate_limit_stats(self) -> Dict:
+        """Token bucket state and per-priority queueing delay"""
+        return sleeper_rate_limiter.stats()
+
+    def get_coalescing_stats(self) -> Dict[str, Dict]:
+        """How many upstream/entity fetches ran vs. were coalesced"""
+        return {
+            "upstream": self._upstream_flight.stats(),
+            "entity": self._entity_flight.stats(),
+        }
+
+    def get_league_chain(self, league_id: str, refresh: bool = False) -> List[str]:
+        """Get all league IDs from the given league back to the original.
+
+        Resolved from the persistent chain index; only seasons not yet
+        indexed are walked via previous_league_id and then appended.
+        refresh skips the cached chain and overwrites it.
+        """
         cache_key = f"league_chain_{league_id}"
-        cached = league_cache.get(cache_key)
+        if refresh:
+            league_cache.note_miss(cache_key)
+            cached = None
+        else:
+            cached = league_cache.get(cache_key)
         if cached is not None:
             return cached
 
-        league_ids = []
+        start_id = str(league_id)
+        indexed = league_chain_index.lookup_chain(start_id) if start_id.isdigit() else None
+        if indexed:
+            league_ids = [str(lid) for lid in indexed]
+            league_ids = league_ids[league_ids.index(start_id):]
+            league_cache.set(cache_key, league_ids)
+            return league_ids
 
-        # Start from provided league_id and determine whether it's the most
-        # recent. If the passed league is already complete, callers should
-        # provide a user_id/season so we can look up the user's current
-        # league; otherwise we'll treat the passed id as the current.
-        current_id = str(league_id)
-
-        try:
-            league_data = self.fetch(f"{self.BASE_URL}/league/{current_id}")
-        except Exception:
-            league_data = {}
-
-        # If league_data indicates this is a completed league, we may need
-        # to find the current league via the user leagues endpoint. Callers
-        # may call get_user_leagues separately and then call this method
-        # again with the resolved current id.
-        previous_id = league_data.get('previous_league_id')
-
-        # Follow the chain backwards (limit to 20 to prevent infinite loops)
-        league_ids.append(current_id)
+        # Walk back until the chain ends or joins an already indexed chain
+        # (limit to 20 hops to prevent infinite loops)
+        league_ids = [start_id]
+        complete = False
+        current_id = start_id
         for _ in range(20):
             try:
-                league_data = self.fetch(f"{self.BASE_URL}/league/{current_id}")
+                league_data = self.get_league_data(current_id)
             except Exception:
                 break
-
+            if not isinstance(league_data, dict) or not league_data:
+                break
             previous_id = league_data.get('previous_league_id')
-            if not previous_id:
+            if not previous_id or str(previous_id) == "0":
+                complete = True
+                break
+            previous_id = str(previous_id)
+            known = league_chain_index.lookup_chain(previous_id)
+            if known:
+                known = [str(lid) for lid in known]
+                league_ids.extend(known[known.index(previous_id):])
+                complete = True
                 break
-            league_ids.append(str(previous_id))
-            current_id = str(previous_id)
+            league_ids.append(previous_id)
+            current_id = previous_id
 
+        # A walk cut short by an upstream failure is not persisted
+        if complete:
+            league_chain_index.save_chain(league_ids, touch=current_priority() == PRIORITY_USER)
         league_cache.set(cache_key, league_ids)
         logger.info(f"League chain for {league_id}: {league_ids}")
         return league_ids
 
+    def get_league_chains(self, league_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """get_league_chain for many leagues, walking unindexed chains concurrently"""
+        league_ids = [str(lid) for lid in dict.fromkeys(league_ids) if lid]
+        if len(league_ids) <= 1 or not has_app_context():
+            return {lid: self.get_league_chain(lid) for lid in league_ids}
+
+        app = current_app._get_current_object()
+        background = current_priority() != PRIORITY_USER
+
+        def _walk(league_id: str) -> List[str]:
+            # Pool threads need their own app context (DB session) and priority
+            try:
+                with app.app_context():
+                    if background:
+                        with background_priority():
+                            return self.get_league_chain(league_id)
+                    return self.get_league_chain(league_id)
+            except Exception as e:
+                logger.warning(f"League chain walk failed for {league_id}: {e}")
+                return [league_id]
+
+        # Own pool: walks call fetch(), which may fan out on the "fanout" pool
+        executor = _get_executor("chains", FANOUT_WORKERS)
+        return dict(zip(league_ids, executor.map(_walk, league_ids)))
+
     def get_user_leagues(self, user_id: str, season: Optional[str] = None) -> List[Dict]:
         """Get leagues for a user for a given season.
 
@@ -191,86 +655,247 @@ class SleeperAPIService:
         data = self.fetch(url)
         return data if isinstance(data, list) else []
     
-    def get_league_data(self, league_id: str) -> Dict:
-        """Get current league data"""
-        url = f"{self.BASE_URL}/league/{league_id}"
+    def _entity_key(self, model, filters: Dict) -> str:
+        parts = [f"{k}={filters[k]}" for k in sorted(filters)]
+        return f"{model.__tablename__}:{','.join(parts)}"
+
+    def _get_entity(self, model, filters: Dict, url: str, expected_type=list):
+        """Entity cache read with stale-while-revalidate and single-flight refresh"""
+        key = self._entity_key(model, filters)
+        pinned = pinned_entity_cache.get(key)
+        if pinned is not None:
+            return pinned
         ttl_seconds = self._ttl_for_url(url)
-        cached = self._load_entity_cache(SleeperLeague, {"league_id": int(league_id)}, ttl_seconds)
+        cached, age = self._load_entity_row(model, filters)
         if cached is not None:
+            if age <= ttl_seconds:
+                return cached
+            if self._can_serve_stale(model, age):
+                self._mark_stale_served()
+                self._schedule_refresh(key, lambda: self._entity_flight.do(
+                    key,
+                    lambda: self._refresh_entity(model, filters, url, expected_type, force=True)
+                ))
+                return cached
+        data = self._entity_flight.do(
+            key,
+            lambda: self._refresh_entity(model, filters, url, expected_type)
+        )
+        if cached is not None and not self._is_valid_entity(data, expected_type):
+            # Upstream failed or is over budget; an old row beats nothing
+            self._mark_stale_fallback()
             return cached
-        data = self.fetch(url)
-        if isinstance(data, dict) and data:
-            self._store_entity_cache(SleeperLeague, {"league_id": int(league_id)}, data)
+        return data
+
+    def _is_valid_entity(self, data, expected_type) -> bool:
+        return isinstance(data, expected_type) and (bool(data) or expected_type is list)
+
+    def _refresh_entity(self, model, filters: Dict, url: str, expected_type=list, force: bool = False):
+        data = self.fetch(url, force_refresh=force, allow_stale=False)
+        if self._is_valid_entity(data, expected_type):
+            self._store_entity_cache(model, filters, data, no_expiry=self._should_pin(model, filters, data))
+        return data
+
+    def _get_entities_bulk(
+        self,
+        model,
+        key_column: str,
+        url_for: Dict[int, str],
+        filters: Optional[Dict] = None
+    ) -> Dict[int, List[Dict]]:
+        """Bulk entity read: fresh rows as-is, stale rows served and refreshed
+        in the background, misses fetched upstream concurrently."""
+        keys = list(url_for.keys())
+        if not keys:
+            return {}
+        results: Dict[int, List[Dict]] = {}
+        for key in keys:
+            pinned = pinned_entity_cache.get(self._entity_key(model, {**(filters or {}), key_column: key}))
+            if pinned is not None:
+                results[key] = pinned
+        unpinned = [key for key in keys if key not in results]
+        ttl_seconds = self._ttl_for_url(url_for[keys[0]])
+        rows = self._load_entity_rows_many(model, key_column, unpinned, filters)
+
+        misses = []
+        stale = []
+        for key in unpinned:
+            data, age = rows.get(key, (None, None))
+            if data is not None and age <= ttl_seconds:
+                results[key] = data if isinstance(data, list) else []
+            elif data is not None and self._can_serve_stale(model, age):
+                results[key] = data if isinstance(data, list) else []
+                stale.append(key)
+            else:
+                misses.append(key)
+
+        if stale:
+            self._mark_stale_served(len(stale))
+            refresh_key = f"{self._entity_key(model, filters or {})}:{key_column}={','.join(str(k) for k in stale)}"
+            self._schedule_refresh(
+                refresh_key,
+                lambda: self._refresh_entities_bulk(model, key_column, stale, url_for, filters, force=True)
+            )
+        if misses:
+            fallback = {key: rows[key][0] for key in misses if key in rows}
+            results.update(self._refresh_entities_bulk(model, key_column, misses, url_for, filters, fallback=fallback))
+        return {key: results.get(key, []) for key in keys}
+
+    def _refresh_entities_bulk(
+        self,
+        model,
+        key_column: str,
+        keys: List[int],
+        url_for: Dict[int, str],
+        filters: Optional[Dict] = None,
+        force: bool = False,
+        fallback: Optional[Dict[int, Any]] = None
+    ) -> Dict[int, List[Dict]]:
+        fetched = self.fetch_many([url_for[k] for k in keys], force_refresh=force, allow_stale=False)
+        results = {}
+        to_store = {}
+        degraded = 0
+        for key in keys:
+            data = fetched.get(url_for[key])
+            if isinstance(data, list):
+                to_store[key] = data
+                results[key] = data
+            elif fallback and isinstance(fallback.get(key), list):
+                results[key] = fallback[key]
+                degraded += 1
+            else:
+                results[key] = []
+        if degraded:
+            self._mark_stale_fallback(degraded)
+        if to_store:
+            if model is SleeperDraftPicks:
+                with self._completion_lock:
+                    pinned_keys = {k for k in to_store if int(k) in self._completed_drafts}
+            else:
+                pinned_keys = set(to_store) if self._should_pin(model, filters or {}, None) else set()
+            self._store_entity_cache_many(
+                model, key_column, {k: v for k, v in to_store.items() if k in pinned_keys}, filters, no_expiry=True
+            )
+            self._store_entity_cache_many(
+                model, key_column, {k: v for k, v in to_store.items() if k not in pinned_keys}, filters
+            )
+        return results
+
+    def get_league_data(self, league_id: str) -> Dict:
+        """Get current league data"""
+        url = f"{self.BASE_URL}/league/{league_id}"
+        data = self._get_entity(SleeperLeague, {"league_id": int(league_id)}, url, dict)
+        if isinstance(data, dict) and data.get("status") == "complete":
+            self._mark_league_complete(league_id)
         return data
     
     def get_rosters(self, league_id: str) -> List[Dict]:
         """Get league rosters"""
         url = f"{self.BASE_URL}/league/{league_id}/rosters"
-        ttl_seconds = self._ttl_for_url(url)
-        cached = self._load_entity_cache(SleeperRosters, {"league_id": int(league_id)}, ttl_seconds)
-        if cached is not None:
-            return cached if isinstance(cached, list) else []
-        data = self.fetch(url)
-        if isinstance(data, list):
-            self._store_entity_cache(SleeperRosters, {"league_id": int(league_id)}, data)
+        data = self._get_entity(SleeperRosters, {"league_id": int(league_id)}, url)
         return data if isinstance(data, list) else []
     
     def get_users(self, league_id: str) -> List[Dict]:
         """Get league users"""
         url = f"{self.BASE_URL}/league/{league_id}/users"
-        ttl_seconds = self._ttl_for_url(url)
-        cached = self._load_entity_cache(SleeperUsers, {"league_id": int(league_id)}, ttl_seconds)
-        if cached is not None:
-            return cached if isinstance(cached, list) else []
-        data = self.fetch(url)
-        if isinstance(data, list):
-            self._store_entity_cache(SleeperUsers, {"league_id": int(league_id)}, data)
+        data = self._get_entity(SleeperUsers, {"league_id": int(league_id)}, url)
         return data if isinstance(data, list) else []
     
     def get_drafts(self, league_id: str) -> List[Dict]:
         """Get league drafts"""
         url = f"{self.BASE_URL}/league/{league_id}/drafts"
-        ttl_seconds = self._ttl_for_url(url)
-        cached = self._load_entity_cache(SleeperDrafts, {"league_id": int(league_id)}, ttl_seconds)
-        if cached is not None:
-            return cached if isinstance(cached, list) else []
-        data = self.fetch(url)
-        if isinstance(data, list):
-            self._store_entity_cache(SleeperDrafts, {"league_id": int(league_id)}, data)
-        return data if isinstance(data, list) else []
+        data = self._get_entity(SleeperDrafts, {"league_id": int(league_id)}, url)
+        drafts = data if isinstance(data, list) else []
+        if drafts and self.is_league_complete(league_id):
+            # Picks of a completed season's drafts are immutable too
+            with self._completion_lock:
+                self._completed_drafts.update(
+                    int(d["draft_id"]) for d in drafts if isinstance(d, dict) and d.get("draft_id")
+                )
+        return drafts
     
     def get_draft_picks(self, draft_id: str) -> List[Dict]:
         """Get draft picks"""
         url = f"{self.BASE_URL}/draft/{draft_id}/picks"
-        ttl_seconds = self._ttl_for_url(url)
-        cached = self._load_entity_cache(SleeperDraftPicks, {"draft_id": int(draft_id)}, ttl_seconds)
-        if cached is not None:
-            return cached if isinstance(cached, list) else []
-        data = self.fetch(url)
-        if isinstance(data, list):
-            self._store_entity_cache(SleeperDraftPicks, {"draft_id": int(draft_id)}, data)
+        data = self._get_entity(SleeperDraftPicks, {"draft_id": int(draft_id)}, url)
         return data if isinstance(data, list) else []
     
     def get_transactions(self, league_id: str, round_num: int) -> List[Dict]:
         """Get league transactions for a round"""
         url = f"{self.BASE_URL}/league/{league_id}/transactions/{round_num}"
-        ttl_seconds = self._ttl_for_url(url)
-        cached = self._load_entity_cache(
+        data = self._get_entity(
             SleeperTransactions,
             {"league_id": int(league_id), "round_num": int(round_num)},
-            ttl_seconds
+            url
         )
-        if cached is not None:
-            return cached if isinstance(cached, list) else []
-        data = self.fetch(url)
-        if isinstance(data, list):
-            self._store_entity_cache(
-                SleeperTransactions,
-                {"league_id": int(league_id), "round_num": int(round_num)},
-                data
-            )
         return data if isinstance(data, list) else []
+
+    def get_draft_picks_bulk(self, draft_ids: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Get picks for many drafts, fetching misses concurrently.
+
+        Result preserves the order of draft_ids.
+        """
+        draft_ids = [d for d in dict.fromkeys(draft_ids) if d]
+        if not draft_ids:
+            return {}
+        url_for = {int(d): f"{self.BASE_URL}/draft/{d}/picks" for d in draft_ids}
+        by_id = self._get_entities_bulk(SleeperDraftPicks, "draft_id", url_for)
+        return {d: by_id.get(int(d), []) for d in draft_ids}
+
+    def get_transactions_bulk(self, league_id: str, rounds: Iterable[int]) -> Dict[int, List[Dict]]:
+        """Get transactions for many rounds, fetching misses concurrently.
+
+        Returns round_num -> transactions, in round order.
+        """
+        rounds = sorted({int(r) for r in rounds})
+        url_for = {r: f"{self.BASE_URL}/league/{league_id}/transactions/{r}" for r in rounds}
+        return self._get_entities_bulk(
+            SleeperTransactions, "round_num", url_for, {"league_id": int(league_id)}
+        )
+
+    def get_all_transactions(self, league_id: str, rounds: int = 18, start_round: int = 0) -> List[Dict]:
+        """Flattened transactions for rounds start_round..rounds-1 of a league"""
+        by_round = self.get_transactions_bulk(league_id, range(max(0, start_round), rounds))
+        transactions: List[Dict] = []
+        for round_num in sorted(by_round):
+            transactions.extend(by_round[round_num] or [])
+        return transactions
     
+    def refresh_league(self, league_id: str, rounds: int = 18, start_round: int = 0) -> int:
+        """Force-refresh a league's entity rows ahead of TTL expiry.
+
+        Completed seasons are pinned, so they are only loaded into memory.
+        Transaction rounds before start_round are left alone. Returns the
+        number of URLs requested upstream.
+        """
+        league_id = str(league_id)
+        if self.is_league_complete(league_id):
+            drafts = self.get_drafts(league_id)
+            self.get_draft_picks_bulk(d.get("draft_id") for d in drafts if isinstance(d, dict))
+            return 0
+
+        filters = {"league_id": int(league_id)}
+        base_url = f"{self.BASE_URL}/league/{league_id}"
+        self._refresh_entity(SleeperLeague, filters, base_url, dict, force=True)
+        self._refresh_entity(SleeperRosters, filters, f"{base_url}/rosters", force=True)
+        self._refresh_entity(SleeperUsers, filters, f"{base_url}/users", force=True)
+        drafts = self._refresh_entity(SleeperDrafts, filters, f"{base_url}/drafts", force=True)
+
+        picks_url_for = {
+            int(d["draft_id"]): f"{self.BASE_URL}/draft/{d['draft_id']}/picks"
+            for d in (drafts if isinstance(drafts, list) else [])
+            if isinstance(d, dict) and d.get("draft_id")
+        }
+        if picks_url_for:
+            self._refresh_entities_bulk(
+                SleeperDraftPicks, "draft_id", list(picks_url_for), picks_url_for, force=True
+            )
+        tx_url_for = {r: f"{base_url}/transactions/{r}" for r in range(max(0, start_round), rounds)}
+        self._refresh_entities_bulk(
+            SleeperTransactions, "round_num", list(tx_url_for), tx_url_for, filters, force=True
+        )
+        return 4 + len(picks_url_for) + len(tx_url_for)
+
     def get_current_nfl_state(self) -> Dict:
         """Get current NFL state"""
         return self.fetch(f"{self.BASE_URL}/state/nfl")
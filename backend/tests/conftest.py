@@ -0,0 +1,17 @@
+"""Shared fixtures: a bare Flask app on an in-memory SQLite database."""
+import pytest
+from flask import Flask
+
+from backend.extensions import db
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
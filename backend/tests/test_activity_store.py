@@ -0,0 +1,139 @@
+"""Activity feed persistence: keyset pagination and incremental local syncs."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import activity_store, contract_state
+from backend.extensions import db
+from backend.models import ActivityEvent, CommissionerActionLog, Contract, RfaPlayer
+
+LEAGUE_ID = 2000
+TEAM_ID = 3
+SEASON = 2025
+
+
+@pytest.fixture(autouse=True)
+def offline_feed(monkeypatch):
+    """No Sleeper transactions; items are the raw entry payloads"""
+    monkeypatch.setattr(activity_store, "transaction_entries", lambda league_id, rounds, start_round=0: {})
+    monkeypatch.setattr(activity_store, "enrich", lambda league_id, entries: [
+        dict(payload, uid=uid) for _, uid, _, payload in entries
+    ])
+
+
+def _feed():
+    items, _ = activity_store.read_page(str(LEAGUE_ID), limit=100)
+    return items
+
+
+def _uids():
+    return {item["uid"] for item in _feed()}
+
+
+def _add_contract(player_id, created_at=None, amount=10):
+    contract = Contract(league_id=LEAGUE_ID, player_id=player_id, team_id=TEAM_ID,
+                        contract_amount=amount, contract_length=2, season=SEASON, created_at=created_at)
+    db.session.add(contract)
+    db.session.flush()
+    contract_state.sync_contracts([contract.id])
+    return contract
+
+
+def _pages(limit, before=None):
+    uids = []
+    while True:
+        items, before = activity_store.read_page(str(LEAGUE_ID), before=before, limit=limit)
+        uids.extend(item["uid"] for item in items)
+        if before is None:
+            return uids
+
+
+def test_keyset_pages_cover_feed_in_order(app):
+    base = datetime(2025, 9, 1)
+    # Pairs of contracts share a timestamp, so pages split ties on uid
+    for i in range(23):
+        _add_contract(100 + i, created_at=base + timedelta(hours=i // 2))
+    db.session.commit()
+    activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+
+    everything = [item["uid"] for item in _feed()]
+    assert len(everything) == 23
+    events = {e.uid: e.created for e in ActivityEvent.query.all()}
+    assert everything == sorted(events, key=lambda uid: (-events[uid], uid))
+    for limit in (1, 4, 7, 23, 50):
+        assert _pages(limit) == everything
+
+
+def test_keyset_cursor_is_stable_when_newer_events_arrive(app):
+    base = datetime(2025, 9, 1)
+    for i in range(10):
+        _add_contract(100 + i, created_at=base + timedelta(hours=i))
+    db.session.commit()
+    activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+    first, cursor = activity_store.read_page(str(LEAGUE_ID), limit=4)
+
+    newest = _add_contract(500, created_at=base + timedelta(days=30))
+    db.session.commit()
+    activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+
+    rest = _pages(4, before=cursor)
+    older = [item["uid"] for item in _feed() if item["uid"] != f"contract:{newest.id}"]
+    assert [item["uid"] for item in first] + rest == older
+
+
+def test_malformed_cursor_is_rejected(app):
+    with pytest.raises(ValueError):
+        activity_store.read_page(str(LEAGUE_ID), before="yesterday:contract:1")
+
+
+def test_incremental_sync_reads_only_changed_players(app, monkeypatch):
+    kept = _add_contract(7)
+    edited = _add_contract(8)
+    removed = _add_contract(9)
+    db.session.commit()
+    activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+
+    added = _add_contract(10)
+    edited.contract_amount = 25
+    db.session.delete(removed)
+    contract_state.sync_contracts([edited.id, removed.id])
+    db.session.commit()
+
+    calls = []
+    local_entries = activity_store.local_entries
+    monkeypatch.setattr(activity_store, "local_entries", lambda chain, player_ids=None: calls.append(
+        None if player_ids is None else set(player_ids)) or local_entries(chain, player_ids))
+    state = activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+
+    assert calls == [{8, 9, 10}]
+    items = {item["uid"]: item for item in _feed()}
+    assert set(items) == {f"contract:{kept.id}", f"contract:{edited.id}", f"contract:{added.id}"}
+    assert items[f"contract:{edited.id}"]["contract_amount"] == 25
+    assert state.event_count == 3
+
+    # Nothing changed: no local rows are read at all
+    calls.clear()
+    activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+    assert calls == []
+
+
+def test_removed_action_without_contract_reaches_incremental_feed(app):
+    contract = _add_contract(7)
+    db.session.add(RfaPlayer(league_id=LEAGUE_ID, player_id=9, team_id=TEAM_ID,
+                             contract_length=1, contract_id=None, season=SEASON))
+    db.session.commit()
+    activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+    assert _uids() == {f"contract:{contract.id}", f"rfa:{LEAGUE_ID}:9"}
+
+    # What commissioner_remove_action does for an RFA row with no contract
+    db.session.delete(RfaPlayer.query.filter_by(player_id=9).one())
+    log_entry = CommissionerActionLog(league_id=LEAGUE_ID, team_id=TEAM_ID, player_id=9,
+                                      action_type="rfa", operation="remove",
+                                      contract_length=1, season=SEASON)
+    contract_state.record_commissioner_action(log_entry, None)
+    db.session.commit()
+
+    state = activity_store.sync(str(LEAGUE_ID), [LEAGUE_ID])
+    assert not activity_store._needs_full_local_diff(state)
+    assert _uids() == {f"contract:{contract.id}", f"commissioner:{log_entry.id}"}
+    assert state.event_count == 2
@@ -0,0 +1,54 @@
+"""Shared cache tier: scoped cross-worker invalidation and the set() guard."""
+import pytest
+
+from backend import cache
+from backend.cache import CacheManager, SQLiteCacheBackend
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    """Two workers' caches for one namespace on a shared SQLite tier"""
+    monkeypatch.setattr(cache, "GENERATION_CHECK_INTERVAL", 0)
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    return (
+        CacheManager(maxsize=10, ttl=60, namespace="test", backend=backend),
+        CacheManager(maxsize=10, ttl=60, namespace="test", backend=backend),
+    )
+
+
+def test_tag_invalidation_drops_only_tagged_entries_elsewhere(workers):
+    a, b = workers
+    a.set("k1", 1, tags=["league:1"])
+    a.set("k2", 2, tags=["league:2"])
+    assert (b.get("k1"), b.get("k2")) == (1, 2)
+
+    a.invalidate_tags(["league:1"])
+    assert b.get("k1") is None
+    assert "k2" in b.cache  # still served from this worker's L1
+    assert b.get("k2") == 2
+
+
+def test_delete_and_clear_reach_other_workers(workers):
+    a, b = workers
+    a.set("k1", 1)
+    a.set("k2", 2)
+    assert (b.get("k1"), b.get("k2")) == (1, 2)
+
+    a.delete("k1")
+    assert (b.get("k1"), b.get("k2")) == (None, 2)
+    a.clear()
+    assert b.get("k2") is None
+
+
+def test_set_after_concurrent_invalidation_is_dropped(workers):
+    a, b = workers
+    assert b.get("rosters") is None  # b starts computing from old data
+    a.invalidate_tags(["league:1"])  # a write lands meanwhile
+    b.set("rosters", "stale", tags=["league:1"])
+    assert a.get("rosters") is None and b.get("rosters") is None
+
+    # Unrelated invalidations do not block the write
+    assert b.get("rosters") is None
+    a.invalidate_tags(["league:2"])
+    b.set("rosters", "fresh", tags=["league:1"])
+    assert a.get("rosters") == "fresh"
@@ -0,0 +1,57 @@
+"""contract_state projection stays equal to a full recompute as writes sync it."""
+from backend import contract_state
+from backend.extensions import db
+from backend.models import AmnestyPlayer, Contract, ContractState, ExtensionPlayer, RfaPlayer
+
+LEAGUE_ID = 3000
+SEASON = 2025
+
+
+def _contract(player_id, length=3, season=SEASON):
+    contract = Contract(league_id=LEAGUE_ID, player_id=player_id, team_id=1,
+                        contract_amount=10, contract_length=length, season=season)
+    db.session.add(contract)
+    db.session.flush()
+    return contract
+
+
+def test_verify_is_clean_after_synced_writes(app):
+    contracts = [_contract(player_id) for player_id in range(1, 7)]
+    db.session.commit()
+    assert contract_state.rebuild([LEAGUE_ID]) == 6
+    assert contract_state.verify([LEAGUE_ID]) == []
+
+    amnestied, extended, rfa, edited, deleted, _ = contracts
+    db.session.add(AmnestyPlayer(league_id=LEAGUE_ID, player_id=amnestied.player_id, team_id=1,
+                                 contract_id=amnestied.id, season=SEASON))
+    db.session.add(ExtensionPlayer(league_id=LEAGUE_ID, player_id=extended.player_id, team_id=1,
+                                   contract_length=2, contract_id=extended.id, season=SEASON))
+    db.session.add(RfaPlayer(league_id=LEAGUE_ID, player_id=rfa.player_id, team_id=1,
+                             contract_length=1, contract_id=rfa.id, season=SEASON))
+    edited.contract_length = 5
+    edited.contract_amount = 40
+    db.session.delete(deleted)
+    new = _contract(99, length=1)
+    contract_state.sync_contracts([amnestied.id, extended.id, rfa.id, edited.id, deleted.id, new.id])
+    db.session.commit()
+
+    assert contract_state.verify([LEAGUE_ID]) == []
+    rows = {row.contract_id: row for row in ContractState.query.all()}
+    assert deleted.id not in rows
+    assert rows[amnestied.id].is_amnestied and rows[rfa.id].is_rfa
+    assert rows[extended.id].extension_years == 2
+    assert (rows[edited.id].end_season, rows[edited.id].contract_amount) == (SEASON + 4, 40)
+
+
+def test_verify_reports_unsynced_writes(app):
+    contract = _contract(1)
+    db.session.commit()
+    contract_state.rebuild([LEAGUE_ID])
+
+    contract.contract_length = 1
+    db.session.commit()
+    diffs = contract_state.verify([LEAGUE_ID])
+    assert diffs == [{
+        "contract_id": contract.id,
+        "fields": {"contract_length": (1, 3), "end_season": (SEASON, SEASON + 2)},
+    }]
@@ -0,0 +1,77 @@
+"""Query-count regression tests for the set-based contract status layer."""
+import pytest
+from sqlalchemy import event
+
+from backend.contract_logic import ContractValidator
+from backend.contract_status import query_contract_status
+from backend.extensions import db
+from backend.models import AmnestyPlayer, Contract, ExtensionPlayer, RfaPlayer
+from backend.utils import get_contract_value
+
+LEAGUE_ID = 1000
+SEASON = 2025
+
+
+def _seed(count: int) -> None:
+    """count contracts; every 3rd amnestied, every 4th RFA, every 5th extended"""
+    for i in range(count):
+        contract = Contract(
+            league_id=LEAGUE_ID, player_id=i + 1, team_id=i % 12 + 1,
+            contract_amount=10, contract_length=3, season=SEASON - i % 3,
+        )
+        db.session.add(contract)
+        db.session.flush()
+        if i % 3 == 0:
+            db.session.add(AmnestyPlayer(league_id=LEAGUE_ID, player_id=i + 1, team_id=contract.team_id,
+                                         contract_id=contract.id, season=SEASON))
+        if i % 4 == 0:
+            db.session.add(RfaPlayer(league_id=LEAGUE_ID, player_id=i + 1, team_id=contract.team_id,
+                                     contract_length=1, contract_id=contract.id, season=SEASON))
+        if i % 5 == 0:
+            db.session.add(ExtensionPlayer(league_id=LEAGUE_ID, player_id=i + 1, team_id=contract.team_id,
+                                           contract_length=1, contract_id=contract.id, season=SEASON))
+    db.session.commit()
+
+
+def _count_statements(fn) -> int:
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return len(statements)
+
+
+def _counts(count: int):
+    _seed(count)
+    return (
+        _count_statements(lambda: query_contract_status([LEAGUE_ID])),
+        _count_statements(lambda: get_contract_value(1, LEAGUE_ID, SEASON)),
+        _count_statements(lambda: ContractValidator.get_active_contracts_for_league(LEAGUE_ID, SEASON)),
+    )
+
+
+def test_query_contract_status_is_one_statement(app):
+    _seed(50)
+    statuses = []
+    assert _count_statements(lambda: statuses.extend(query_contract_status([LEAGUE_ID]))) == 1
+    assert len(statuses) == 50
+    by_player = {s.contract.player_id: s for s in statuses}
+    assert by_player[1].is_amnestied and by_player[1].is_rfa and by_player[1].is_extended
+    assert not by_player[2].is_amnestied and not by_player[2].is_rfa and not by_player[2].is_extended
+
+
+@pytest.mark.parametrize("large", [200])
+def test_statement_count_does_not_grow_with_contracts(app, large):
+    small_counts = _counts(5)
+    db.session.query(AmnestyPlayer).delete()
+    db.session.query(RfaPlayer).delete()
+    db.session.query(ExtensionPlayer).delete()
+    db.session.query(Contract).delete()
+    db.session.commit()
+    assert _counts(large) == small_counts
@@ -0,0 +1,61 @@
+"""Incrementally maintained cost maps match a full rebuild."""
+from backend import cost_map_store
+from backend.roster_service import RosterService
+
+DRAFTS = {
+    "2": [{"player_id": "10", "metadata": {"amount": "30"}}, {"player_id": "11", "metadata": {"amount": "5"}}],
+    "1": [{"player_id": "10", "metadata": {"amount": "99"}}, {"player_id": "12", "metadata": {"amount": "8"}}],
+}
+
+
+def _tx(round_num, created, adds, bid, status_updated=None):
+    return {
+        "leg": round_num,
+        "created": created,
+        "status_updated": status_updated or created,
+        "adds": {str(pid): 1 for pid in adds},
+        "settings": {"waiver_bid": bid},
+    }
+
+
+# Transactions in the order they reach Sleeper
+BATCHES = {
+    1: [_tx(1, 1000, [20], 3), _tx(1, 1100, [21, 22], 4)],
+    2: [_tx(2, 2000, [20], 6), _tx(2, 2100, [11], 50)],
+    3: [_tx(3, 3000, [23], 2)],
+    # Arrive after the first build: round 3 is still open
+    4: [_tx(3, 3500, [21], 9), _tx(3, 3600, [24], 1)],
+    5: [_tx(4, 4000, [20], 12), _tx(4, 4100, [25], 0), _tx(4, 3900, [22], 7, status_updated=4200)],
+}
+
+
+def _transactions(*batches):
+    return [tx for batch in batches for tx in BATCHES[batch]]
+
+
+def test_incremental_cost_map_matches_full_rebuild(app):
+    key = "500:500,400"
+    RosterService.build_cost_map(DRAFTS, _transactions(1, 2, 3), cache_key=key, refresh=True)
+    state = cost_map_store.load(key)
+    assert (state.tx_watermark_ts, state.tx_watermark_round) == (3000, 3)
+
+    # A refresh refetches rounds from the watermark round on; drafts are unchanged so none are passed
+    for refetched, seen in (((3, 4), (1, 2, 3, 4)), ((3, 4, 5), (1, 2, 3, 4, 5))):
+        incremental = RosterService.build_cost_map({}, _transactions(*refetched), cache_key=key, refresh=True)
+        full = RosterService.build_cost_map(DRAFTS, _transactions(*seen))
+        assert incremental == full
+        assert cost_map_store.load(key).cost_map() == full
+
+    assert full["10"] == 30  # earlier draft wins
+    assert full["11"] == 5  # draft price beats a transaction bid
+    assert full["20"] == 12 and full["21"] == 9 and full["22"] == 7
+    assert "25" not in full  # zero bids do not price a player
+
+
+def test_changed_drafts_rebuild_the_draft_map(app):
+    key = "600:600"
+    RosterService.build_cost_map(DRAFTS, _transactions(1), cache_key=key, refresh=True)
+    drafts = dict(DRAFTS, **{"3": [{"player_id": "13", "metadata": {"amount": "17"}}]})
+    incremental = RosterService.build_cost_map(drafts, _transactions(1, 2), cache_key=key, refresh=True)
+    assert incremental == RosterService.build_cost_map(drafts, _transactions(1, 2))
+    assert incremental["13"] == 17
@@ -0,0 +1,51 @@
+"""League chain index: persisting chains and rollover rebuilds."""
+import json
+
+from backend import contract_state, league_chain_index
+from backend.models import LeagueChain
+
+
+def _chain(original_league_id):
+    return LeagueChain.query.filter_by(original_league_id=original_league_id).one()
+
+
+def test_save_chain_appends_new_head_seasons(app):
+    league_chain_index.save_chain([2, 1])
+    league_chain_index.save_chain([4, 3, 2, 1])
+
+    chain = _chain(1)
+    assert chain.current_league_id == 4
+    assert json.loads(chain.league_ids) == [4, 3, 2, 1]
+    for league_id in (1, 2, 3, 4):
+        assert league_chain_index.lookup_chain(league_id) == [4, 3, 2, 1]
+    assert league_chain_index.lookup_chains([1, 3, 9]) == {1: [4, 3, 2, 1], 3: [4, 3, 2, 1]}
+
+
+def test_save_chain_never_shrinks_a_stored_chain(app):
+    league_chain_index.save_chain([3, 2, 1])
+    # A walk started from an older season only reaches that season
+    league_chain_index.save_chain([2, 1])
+    league_chain_index.save_chain([1])
+
+    chain = _chain(1)
+    assert chain.current_league_id == 3
+    assert json.loads(chain.league_ids) == [3, 2, 1]
+    assert league_chain_index.lookup_chain(2) == [3, 2, 1]
+
+
+def test_failed_rollover_rebuild_marks_chain_for_ensure_built(app, monkeypatch):
+    league_chain_index.save_chain([2, 1])
+
+    def _fail(league_ids=None):
+        raise RuntimeError("rebuild failed")
+
+    monkeypatch.setattr(contract_state, "rebuild", _fail)
+    league_chain_index.save_chain([3, 2, 1])
+    assert _chain(1).contract_state_stale
+    assert league_chain_index.lookup_chain(3) == [3, 2, 1]
+
+    rebuilt = []
+    monkeypatch.setattr(contract_state, "rebuild", lambda league_ids=None: rebuilt.append(league_ids) or 0)
+    contract_state.ensure_built()
+    assert rebuilt == [[3, 2, 1]]
+    assert not _chain(1).contract_state_stale
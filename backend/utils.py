@@ -8,12 +8,16 @@ from typing import List, Dict, Set, Tuple
 from aiohttp import ClientSession
 from .models import (
     AmnestyPlayer, ExtensionPlayer, RfaPlayer,
-    Contract, LocalPlayer, LeagueInfo
+    LocalPlayer, LeagueInfo
 )
 from .extensions import db
 from sqlalchemy import text
 from sqlalchemy import inspect
 from .sleeper_service import sleeper_service
+from .rate_limiter import PRIORITY_USER, current_priority
+from .cache import chain_tags, invalidate_tags
+from .contract_state import read_contracts
+from .contract_status import query_contract_status
 
 logger = logging.getLogger(__name__)
 
@@ -86,27 +90,6 @@ def flatten_list(nested_list):
     """Flatten a list of lists."""
     return [item for sublist in nested_list for item in sublist]
 
-def merge_draft_data(current_draft, previous_draft):
-    # Create a dictionary for quick lookup of previous draft players by player_id
-    previous_draft = flatten_list(previous_draft)
-    previous_draft_map = {player['player_id']: player for player in previous_draft}
-    # Initialize the merged draft list
-    merged_draft = []
-
-    # Iterate through current draft and add players to merged_draft, overriding previous draft data if necessary
-    for player in current_draft:
-        merged_draft.append(player)  # Current draft overrides previous draft
-
-        # Remove the player from previous_draft_map to avoid duplicate entry later
-        if player['player_id'] in previous_draft_map:
-            del previous_draft_map[player['player_id']]
-    
-    # Add remaining players from previous draft that are not in the current draft
-    merged_draft.extend(previous_draft_map.values())
-    
-    return merged_draft
-
-
 def get_amnesty_rfa_extension_data(players_with_id_and_amount, league_id, team_id, current_season):
     # Get all Amnesty, RFA, and Extension records for the given league
     amnesty_players = AmnestyPlayer.query.filter_by(league_id=league_id, team_id=team_id, season=current_season).all()
@@ -138,34 +121,14 @@ def get_amnesty_rfa_extension_data(players_with_id_and_amount, league_id, team_i
 
     return players_with_id_and_amount
 
-def get_league_info(league_id):
-    league_info = LeagueInfo.query.filter_by(league_id=league_id).first()
-    if league_info:
-        return {
-            "league_id": league_info.league_id,
-            "is_auction": bool(league_info.is_auction),
-            "is_keeper": bool(league_info.is_keeper),
-            "money_per_team": league_info.money_per_team,
-            "keepers_allowed": league_info.keepers_allowed,
-            "rfa_allowed": league_info.rfa_allowed,
-            "amnesty_allowed": league_info.amnesty_allowed,
-            "extension_allowed": league_info.extension_allowed,
-            "extension_length": league_info.extension_length,
-            "rfa_length": league_info.rfa_length,
-            "taxi_length": league_info.taxi_length,
-            "rollover_every": league_info.rollover_every,
-            "creation_date" : league_info.creation_date
-        }
-    else:
-        return {}
-
-def get_rosters_response(league_id: str, user_id: str):
+def get_rosters_response(league_id: str, user_id: str, refresh: bool = False):
     """High-level helper that gathers all necessary data and returns
     a processed rosters response ready for the API routes.
 
     This function centralizes the orchestration: resolves the league
     chain, current season, fetches rosters/users/drafts/draft_picks and
-    delegates to the roster processing logic.
+    delegates to the roster processing logic. refresh rebuilds the
+    cached response and cost map instead of reading them.
     """
     try:
         logger.info(f"utils.get_rosters_response: resolving league chain for {league_id}")
@@ -178,6 +141,11 @@ def get_rosters_response(league_id: str, user_id: str):
 
         current_league_id = str(league_chain[0]) if league_chain else str(league_id)
 
+        # Feed the cache warmer with user traffic (not its own warmups)
+        if current_priority() == PRIORITY_USER:
+            from .cache_warmer import cache_warmer
+            cache_warmer.record_activity(current_league_id)
+
         # Current season
         try:
             nfl_state = sleeper_service.get_current_nfl_state() or {}
@@ -203,7 +171,8 @@ def get_rosters_response(league_id: str, user_id: str):
             users=users,
             draft_picks=draft_picks,
             current_season=current_season,
-            transactions=transactions
+            transactions=transactions,
+            refresh=refresh
         )
 
         # Ensure returned structure is a dict
@@ -336,15 +305,9 @@ def get_contract_value(player_id: int, league_id: int, current_season: int) -> i
     except Exception as e:
         logger.warning(f"Could not ensure contract_amount column: {e}")
     
-    contracts = Contract.query.filter_by(
-        league_id=league_id,
-        player_id=player_id
-    ).order_by(Contract.id.desc()).all()
-    
-    for contract in contracts:
-        amnesty = AmnestyPlayer.query.filter_by(contract_id=contract.id).first()
-        if not amnesty:
-            remaining = contract.contract_length - (current_season - contract.season)
+    for status in query_contract_status([league_id], [player_id], newest_first=True):
+        if not status.is_amnestied:
+            remaining = status.contract.contract_length - (current_season - status.contract.season)
             return max(0, remaining)
     
     return 0
@@ -404,42 +367,19 @@ def get_league_chain_ids(league_id: int) -> List[int]:
     Returns:
         List of league IDs in order from newest to oldest [current...original]
     """
-    from .models import LeagueChain
-    import json
-    
+    from . import league_chain_index
+
     try:
-        # Try to find by current_league_id or original_league_id
-        chain = LeagueChain.query.filter(
-            (LeagueChain.current_league_id == league_id) |
-            (LeagueChain.original_league_id == league_id)
-        ).first()
-        
-        if chain:
-            league_ids = json.loads(chain.league_ids)
-            logger.info(f"Found league chain for {league_id}: {league_ids}")
+        league_ids = league_chain_index.lookup_chain(league_id)
+        if league_ids:
             return league_ids
-        # If not found in league_chain table, resolve via Sleeper API and persist
+
+        # Not indexed yet: resolve via Sleeper (which indexes the chain)
         try:
             league_ids = sleeper_service.get_league_chain(str(league_id)) or [str(league_id)]
             league_ids_int = [int(lid) for lid in league_ids]
             if league_ids_int:
-                original_league_id = league_ids_int[-1]
-                current_league_id = league_ids_int[0]
-                payload = json.dumps(league_ids_int)
-                existing = LeagueChain.query.filter_by(original_league_id=original_league_id).first()
-                if existing:
-                    existing.current_league_id = current_league_id
-                    existing.league_ids = payload
-                    existing.last_updated = db.func.now()
-                    db.session.add(existing)
-                else:
-                    db.session.add(LeagueChain(
-                        original_league_id=original_league_id,
-                        current_league_id=current_league_id,
-                        league_ids=payload
-                    ))
-                db.session.commit()
-                logger.info(f"Resolved and stored league chain for {league_id}: {league_ids_int}")
+                logger.info(f"Resolved league chain for {league_id}: {league_ids_int}")
                 return league_ids_int
         except Exception as e:
             logger.warning(f"Failed to resolve league chain via Sleeper for {league_id}: {e}")
@@ -452,6 +392,45 @@ def get_league_chain_ids(league_id: int) -> List[int]:
         return [league_id]
 
 
+def get_league_chain_ids_many(league_ids: List[int]) -> Dict[int, List[int]]:
+    """
+    get_league_chain_ids for many leagues: indexed chains come from one
+    query, the rest are resolved via Sleeper concurrently.
+
+    Returns league_id -> chain IDs (newest to oldest) for every input ID.
+    """
+    from . import league_chain_index
+
+    league_ids = list(dict.fromkeys(int(lid) for lid in league_ids))
+    chains = league_chain_index.lookup_chains(league_ids)
+    missing = [lid for lid in league_ids if lid not in chains]
+    if missing:
+        logger.info(f"Resolving {len(missing)} unindexed league chains via Sleeper")
+        walked = sleeper_service.get_league_chains([str(lid) for lid in missing])
+        for lid in missing:
+            try:
+                chains[lid] = [int(x) for x in walked.get(str(lid)) or [lid]]
+            except Exception:
+                chains[lid] = [lid]
+    return {lid: chains[lid] for lid in league_ids}
+
+
+def invalidate_league_caches(league_id: int) -> int:
+    """
+    Evict cached rosters, cost maps, activity feeds and contract listings
+    for every league in league_id's chain (all cache tiers and workers).
+    Other leagues' cached data is left alone.
+    """
+    try:
+        chain_ids = get_league_chain_ids(int(league_id)) or [int(league_id)]
+        removed = invalidate_tags(chain_tags(chain_ids))
+        logger.info(f"Invalidated {removed} cached entries for league chain {chain_ids}")
+        return removed
+    except Exception as e:
+        logger.warning(f"Failed to invalidate caches for league {league_id}: {e}")
+        return 0
+
+
 def get_all_contracts_in_chain(league_id: int, current_season: int = None) -> List[Dict]:
     """
     Get all contracts across all leagues in the chain
@@ -463,9 +442,6 @@ def get_all_contracts_in_chain(league_id: int, current_season: int = None) -> Li
     Returns:
         List of contract dicts with contract info
     """
-    from .models import Contract, AmnestyPlayer
-    import json
-    
     if not current_season:
         current_season = int(sleeper_service.get_current_nfl_state().get('season', 2026))
     
@@ -473,34 +449,8 @@ def get_all_contracts_in_chain(league_id: int, current_season: int = None) -> Li
     league_ids = get_league_chain_ids(league_id)
     logger.info(f"Querying contracts across {len(league_ids)} leagues: {league_ids}")
     
-    # Query contracts from all leagues in the chain
-    contracts = Contract.query.filter(Contract.league_id.in_(league_ids)).all()
-    
-    result = []
-    for contract in contracts:
-        # Check if amnestied
-        amnesty_records = AmnestyPlayer.query.filter_by(
-            contract_id=contract.id
-        ).all()
-        
-        # Calculate if active
-        contract_end_season = contract.season + contract.contract_length - 1
-        is_expired = current_season > contract_end_season
-        is_amnestied = bool(amnesty_records)
-        is_active = not is_expired and not is_amnestied
-        
-        result.append({
-            'id': contract.id,
-            'league_id': contract.league_id,
-            'player_id': contract.player_id,
-            'team_id': contract.team_id,
-            'contract_length': contract.contract_length,
-            'contract_start_season': contract.season,
-            'contract_end_season': contract_end_season,
-            'is_active': is_active,
-            'is_expired': is_expired,
-            'is_amnestied': is_amnestied
-        })
+    # Materialized status for every contract in the chain, one indexed scan
+    result = read_contracts(league_ids, current_season)
     
     logger.info(f"Found {len(result)} total contracts across all leagues in chain")
     return result